@@ -0,0 +1,142 @@
+import logging
+import math
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+from metrics import REGISTRY, stage
+
+logger = logging.getLogger(__name__)
+
+ADMISSION_IN_FLIGHT = REGISTRY.gauge(
+    'cv_admission_in_flight',
+    'Requests holding an admission slot, by kind of work',
+    ('kind',)
+)
+ADMISSION_QUEUE_DEPTH = REGISTRY.gauge(
+    'cv_admission_queue_depth',
+    'Requests waiting for an admission slot, by kind of work',
+    ('kind',)
+)
+ADMISSION_REJECTIONS = REGISTRY.counter(
+    'cv_admission_rejections_total',
+    'Requests rejected with 503, by kind of work and reason (queue_full, timeout)',
+    ('kind', 'reason')
+)
+ADMISSION_WAIT = REGISTRY.histogram(
+    'cv_admission_wait_seconds',
+    'Time spent waiting for an admission slot, by kind of work',
+    ('kind',)
+)
+
+# Service times kept to estimate Retry-After
+SERVICE_TIME_SAMPLES = 50
+MAX_RETRY_AFTER = 60  # seconds
+
+
+class Overloaded(Exception):
+    """Raised when a request cannot be admitted; `retry_after` is in whole seconds"""
+
+    def __init__(self, kind, reason, retry_after):
+        super().__init__(f"Too many concurrent {kind} requests ({reason})")
+        self.kind = kind
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    """At most `limit` concurrent requests of one kind, plus a short bounded wait queue
+
+    A request beyond the limit waits for a slot, up to `queue_timeout`
+    seconds; when `queue_size` requests are already waiting it is rejected
+    straight away. Rejections raise Overloaded with a Retry-After estimated
+    from recent service times. A limit of 0 disables admission control.
+
+    A request doing the work of several (variant renders fanned out to
+    worker processes) holds that many slots, at most `limit`.
+    """
+
+    def __init__(self, kind, limit=0, queue_size=0, queue_timeout=5.0):
+        self.kind = kind
+        self.limit = limit
+        self.queue_size = queue_size
+        self.queue_timeout = queue_timeout
+        self._condition = threading.Condition()
+        self._active = 0
+        self._waiting = 0
+        self._service_times = deque(maxlen=SERVICE_TIME_SAMPLES)
+
+    @property
+    def enabled(self):
+        return self.limit > 0
+
+    def retry_after(self):
+        """Seconds until a slot is likely free: the backlog divided among the slots"""
+        with self._condition:
+            return self._retry_after()
+
+    def _retry_after(self):
+        if not self._service_times:
+            return 1
+        mean = sum(self._service_times) / len(self._service_times)
+        backlog = self._waiting + 1
+        return max(1, min(MAX_RETRY_AFTER, math.ceil(mean * backlog / self.limit)))
+
+    def _reject(self, reason):
+        ADMISSION_REJECTIONS.inc(self.kind, reason)
+        retry_after = self._retry_after()
+        logger.warning(f"Rejected {self.kind} request ({reason}), retry after {retry_after}s")
+        raise Overloaded(self.kind, reason, retry_after)
+
+    def _acquire(self, slots):
+        with self._condition:
+            if self._active + slots <= self.limit and not self._waiting:
+                self._active += slots
+                ADMISSION_IN_FLIGHT.set(self._active, self.kind)
+                return
+
+            if self._waiting >= self.queue_size:
+                self._reject('queue_full')
+
+            self._waiting += 1
+            ADMISSION_QUEUE_DEPTH.set(self._waiting, self.kind)
+            deadline = time.monotonic() + self.queue_timeout
+            try:
+                while self._active + slots > self.limit:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._reject('timeout')
+                    self._condition.wait(remaining)
+            finally:
+                self._waiting -= 1
+                ADMISSION_QUEUE_DEPTH.set(self._waiting, self.kind)
+            self._active += slots
+            ADMISSION_IN_FLIGHT.set(self._active, self.kind)
+
+    def _release(self, slots, service_time):
+        with self._condition:
+            self._active -= slots
+            self._service_times.append(service_time)
+            ADMISSION_IN_FLIGHT.set(self._active, self.kind)
+            # Freed slots may admit several waiters, or one holding several slots
+            self._condition.notify_all()
+
+    @contextmanager
+    def admit(self, slots=1):
+        """Hold `slots` slots for the enclosed block; raises Overloaded when they cannot be had"""
+        if not self.enabled:
+            yield
+            return
+
+        slots = max(1, min(slots, self.limit))
+        start = time.perf_counter()
+        with stage('queue'):
+            self._acquire(slots)
+        ADMISSION_WAIT.observe(time.perf_counter() - start, self.kind)
+
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._release(slots, time.perf_counter() - start)
@@ -1,11 +1,58 @@
-from flask import Flask, request, jsonify, send_file
+from flask import Flask, request, jsonify, send_file, g, Response
 from flask_cors import CORS
 from werkzeug.utils import secure_filename
 import os
 import uuid
 import logging
+import importlib
+import time
+import hmac
+import hashlib
+import numbers
+from datetime import datetime
+from functools import wraps
 from linkedin_parser import LinkedInParser
-from cv_generator import CVGenerator
+from metrics import REGISTRY, SIZE_BUCKETS, stage, begin_request_timings, end_request_timings
+from warmup import WarmupState, start_warmup
+from flight_recorder import SlowRequestRecorder, describe_cv_payload, describe_upload
+from profiling import RequestProfiler
+from memory_guard import MemoryGuard, MemoryBudgetExceeded
+from artifact_store import get_store as get_artifact_store
+from admission import AdmissionController, Overloaded
+from single_flight import SingleFlight
+from json_responses import compress_response, omit_empty
+
+# Heavy dependencies resolved on first use instead of at import time.
+# cv_generator pulls in reportlab.platypus, the pdfbase font machinery and PIL,
+# which processes that only parse CSVs or answer health checks never need.
+LAZY_IMPORTS = {
+    'CVGenerator': ('cv_generator', 'CVGenerator'),
+    'payload_digest': ('cv_generator', 'payload_digest'),
+    'is_deterministic': ('cv_generator', 'is_deterministic'),
+    'render_variants': ('variants', 'render_variants'),
+    'build_zip': ('variants', 'build_zip'),
+    'build_multipart': ('variants', 'build_multipart'),
+}
+
+
+def __getattr__(name):
+    """Resolve lazily imported names on first access (PEP 562)"""
+    if name not in LAZY_IMPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    module_name, attr_name = LAZY_IMPORTS[name]
+    value = getattr(importlib.import_module(module_name), attr_name)
+
+    # Cache in module globals so later lookups skip __getattr__
+    globals()[name] = value
+    return value
+
+
+def lazy(name):
+    """Return a lazily imported name, honouring any value already bound in this module"""
+    if name in globals():
+        return globals()[name]
+    return __getattr__(name)
 
 # Configure logging
 logging.basicConfig(
@@ -28,6 +75,7 @@ CORS(app, resources={
         ],
         "methods": ["GET", "POST"],
         "allow_headers": ["Content-Type"],
+        "expose_headers": ["Server-Timing", "Retry-After"],
         "supports_credentials": False
     }
 })
@@ -39,7 +87,221 @@ MAX_TOTAL_SIZE = 50 * 1024 * 1024  # 50MB total
 ALLOWED_EXTENSIONS = {'csv'}
 MAX_IMAGE_SIZE = 5 * 1024 * 1024  # 5MB for images
 
-os.makedirs(UPLOAD_FOLDER, exist_ok=True)
+# Pre-flight limits on /api/generate-pdf payloads (the photo is limited separately)
+MAX_PAYLOAD_STRING_BYTES = int(os.getenv('CV_MAX_PAYLOAD_STRING_BYTES', str(2 * 1024 * 1024)))
+MAX_PAYLOAD_LIST_LENGTH = int(os.getenv('CV_MAX_PAYLOAD_LIST_LENGTH', '500'))
+MAX_PAYLOAD_ITEMS = int(os.getenv('CV_MAX_PAYLOAD_ITEMS', '5000'))
+MAX_PAYLOAD_DEPTH = int(os.getenv('CV_MAX_PAYLOAD_DEPTH', '8'))
+
+# Optional memory budget per render (0 disables), measured as RSS or tracemalloc growth
+RENDER_MEMORY_LIMIT_MB = int(os.getenv('CV_RENDER_MEMORY_LIMIT_MB', '0'))
+RENDER_MEMORY_MODE = os.getenv('CV_RENDER_MEMORY_MODE', 'rss').lower()
+WARMUP_ENABLED = os.getenv('CV_WARMUP', 'False').lower() == 'true'
+STAGE_TIMED_ENDPOINTS = {'/api/parse-linkedin', '/api/generate-pdf', '/api/generate-variants', '/api/estimate'}
+
+# Multi-variant renders (/api/generate-variants): configs per request and worker processes
+MAX_VARIANTS = int(os.getenv('CV_MAX_VARIANTS', '6'))
+VARIANT_WORKERS = int(os.getenv('CV_VARIANT_WORKERS', str(min(4, os.cpu_count() or 1))))
+
+# Admission control: concurrent parses / renders (0 disables), then a short bounded wait queue
+PARSE_CONCURRENCY = int(os.getenv('CV_PARSE_CONCURRENCY', str(os.cpu_count() or 1)))
+RENDER_CONCURRENCY = int(os.getenv('CV_RENDER_CONCURRENCY', str(os.cpu_count() or 1)))
+ADMISSION_QUEUE_SIZE = int(os.getenv('CV_ADMISSION_QUEUE_SIZE', '8'))
+ADMISSION_QUEUE_TIMEOUT = float(os.getenv('CV_ADMISSION_QUEUE_TIMEOUT', '5'))  # seconds
+
+# Identical concurrent /api/generate-pdf payloads are rendered once; with a lock
+# directory, workers of the same host coalesce too
+COALESCE_RENDERS = os.getenv('CV_COALESCE_RENDERS', 'True').lower() == 'true'
+COALESCE_LOCK_DIR = os.getenv('CV_COALESCE_LOCK_DIR', '')
+COALESCE_TIMEOUT = float(os.getenv('CV_COALESCE_TIMEOUT', '60'))  # seconds
+
+# gzip/deflate for JSON responses when the client accepts it (bodies under the minimum stay plain)
+JSON_COMPRESSION = os.getenv('CV_JSON_COMPRESSION', 'True').lower() == 'true'
+JSON_COMPRESSION_MIN_BYTES = int(os.getenv('CV_JSON_COMPRESSION_MIN_BYTES', '1024'))
+JSON_COMPRESSION_LEVEL = int(os.getenv('CV_JSON_COMPRESSION_LEVEL', '6'))
+
+# Admin endpoints (/api/debug/*) are disabled unless a token is configured
+ADMIN_TOKEN = os.getenv('CV_ADMIN_TOKEN', '')
+SLOW_REQUESTS_CAPACITY = int(os.getenv('CV_SLOW_REQUESTS_CAPACITY', '50'))
+SLOW_REQUESTS_MAX_AGE = int(os.getenv('CV_SLOW_REQUESTS_MAX_AGE', '3600'))  # seconds
+
+# Sampled request profiling (cProfile + optional tracemalloc)
+PROFILE_SAMPLE_RATE = float(os.getenv('CV_PROFILE_SAMPLE_RATE', '0'))  # 0.0 - 1.0
+PROFILE_MEMORY = os.getenv('CV_PROFILE_MEMORY', 'False').lower() == 'true'
+PROFILE_DIR = os.getenv('CV_PROFILE_DIR', '/tmp/cv_profiles')
+PROFILE_MAX_FILES = int(os.getenv('CV_PROFILE_MAX_FILES', '50'))
+PROFILE_MAX_BYTES = int(os.getenv('CV_PROFILE_MAX_BYTES', str(100 * 1024 * 1024)))
+
+# When app.py is run as a script, variant worker processes (spawn/forkserver)
+# import it again as __mp_main__: start-up work only runs in the server
+WORKER_IMPORT = __name__ == '__mp_main__'
+
+if not WORKER_IMPORT:
+    os.makedirs(UPLOAD_FOLDER, exist_ok=True)
+
+# Slowest recent parse/render requests with stage breakdown and payload shape
+slow_requests = SlowRequestRecorder(capacity=SLOW_REQUESTS_CAPACITY, max_age=SLOW_REQUESTS_MAX_AGE)
+
+request_profiler = RequestProfiler(
+    PROFILE_DIR,
+    sample_rate=PROFILE_SAMPLE_RATE,
+    memory=PROFILE_MEMORY,
+    max_files=PROFILE_MAX_FILES,
+    max_bytes=PROFILE_MAX_BYTES
+)
+
+parse_admission = AdmissionController('parse', PARSE_CONCURRENCY, ADMISSION_QUEUE_SIZE, ADMISSION_QUEUE_TIMEOUT)
+render_admission = AdmissionController('render', RENDER_CONCURRENCY, ADMISSION_QUEUE_SIZE, ADMISSION_QUEUE_TIMEOUT)
+
+render_flight = SingleFlight(COALESCE_LOCK_DIR or None, timeout=COALESCE_TIMEOUT)
+
+render_memory_guard = MemoryGuard(RENDER_MEMORY_LIMIT_MB * 1024 * 1024, mode=RENDER_MEMORY_MODE)
+
+# Opt-in warm-up: render a sample CV per template before reporting ready
+warmup_state = WarmupState()
+if WARMUP_ENABLED and not WORKER_IMPORT:
+    start_warmup(warmup_state)
+else:
+    warmup_state.mark_ready()
+
+# Request metrics exposed on /api/metrics
+HTTP_REQUESTS = REGISTRY.counter(
+    'cv_http_requests_total',
+    'HTTP requests by endpoint, method and status code',
+    ('endpoint', 'method', 'status')
+)
+HTTP_LATENCY = REGISTRY.histogram(
+    'cv_http_request_duration_seconds',
+    'HTTP request latency by endpoint',
+    ('endpoint',)
+)
+HTTP_RESPONSE_BYTES = REGISTRY.histogram(
+    'cv_http_response_bytes',
+    'HTTP response body size by endpoint',
+    ('endpoint',),
+    buckets=SIZE_BUCKETS
+)
+HTTP_IN_FLIGHT = REGISTRY.gauge(
+    'cv_http_requests_in_flight',
+    'HTTP requests currently being processed'
+)
+
+def _endpoint_label():
+    """Use the matched URL rule as label to keep metric cardinality bounded"""
+    return request.url_rule.rule if request.url_rule else 'unmatched'
+
+@app.before_request
+def start_request_metrics():
+    g.request_start = time.perf_counter()
+    g.in_flight = True
+    HTTP_IN_FLIGHT.inc()
+    g.timings, g.timings_token = begin_request_timings()
+
+@app.after_request
+def record_request_metrics(response):
+    endpoint = _endpoint_label()
+    HTTP_REQUESTS.inc(endpoint, request.method, response.status_code)
+    if 'request_start' in g:
+        HTTP_LATENCY.observe(time.perf_counter() - g.request_start, endpoint)
+    if response.content_length is not None:
+        HTTP_RESPONSE_BYTES.observe(response.content_length, endpoint)
+    if g.get('profile_id'):
+        response.headers['X-Profile-Id'] = g.profile_id
+    if endpoint in STAGE_TIMED_ENDPOINTS and 'timings' in g:
+        # Stage breakdown for the browser devtools waterfall
+        response.headers['Server-Timing'] = g.timings.server_timing()
+        response.headers['Timing-Allow-Origin'] = '*'
+        slow_requests.record(
+            endpoint,
+            g.timings.elapsed(),
+            g.timings.stages,
+            g.get('payload_shape'),
+            {'status': response.status_code, 'ok': response.status_code < 400}
+        )
+    return response
+
+@app.after_request
+def compress_json(response):
+    """Content-encode JSON responses (runs before the metrics hook, which sees the sent size)"""
+    if JSON_COMPRESSION and response.mimetype == 'application/json':
+        with stage('compress'):
+            compress_response(response, request.accept_encodings,
+                              min_size=JSON_COMPRESSION_MIN_BYTES, level=JSON_COMPRESSION_LEVEL)
+    return response
+
+@app.teardown_request
+def finish_request_metrics(exc=None):
+    if g.pop('in_flight', False):
+        HTTP_IN_FLIGHT.dec()
+    if 'timings_token' in g:
+        end_request_timings(g.pop('timings_token'))
+
+def is_admin_request():
+    """Check the X-Admin-Token header against the configured admin token"""
+    if not ADMIN_TOKEN:
+        return False
+    token = request.headers.get('X-Admin-Token', '')
+    return hmac.compare_digest(token.encode(), ADMIN_TOKEN.encode())
+
+def admin_required(view):
+    """Restrict a view to requests carrying the configured X-Admin-Token"""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        if not ADMIN_TOKEN:
+            return jsonify({"error": "Not found"}), 404
+
+        if not is_admin_request():
+            logger.warning(f"Rejected admin request to {request.path}")
+            return jsonify({"error": "Forbidden"}), 403
+
+        return view(*args, **kwargs)
+    return wrapper
+
+def profiled(view):
+    """Profile a sample of requests to a view
+
+    The sampling rate comes from CV_PROFILE_SAMPLE_RATE, or from the
+    X-Profile-Rate header on admin requests (X-Profile-Memory: true also
+    captures a tracemalloc snapshot). The dump id is returned in X-Profile-Id.
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        rate = None
+        memory = None
+        if 'X-Profile-Rate' in request.headers and is_admin_request():
+            try:
+                rate = float(request.headers['X-Profile-Rate'])
+            except ValueError:
+                rate = None
+            memory = request.headers.get('X-Profile-Memory', 'False').lower() == 'true'
+
+        if not request_profiler.should_sample(rate):
+            return view(*args, **kwargs)
+
+        with request_profiler.profile(view.__name__, memory=memory) as profile_id:
+            g.profile_id = profile_id
+            return view(*args, **kwargs)
+    return wrapper
+
+def overloaded_response(error):
+    """503 telling the client when to retry"""
+    response = jsonify({"error": "Server busy, please retry", "details": str(error)})
+    response.status_code = 503
+    response.headers['Retry-After'] = str(error.retry_after)
+    return response
+
+def admitted(controller):
+    """Run a view within an admission slot; 503 with Retry-After when overloaded"""
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            try:
+                with controller.admit():
+                    return view(*args, **kwargs)
+            except Overloaded as e:
+                return overloaded_response(e)
+        return wrapper
+    return decorator
 
 def allowed_file(filename):
     """Check if file extension is allowed"""
@@ -66,17 +328,170 @@ def get_secure_filepath(original_filename):
 
     return os.path.join(UPLOAD_FOLDER, safe_filename)
 
+def validate_upload_sizes(files):
+    """Validate upload count and sizes; returns an error message or None"""
+    # Validate number of files
+    if len(files) > 20:
+        return "Too many files. Maximum 20 files allowed"
+
+    # Calculate total size
+    total_size = 0
+    for file in files:
+        if file.filename:
+            # Seek to end to get size
+            file.seek(0, os.SEEK_END)
+            file_size = file.tell()
+            file.seek(0)  # Reset to beginning
+
+            total_size += file_size
+
+            # Validate individual file size
+            if file_size > MAX_FILE_SIZE:
+                return f"File '{file.filename}' is too large. Maximum {MAX_FILE_SIZE // (1024*1024)}MB per file"
+
+    # Validate total size
+    if total_size > MAX_TOTAL_SIZE:
+        return f"Total upload size exceeds limit. Maximum {MAX_TOTAL_SIZE // (1024*1024)}MB"
+
+    return None
+
+def validate_payload_limits(data):
+    """Walk a CV payload once and enforce size and complexity limits; returns an error message or None
+
+    Runs before any sanitization or layout so that oversized payloads are
+    rejected cheaply. The photo is left to validate_photo().
+    """
+    total_bytes = 0
+    total_items = 0
+    stack = [(key, value, 1) for key, value in data.items() if key != 'photo']
+
+    while stack:
+        key, value, depth = stack.pop()
+
+        if isinstance(value, str):
+            # isascii() is O(1), so only non-ASCII strings pay for an encode
+            total_bytes += len(value) if value.isascii() else len(value.encode('utf-8', 'replace'))
+            if total_bytes > MAX_PAYLOAD_STRING_BYTES:
+                return f"Payload too large. Maximum {MAX_PAYLOAD_STRING_BYTES // 1024}KB of text"
+            continue
+
+        if not isinstance(value, (dict, list)):
+            continue
+
+        if depth >= MAX_PAYLOAD_DEPTH:
+            return f"Payload too deeply nested. Maximum depth {MAX_PAYLOAD_DEPTH}"
+
+        if len(value) > MAX_PAYLOAD_LIST_LENGTH:
+            return f"Too many entries in '{key}'. Maximum {MAX_PAYLOAD_LIST_LENGTH}"
+
+        total_items += len(value)
+        if total_items > MAX_PAYLOAD_ITEMS:
+            return f"Payload too complex. Maximum {MAX_PAYLOAD_ITEMS} entries in total"
+
+        if isinstance(value, dict):
+            for child_key, child in value.items():
+                total_bytes += len(str(child_key))
+                stack.append((child_key, child, depth + 1))
+        else:
+            stack.extend((key, child, depth + 1) for child in value)
+
+    return None
+
+def validate_photo(data):
+    """Validate photo size if present; returns an error message or None"""
+    if 'photo' in data and data['photo']:
+        photo_data = data['photo']
+
+        # Remove data URL prefix if present
+        if 'base64,' in photo_data:
+            photo_data = photo_data.split('base64,')[1]
+
+        # Estimate size (base64 is ~33% larger than binary)
+        try:
+            estimated_size = len(photo_data) * 3 // 4
+            if estimated_size > MAX_IMAGE_SIZE:
+                return f"Photo too large. Maximum {MAX_IMAGE_SIZE // (1024*1024)}MB"
+        except Exception:
+            return "Invalid photo data"
+
+    return None
+
+def validate_config(config):
+    """Validate render config options that would fail mid-render; returns an error message or None
+
+    Other keys (template, font, sections...) fall back to defaults when unknown.
+    """
+    if config is None:
+        return None
+    if not isinstance(config, dict):
+        return "config must be an object"
+
+    def is_int(value):
+        return isinstance(value, int) and not isinstance(value, bool)
+
+    if config.get('fit_pages') is not None:
+        if not is_int(config['fit_pages']) or config['fit_pages'] < 1:
+            return "fit_pages must be a positive integer"
+    if 'layout_scale' in config:
+        scale = config['layout_scale']
+        if not isinstance(scale, numbers.Real) or isinstance(scale, bool) or not 0.5 <= scale <= 2:
+            return "layout_scale must be a number between 0.5 and 2"
+    if config.get('description_limit') is not None:
+        if not is_int(config['description_limit']) or config['description_limit'] < 0:
+            return "description_limit must be a non-negative integer"
+    if 'deterministic' in config and not isinstance(config['deterministic'], bool):
+        return "deterministic must be true or false"
+    if config.get('creation_date') is not None:
+        try:
+            datetime.fromisoformat(str(config['creation_date']))
+        except ValueError:
+            return "creation_date must be an ISO 8601 date"
+    return None
+
 @app.route('/')
 def index():
     return jsonify({"message": "CV Generator API", "status": "running", "version": "1.0"})
 
+@app.route('/api/ready')
+def ready():
+    """Readiness probe: 503 until the startup warm-up has finished"""
+    status_code = 200 if warmup_state.ready else 503
+    return jsonify(warmup_state.to_dict()), status_code
+
+@app.route('/api/metrics')
+def metrics():
+    """Expose request and stage metrics in Prometheus text format"""
+    return Response(REGISTRY.render(), mimetype='text/plain; version=0.0.4')
+
+@app.route('/api/debug/slow')
+@admin_required
+def debug_slow_requests():
+    """List the slowest recent parse/render requests (admin only)"""
+    return jsonify({
+        "capacity": slow_requests.capacity,
+        "max_age_seconds": slow_requests.max_age,
+        "requests": slow_requests.snapshot()
+    })
+
+@app.route('/api/debug/artifacts')
+@admin_required
+def debug_artifacts():
+    """Usage, caps and eviction counters of the generated PDF store (admin only)"""
+    return jsonify(get_artifact_store().stats())
+
 @app.route('/api/parse-linkedin', methods=['POST'])
+@profiled
+@admitted(parse_admission)
 def parse_linkedin():
     """Parse LinkedIn export files with security validation"""
     saved_files = []
 
     try:
-        if 'files' not in request.files:
+        # Multipart body is parsed on first access to request.files
+        with stage('upload'):
+            has_files = 'files' in request.files
+
+        if not has_files:
             logger.warning("No files in request")
             return jsonify({"error": "No files uploaded"}), 400
 
@@ -85,32 +500,12 @@ def parse_linkedin():
         if not files:
             return jsonify({"error": "No files uploaded"}), 400
 
-        # Validate number of files
-        if len(files) > 20:
-            return jsonify({"error": "Too many files. Maximum 20 files allowed"}), 400
-
-        # Calculate total size
-        total_size = 0
-        for file in files:
-            if file.filename:
-                # Seek to end to get size
-                file.seek(0, os.SEEK_END)
-                file_size = file.tell()
-                file.seek(0)  # Reset to beginning
-
-                total_size += file_size
+        with stage('validation'):
+            error = validate_upload_sizes(files)
+        if error:
+            return jsonify({"error": error}), 400
 
-                # Validate individual file size
-                if file_size > MAX_FILE_SIZE:
-                    return jsonify({
-                        "error": f"File '{file.filename}' is too large. Maximum {MAX_FILE_SIZE // (1024*1024)}MB per file"
-                    }), 400
-
-        # Validate total size
-        if total_size > MAX_TOTAL_SIZE:
-            return jsonify({
-                "error": f"Total upload size exceeds limit. Maximum {MAX_TOTAL_SIZE // (1024*1024)}MB"
-            }), 400
+        g.payload_shape = describe_upload(files)
 
         # Save files temporarily with validation
         for file in files:
@@ -125,7 +520,8 @@ def parse_linkedin():
                 filepath = get_secure_filepath(file.filename)
 
                 # Save file
-                file.save(filepath)
+                with stage('file_save'):
+                    file.save(filepath)
                 saved_files.append(filepath)
                 logger.info(f"Saved file: {file.filename} as {os.path.basename(filepath)}")
 
@@ -138,7 +534,16 @@ def parse_linkedin():
 
         logger.info(f"Successfully parsed {len(saved_files)} files")
 
-        return jsonify(data)
+        parsed_shape = describe_cv_payload(data)
+        parsed_shape.pop('template')
+        g.payload_shape.update(parsed_shape)
+
+        # ?omit_empty=true drops empty strings, lists and objects (e.g. a missing maiden_name)
+        if request.args.get('omit_empty', 'false').lower() == 'true':
+            data = omit_empty(data)
+
+        with stage('send'):
+            return jsonify(data)
 
     except Exception as e:
         logger.error(f"Error parsing LinkedIn data: {e}", exc_info=True)
@@ -155,10 +560,12 @@ def parse_linkedin():
                 logger.error(f"Failed to cleanup file {filepath}: {e}")
 
 @app.route('/api/generate-pdf', methods=['POST'])
+@profiled
 def generate_pdf():
     """Generate PDF from parsed data with validation"""
     try:
-        data = request.json
+        with stage('upload'):
+            data = request.json
 
         if not data:
             return jsonify({"error": "No data provided"}), 400
@@ -167,48 +574,181 @@ def generate_pdf():
         if not isinstance(data, dict):
             return jsonify({"error": "Invalid data format"}), 400
 
-        # Validate photo size if present
-        if 'photo' in data and data['photo']:
-            photo_data = data['photo']
-
-            # Remove data URL prefix if present
-            if 'base64,' in photo_data:
-                photo_data = photo_data.split('base64,')[1]
-
-            # Estimate size (base64 is ~33% larger than binary)
-            import base64
-            try:
-                estimated_size = len(photo_data) * 3 // 4
-                if estimated_size > MAX_IMAGE_SIZE:
-                    return jsonify({
-                        "error": f"Photo too large. Maximum {MAX_IMAGE_SIZE // (1024*1024)}MB"
-                    }), 400
-            except Exception:
-                return jsonify({"error": "Invalid photo data"}), 400
+        with stage('validation'):
+            limit_error = validate_payload_limits(data)
+            error = None if limit_error else validate_photo(data) or validate_config(data.get('config'))
+        if limit_error:
+            logger.warning(f"Rejected oversized payload: {limit_error}")
+            return jsonify({"error": limit_error}), 413
+        if error:
+            return jsonify({"error": error}), 400
 
         # Extract config if provided
         config = data.pop('config', None) if 'config' in data else None
+        g.payload_shape = describe_cv_payload(data, config)
+
+        # Generate PDF with config. Concurrent identical payloads share one render,
+        # so only the request actually rendering takes an admission slot and
+        # builds the generator
+        with render_memory_guard.watch():
+            key = lazy('payload_digest')(data, config) if COALESCE_RENDERS else None
 
-        # Generate PDF with config
-        generator = CVGenerator(data, config=config)
-        pdf_path = generator.generate()
+            def render():
+                with render_admission.admit():
+                    return lazy('CVGenerator')(data, config=config).generate()
+
+            if COALESCE_RENDERS:
+                pdf_path, coalesced = render_flight.do(key, render)
+                g.payload_shape['coalesced'] = coalesced
+            else:
+                pdf_path = render()
 
         logger.info(f"PDF generated successfully: {pdf_path}")
 
         # Send file (PDF is kept in cv/ folder)
-        response = send_file(
-            pdf_path,
-            mimetype='application/pdf',
-            as_attachment=True,
-            download_name='cv.pdf'
-        )
+        with stage('send'):
+            # Deterministic PDFs get a content ETag, so clients can revalidate
+            # (werkzeug only answers conditional GETs, so POSTs are checked here)
+            etag = True
+            if lazy('is_deterministic')(config):
+                with open(pdf_path, 'rb') as pdf_file:
+                    etag = hashlib.sha256(pdf_file.read()).hexdigest()
+                if request.if_none_match.contains(etag):
+                    response = Response(status=304)
+                    response.set_etag(etag)
+                    return response
+            response = send_file(
+                pdf_path,
+                mimetype='application/pdf',
+                as_attachment=True,
+                download_name='cv.pdf',
+                etag=etag
+            )
 
         return response
 
+    except MemoryBudgetExceeded as e:
+        logger.warning(f"Render aborted: {e}")
+        return jsonify({"error": "CV too large to render", "details": str(e)}), 413
+
+    except Overloaded as e:
+        return overloaded_response(e)
+
     except Exception as e:
         logger.error(f"Error generating PDF: {e}", exc_info=True)
         return jsonify({"error": "Failed to generate PDF", "details": str(e)}), 500
 
+@app.route('/api/estimate', methods=['POST'])
+@profiled
+def estimate_pages():
+    """Estimate the page count and per-section heights of a CV without rendering it
+
+    Takes the /api/generate-pdf payload. Sections already measured for the
+    same data and config are reused, so the editor can call this on every
+    change.
+    """
+    try:
+        with stage('upload'):
+            data = request.json
+
+        if not data or not isinstance(data, dict):
+            return jsonify({"error": "Invalid data format"}), 400
+
+        with stage('validation'):
+            limit_error = validate_payload_limits(data)
+            error = None if limit_error else validate_photo(data) or validate_config(data.get('config'))
+        if limit_error:
+            logger.warning(f"Rejected oversized payload: {limit_error}")
+            return jsonify({"error": limit_error}), 413
+        if error:
+            return jsonify({"error": error}), 400
+
+        config = data.pop('config', None)
+        g.payload_shape = describe_cv_payload(data, config)
+
+        # Estimates build and measure the story like a render: they share its slots
+        with render_admission.admit(), render_memory_guard.watch():
+            estimate = lazy('CVGenerator')(data, config=config).estimate()
+
+        return jsonify(estimate)
+
+    except MemoryBudgetExceeded as e:
+        logger.warning(f"Estimate aborted: {e}")
+        return jsonify({"error": "CV too large to render", "details": str(e)}), 413
+
+    except Overloaded as e:
+        return overloaded_response(e)
+
+    except Exception as e:
+        logger.error(f"Error estimating pages: {e}", exc_info=True)
+        return jsonify({"error": "Failed to estimate pages", "details": str(e)}), 500
+
+@app.route('/api/generate-variants', methods=['POST'])
+@profiled
+def generate_variants():
+    """Render one CV with several configs, returned as a ZIP (default) or multipart/mixed
+
+    The payload is the /api/generate-pdf one with a `configs` list instead of
+    `config`; ?format=multipart selects the multipart response. The request
+    holds one render slot per variant rendered at the same time.
+    """
+    try:
+        with stage('upload'):
+            data = request.json
+
+        if not data or not isinstance(data, dict):
+            return jsonify({"error": "Invalid data format"}), 400
+
+        response_format = request.args.get('format', 'zip')
+        if response_format not in ('zip', 'multipart'):
+            return jsonify({"error": "format must be 'zip' or 'multipart'"}), 400
+
+        configs = data.pop('configs', None)
+        if not isinstance(configs, list) or not configs or not all(isinstance(c, dict) for c in configs):
+            return jsonify({"error": "configs must be a non-empty list of objects"}), 400
+        if len(configs) > MAX_VARIANTS:
+            return jsonify({"error": f"Too many variants. Maximum {MAX_VARIANTS}"}), 413
+
+        with stage('validation'):
+            limit_error = validate_payload_limits(data)
+            error = None if limit_error else validate_photo(data) or next(
+                filter(None, map(validate_config, configs)), None)
+        if limit_error:
+            logger.warning(f"Rejected oversized payload: {limit_error}")
+            return jsonify({"error": limit_error}), 413
+        if error:
+            return jsonify({"error": error}), 400
+
+        data.pop('config', None)
+        g.payload_shape = dict(describe_cv_payload(data, configs[0]), variants=len(configs))
+
+        # Shared preparation runs here (within the memory budget); renders run in workers
+        with render_admission.admit(slots=min(len(configs), VARIANT_WORKERS)), render_memory_guard.watch():
+            pdfs = lazy('render_variants')(data, configs, workers=VARIANT_WORKERS)
+
+        logger.info(f"Generated {len(pdfs)} CV variants")
+
+        with stage('send'):
+            if response_format == 'multipart':
+                body, boundary = lazy('build_multipart')(pdfs, configs)
+                return Response(body, mimetype=f'multipart/mixed; boundary={boundary}')
+            return Response(
+                lazy('build_zip')(pdfs, configs),
+                mimetype='application/zip',
+                headers={'Content-Disposition': 'attachment; filename="cv_variants.zip"'}
+            )
+
+    except MemoryBudgetExceeded as e:
+        logger.warning(f"Render aborted: {e}")
+        return jsonify({"error": "CV too large to render", "details": str(e)}), 413
+
+    except Overloaded as e:
+        return overloaded_response(e)
+
+    except Exception as e:
+        logger.error(f"Error generating variants: {e}", exc_info=True)
+        return jsonify({"error": "Failed to generate PDF variants", "details": str(e)}), 500
+
 if __name__ == '__main__':
     # Production-safe configuration
     debug_mode = os.getenv('FLASK_DEBUG', 'False').lower() == 'true'
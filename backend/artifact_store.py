@@ -0,0 +1,306 @@
+import hashlib
+import logging
+import os
+import threading
+import time
+import uuid
+
+from metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+# Generated PDFs are kept in the repository's cv/ folder unless configured otherwise
+DEFAULT_DIRECTORY = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'cv')
+
+ARTIFACT_DIR = os.getenv('CV_ARTIFACT_DIR') or DEFAULT_DIRECTORY
+ARTIFACT_MAX_BYTES = int(os.getenv('CV_ARTIFACT_MAX_BYTES', str(500 * 1024 * 1024)))
+ARTIFACT_MAX_FILES = int(os.getenv('CV_ARTIFACT_MAX_FILES', '1000'))
+ARTIFACT_TTL = int(os.getenv('CV_ARTIFACT_TTL', str(24 * 3600)))  # seconds, 0 keeps files until evicted
+ARTIFACT_JANITOR_INTERVAL = int(os.getenv('CV_ARTIFACT_JANITOR_INTERVAL', '60'))  # seconds
+
+# Content blobs (<sha256>.pdf) and in-progress writes live in this subfolder
+OBJECTS_DIR = '.objects'
+TEMP_PREFIX = '.tmp-'
+
+# Renders take seconds: older temp files were left by a crash
+STALE_TEMP_AGE = 3600
+ORPHAN_GRACE = 60
+
+ARTIFACT_BYTES = REGISTRY.gauge(
+    'cv_artifact_store_bytes',
+    'Disk space used by generated PDFs (shared content counted once)'
+)
+ARTIFACT_FILES = REGISTRY.gauge(
+    'cv_artifact_store_files',
+    'Generated PDFs kept in the artifact store'
+)
+
+
+def _file_digest(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ArtifactStore:
+    """Generated PDFs in a directory capped by total size, file count and age
+
+    Each PDF is written to a temporary file and linked into place, so readers
+    never see a partial file. Content is stored once as `.objects/<sha256>.pdf`
+    and every named PDF is a hardlink to it: identical renders (see
+    deterministic mode) share one inode. Writing or re-writing content marks
+    it as used; a janitor thread evicts content unused for `ttl` seconds,
+    then least recently used content (with all its names) until the store is
+    within `max_bytes` and `max_files`. A cap of 0 disables it.
+    """
+
+    def __init__(self, directory, max_bytes=0, max_files=0, ttl=0, interval=60):
+        self.directory = directory
+        self.objects = os.path.join(directory, OBJECTS_DIR)
+        self.max_bytes = max_bytes
+        self.max_files = max_files
+        self.ttl = ttl
+        self.interval = interval
+
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+        self._stopping = False
+        self._counters = {'writes': 0, 'dedup_hits': 0, 'evictions': 0, 'evicted_bytes': 0, 'expired': 0}
+        self._last_sweep = None
+        # Totals from the last sweep plus what was written since, to wake the janitor early
+        self._approx_bytes = 0
+        self._approx_files = 0
+
+    def save(self, filename, render):
+        """Store a PDF under `filename`; `render(path)` writes it to a temporary path
+
+        Returns:
+            str: final path of the PDF
+        """
+        os.makedirs(self.objects, exist_ok=True)
+        temp_path = self._temp_path()
+        path = os.path.join(self.directory, filename)
+        deduplicated = False
+        try:
+            render(temp_path)
+            size = os.path.getsize(temp_path)
+            blob = os.path.join(self.objects, f"{_file_digest(temp_path)}.pdf")
+            try:
+                self._publish(blob, path)
+                # Shared inode: touching the content marks all its names as used
+                os.utime(blob)
+                deduplicated = True
+            except FileNotFoundError:
+                # New content: keep it as a blob for later renders
+                try:
+                    os.link(temp_path, blob)
+                except OSError:
+                    pass
+                os.replace(temp_path, path)
+            except OSError:
+                # No hardlinks on this filesystem: plain atomic rename
+                os.replace(temp_path, path)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+        with self._lock:
+            self._counters['writes'] += 1
+            self._counters['dedup_hits'] += deduplicated
+            self._approx_files += 1
+            self._approx_bytes += 0 if deduplicated else size
+            over_caps = self._over_caps(self._approx_bytes, self._approx_files)
+        if over_caps:
+            self._wake.set()
+        return path
+
+    def _temp_path(self):
+        return os.path.join(self.objects, f"{TEMP_PREFIX}{uuid.uuid4().hex}.pdf")
+
+    def _publish(self, source, path):
+        """Atomically make `path` a hardlink to `source`, replacing any previous file"""
+        link = self._temp_path()
+        os.link(source, link)
+        try:
+            os.replace(link, path)
+        except OSError:
+            os.remove(link)
+            raise
+
+    def touch(self, path):
+        """Mark a stored PDF as used (e.g. when it is downloaded again)"""
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass
+
+    def _over_caps(self, total_bytes, total_files):
+        return ((self.max_bytes and total_bytes > self.max_bytes)
+                or (self.max_files and total_files > self.max_files))
+
+    def _scan(self):
+        """Stored content grouped by inode: {inode: {'size', 'used', 'names', 'blob'}}"""
+        contents = {}
+
+        def add(path, name=None):
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                return
+            content = contents.setdefault((stat.st_dev, stat.st_ino), {
+                'size': stat.st_size, 'used': stat.st_mtime, 'names': [], 'blob': None,
+            })
+            if name is None:
+                content['blob'] = path
+            else:
+                content['names'].append(path)
+
+        for directory, is_blob in ((self.directory, False), (self.objects, True)):
+            try:
+                entries = list(os.scandir(directory))
+            except FileNotFoundError:
+                continue
+            for entry in entries:
+                if not entry.name.endswith('.pdf') or entry.name.startswith(TEMP_PREFIX):
+                    continue
+                add(entry.path, None if is_blob else entry.name)
+        return contents
+
+    def _remove(self, content):
+        for path in content['names'] + ([content['blob']] if content['blob'] else []):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def _remove_stale_temp_files(self, now):
+        try:
+            entries = list(os.scandir(self.objects))
+        except FileNotFoundError:
+            return
+        for entry in entries:
+            if entry.name.startswith(TEMP_PREFIX):
+                try:
+                    if now - entry.stat().st_mtime > STALE_TEMP_AGE:
+                        os.remove(entry.path)
+                except FileNotFoundError:
+                    pass
+
+    def sweep(self):
+        """Evict expired content, then least recently used content until within caps"""
+        start = time.time()
+        contents = self._scan()
+
+        evicted = expired = evicted_bytes = 0
+        remaining = []
+        for content in contents.values():
+            if not content['names']:
+                # Blob whose PDFs were deleted (recent ones may be being published)
+                if start - content['used'] > ORPHAN_GRACE:
+                    self._remove(content)
+            elif self.ttl and start - content['used'] > self.ttl:
+                self._remove(content)
+                expired += 1
+                evicted_bytes += content['size']
+            else:
+                remaining.append(content)
+
+        remaining.sort(key=lambda content: content['used'])
+        total_bytes = sum(content['size'] for content in remaining)
+        total_files = sum(len(content['names']) for content in remaining)
+        while remaining and self._over_caps(total_bytes, total_files):
+            content = remaining.pop(0)
+            self._remove(content)
+            evicted += 1
+            evicted_bytes += content['size']
+            total_bytes -= content['size']
+            total_files -= len(content['names'])
+
+        self._remove_stale_temp_files(start)
+
+        with self._lock:
+            self._counters['evictions'] += evicted + expired
+            self._counters['expired'] += expired
+            self._counters['evicted_bytes'] += evicted_bytes
+            self._approx_bytes = total_bytes
+            self._approx_files = total_files
+            self._last_sweep = {
+                'at': start,
+                'duration_seconds': round(time.time() - start, 4),
+                'evicted': evicted + expired,
+            }
+        ARTIFACT_BYTES.set(total_bytes)
+        ARTIFACT_FILES.set(total_files)
+        if evicted or expired:
+            logger.info(f"Artifact store: evicted {evicted + expired} PDFs ({evicted_bytes} bytes, {expired} expired)")
+
+    def stats(self):
+        """Current usage, caps and counters since start"""
+        contents = self._scan()
+        files = sum(len(content['names']) for content in contents.values())
+        with self._lock:
+            return {
+                'directory': self.directory,
+                'files': files,
+                'unique_contents': sum(1 for content in contents.values() if content['names']),
+                'bytes': sum(content['size'] for content in contents.values()),
+                'logical_bytes': sum(content['size'] * len(content['names']) for content in contents.values()),
+                'max_bytes': self.max_bytes,
+                'max_files': self.max_files,
+                'ttl_seconds': self.ttl,
+                'janitor_running': self._thread is not None and self._thread.is_alive(),
+                'last_sweep': self._last_sweep,
+                **self._counters,
+            }
+
+    def start(self):
+        """Start the janitor thread (once)"""
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._stopping = False
+            self._thread = threading.Thread(target=self._run, name='artifact-janitor', daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """Stop the janitor thread"""
+        with self._lock:
+            thread, self._thread = self._thread, None
+            self._stopping = True
+        self._wake.set()
+        if thread is not None:
+            thread.join()
+
+    def _run(self):
+        while True:
+            try:
+                self.sweep()
+            except Exception as e:
+                logger.error(f"Artifact store sweep failed: {e}", exc_info=True)
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            if self._stopping:
+                return
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store():
+    """Process-wide store for generated PDFs, with its janitor started on first use"""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = ArtifactStore(
+                ARTIFACT_DIR,
+                max_bytes=ARTIFACT_MAX_BYTES,
+                max_files=ARTIFACT_MAX_FILES,
+                ttl=ARTIFACT_TTL,
+                interval=ARTIFACT_JANITOR_INTERVAL,
+            )
+            _store.start()
+        return _store
@@ -0,0 +1,221 @@
+"""
+Bulk ingestion of multi-person CSV exports (one file per entity type).
+
+HR and agency exports cover hundreds of consultants: Positions.csv,
+Skills.csv, Education.csv... each hold the rows of every person, keyed by a
+person id column. This module streams those files, groups their rows by
+person with bounded memory and yields one person's CV data at a time, ready
+for CVGenerator, so the whole export never has to fit in RAM. To regenerate a
+single person's CV, person_data() reads only their rows through a
+row-offset index of each file (see csv_index.py).
+
+Usage (from backend/):
+    python bulk_ingest.py export/*.csv --output-dir cvs/
+    python bulk_ingest.py export/*.csv --output-dir cvs/ --id-column "Employee ID" --template classic
+    python bulk_ingest.py export/*.csv --output-dir cvs/ --person P000042
+"""
+
+import argparse
+import csv
+import heapq
+import itertools
+import logging
+import os
+import pickle
+import re
+import sys
+import tempfile
+import time
+
+from csv_index import CSVIndex
+from linkedin_parser import LinkedInParser, file_kind
+
+logger = logging.getLogger(__name__)
+
+PERSON_ID_COLUMN = os.getenv('CV_BULK_PERSON_ID_COLUMN', 'Person Id')
+
+# Rows sorted in memory per file before spilling a sorted run to disk
+CHUNK_ROWS = int(os.getenv('CV_BULK_CHUNK_ROWS', '50000'))
+
+
+def _person_id(item):
+    return item[0]
+
+
+def read_rows(path, id_column=PERSON_ID_COLUMN):
+    """Stream (person id, row) pairs from a CSV file
+
+    The id column is removed from the rows; rows without an id are skipped.
+    A leading byte order mark (as written by Excel) is ignored.
+
+    Raises:
+        ValueError: If the file has no `id_column` column
+    """
+    skipped = 0
+    with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+        reader = csv.DictReader(f)
+        if id_column not in (reader.fieldnames or ()):
+            raise ValueError(f"{os.path.basename(path)} has no '{id_column}' column")
+        for row in reader:
+            person_id = (row.pop(id_column) or '').strip()
+            if person_id:
+                yield person_id, row
+            else:
+                skipped += 1
+    if skipped:
+        logger.warning(f"Skipped {skipped} rows without '{id_column}' in {os.path.basename(path)}")
+
+
+def sort_by_person(items, chunk_rows=CHUNK_ROWS, spill_dir=None):
+    """Sort (person id, row) pairs by person id, keeping input order within a person
+
+    Inputs of up to `chunk_rows` rows are sorted in memory. Larger inputs are
+    cut into sorted runs spilled to temporary files (in `spill_dir`) and
+    merged back lazily, holding one row per run in memory.
+    """
+    chunk = []
+    runs = []
+    try:
+        for item in items:
+            chunk.append(item)
+            if len(chunk) >= chunk_rows:
+                runs.append(_spill(chunk, spill_dir))
+                chunk = []
+
+        if not runs:
+            chunk.sort(key=_person_id)
+            yield from chunk
+            return
+
+        if chunk:
+            runs.append(_spill(chunk, spill_dir))
+            chunk = []
+        logger.info(f"Merging {len(runs)} sorted runs of up to {chunk_rows} rows")
+        # heapq.merge is stable: equal ids keep the order of the runs, i.e. of the input
+        yield from heapq.merge(*map(_read_run, runs), key=_person_id)
+    finally:
+        for run in runs:
+            run.close()
+
+
+def _spill(chunk, spill_dir):
+    """Write a chunk sorted by person id to an anonymous temporary file"""
+    chunk.sort(key=_person_id)
+    run = tempfile.TemporaryFile(prefix='cv-bulk-', dir=spill_dir)
+    for item in chunk:
+        pickle.dump(item, run, protocol=pickle.HIGHEST_PROTOCOL)
+    run.seek(0)
+    return run
+
+
+def _read_run(run):
+    while True:
+        try:
+            yield pickle.load(run)
+        except EOFError:
+            return
+
+
+def _tagged(kind, items):
+    for person_id, row in items:
+        yield person_id, kind, row
+
+
+def iter_people(file_paths, id_column=PERSON_ID_COLUMN, chunk_rows=CHUNK_ROWS, spill_dir=None):
+    """Yield (person id, CV data) for each person of a multi-person export
+
+    Each file is sorted by person id (see sort_by_person) and the sorted
+    files are merged, so only one person's rows are parsed at a time. People
+    come out ordered by id (as text); within a person, rows keep their file
+    order. Files are recognised by name like single-person uploads
+    (Positions.csv, Skills.csv...); others are skipped.
+    """
+    streams = []
+    for path in file_paths:
+        kind = file_kind(path)
+        if kind is None:
+            logger.warning(f"Skipping unsupported export file {os.path.basename(path)}")
+            continue
+        streams.append(_tagged(kind, sort_by_person(read_rows(path, id_column), chunk_rows, spill_dir)))
+
+    people = heapq.merge(*streams, key=_person_id)
+    for person_id, items in itertools.groupby(people, key=_person_id):
+        parser = LinkedInParser([])
+        # Rows of one file are consecutive: heapq.merge keeps the order of the streams
+        for kind, rows in itertools.groupby(items, key=lambda item: item[1]):
+            parser.add(kind, (row for _, _, row in rows))
+        yield person_id, parser.finish()
+
+
+def person_data(file_paths, person_id, id_column=PERSON_ID_COLUMN):
+    """CV data of one person of a multi-person export, without scanning the files
+
+    Each file is indexed once (row byte offsets per person id, saved next to
+    it); reading a person then costs only their own rows.
+
+    Raises:
+        KeyError: If the person has no rows in any file
+    """
+    parser = LinkedInParser([])
+    found = False
+    for path in file_paths:
+        kind = file_kind(path)
+        if kind is None:
+            continue
+        rows = CSVIndex.open(path, id_column).rows(person_id)
+        if rows:
+            found = True
+            parser.add(kind, rows)
+    if not found:
+        raise KeyError(person_id)
+    return parser.finish()
+
+
+def generate_cvs(file_paths, output_dir, config=None, person_ids=None, **options):
+    """Render one PDF per person of a multi-person export into `output_dir`
+
+    Yields (person id, PDF path) as each CV is written. With `person_ids`,
+    only those people are rendered, read through the file indexes (see
+    person_data). Other `options` are passed to iter_people.
+    """
+    from cv_generator import CVGenerator
+
+    if person_ids:
+        id_column = options.get('id_column', PERSON_ID_COLUMN)
+        people = ((person_id, person_data(file_paths, person_id, id_column)) for person_id in person_ids)
+    else:
+        people = iter_people(file_paths, **options)
+
+    os.makedirs(output_dir, exist_ok=True)
+    for person_id, data in people:
+        safe_id = re.sub(r'[^\w-]', '_', person_id)
+        path = os.path.join(output_dir, f"CV_{safe_id}.pdf")
+        CVGenerator(data, config).render(path)
+        yield person_id, path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Generate one CV per person from a multi-person CSV export')
+    parser.add_argument('files', nargs='+', help='Export CSV files (Positions.csv, Skills.csv...)')
+    parser.add_argument('--output-dir', required=True, help='Directory the PDFs are written to')
+    parser.add_argument('--id-column', default=PERSON_ID_COLUMN, help='Column holding the person id')
+    parser.add_argument('--chunk-rows', type=int, default=CHUNK_ROWS, help='Rows sorted in memory before spilling')
+    parser.add_argument('--spill-dir', help='Directory for sorted runs (defaults to the system temp dir)')
+    parser.add_argument('--template', default='modern', help='CV template')
+    parser.add_argument('--person', action='append', dest='person_ids',
+                        help='Only regenerate this person (repeatable); uses the row-offset indexes')
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    count = 0
+    for person_id, path in generate_cvs(args.files, args.output_dir, {'template': args.template},
+                                        person_ids=args.person_ids, id_column=args.id_column,
+                                        chunk_rows=args.chunk_rows, spill_dir=args.spill_dir):
+        count += 1
+        print(f"{person_id}: {path}")
+    print(f"Generated {count} CVs in {time.perf_counter() - start:.1f}s")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,482 @@
+from xml.sax.saxutils import unescape
+
+from reportlab.lib import colors
+from reportlab.lib.enums import TA_JUSTIFY
+from reportlab.lib.units import mm
+from reportlab.pdfbase.pdfmetrics import stringWidth
+
+from cv_generator import RenderEngine, PAGE_SIZE, PAGE_MARGIN, FRAME_PADDING, UNBOUNDED_HEIGHT
+from flowables import SkillsGrid, text_line
+from memory_guard import check_memory_budget
+from metrics import stage
+
+# Same tolerance as platypus frames when checking whether content fits
+FUZZ = 1e-6
+
+
+class TextItem:
+    """Lines of text in one style, broken and justified without Paragraph
+
+    `text` may contain <br/> line breaks (as produced by _format_description);
+    every other character is drawn literally. Lines are justified like a
+    TA_JUSTIFY Paragraph: all but the last line before each break. Each line
+    is stored as (words, ends_with_break).
+    """
+
+    def __init__(self, text, style, width, lines=None):
+        self.style = style
+        self.width = width
+        self.lines = lines if lines is not None else self._break_lines(text)
+        self.height = len(self.lines) * style.leading
+        self.space_before = style.spaceBefore
+        self.space_after = style.spaceAfter
+
+    def _break_lines(self, text):
+        style = self.style
+        available = self.width - style.leftIndent - style.rightIndent
+        space_width = stringWidth(' ', style.fontName, style.fontSize)
+
+        lines = []
+        for segment in text.split('<br/>'):
+            words = unescape(segment).split()
+            if not words:
+                lines.append(([], True))
+                continue
+
+            line = []
+            line_width = 0
+            for word in words:
+                word_width = stringWidth(word, style.fontName, style.fontSize)
+                # Paragraph lets justified spaces shrink a little before breaking
+                limit = available + style.spaceShrinkage * space_width * len(line)
+                if line and line_width + space_width + word_width > limit:
+                    lines.append((line, False))
+                    line = [word]
+                    line_width = word_width
+                else:
+                    line_width += (space_width if line else 0) + word_width
+                    line.append(word)
+            lines.append((line, True))
+        return lines
+
+    def split(self, available_height):
+        """Split between lines; like Paragraph, never leave a single first line behind"""
+        count = int((available_height + FUZZ) // self.style.leading)
+        if count >= len(self.lines):
+            return [self]
+        if count < 2:
+            return []
+        rest = self.lines[count:]
+        if self.lines[count - 1][1]:
+            # Paragraph continues after a hard break with an empty line
+            rest = [([], True)] + rest
+        return [
+            TextItem(None, self.style, self.width, self.lines[:count]),
+            TextItem(None, self.style, self.width, rest)
+        ]
+
+    def draw(self, canv, x, y):
+        style = self.style
+        available = self.width - style.leftIndent - style.rightIndent
+        justify = style.alignment == TA_JUSTIFY
+        canv.setFillColor(style.textColor)
+        baseline = y + self.height - style.fontSize
+
+        text = canv.beginText()
+        text.setFont(style.fontName, style.fontSize)
+        for words, ends_with_break in self.lines:
+            if words:
+                line = ' '.join(words)
+                word_space = 0
+                if justify and not ends_with_break and len(words) > 1:
+                    natural = stringWidth(line, style.fontName, style.fontSize)
+                    word_space = (available - natural) / (len(words) - 1)
+                text.setTextOrigin(x + style.leftIndent, baseline)
+                text.setWordSpace(word_space)
+                text.textOut(line)
+            baseline -= style.leading
+        canv.drawText(text)
+
+
+class FlowableItem:
+    """Our own single-purpose flowables (PlainLine, SkillsGrid) drawn without a frame"""
+
+    def __init__(self, flowable, width, offset=0):
+        self.flowable = flowable
+        self.width = width
+        self.offset = offset
+        _, self.height = flowable.wrapOn(None, width, UNBOUNDED_HEIGHT)
+        self.space_before = flowable.getSpaceBefore()
+        self.space_after = flowable.getSpaceAfter()
+
+    def split(self, available_height):
+        parts = self.flowable.split(self.width, available_height)
+        return [FlowableItem(part, self.width, self.offset) for part in parts]
+
+    def draw(self, canv, x, y):
+        self.flowable.drawOn(canv, x + self.offset, y)
+
+
+class SpaceItem:
+    """Fixed vertical space (Spacer)"""
+
+    space_before = 0
+    space_after = 0
+
+    def __init__(self, height):
+        self.height = height
+
+    def split(self, available_height):
+        return []
+
+    def draw(self, canv, x, y):
+        pass
+
+
+class RuleItem:
+    """Horizontal rule under section headers (HRFlowable)"""
+
+    space_before = 0
+
+    def __init__(self, width, color, thickness=1, space_after=10):
+        self.width = width
+        self.color = color
+        self.height = thickness
+        self.space_after = space_after
+
+    def split(self, available_height):
+        return []
+
+    def draw(self, canv, x, y):
+        canv.saveState()
+        canv.setLineWidth(self.height)
+        canv.setLineCap(1)
+        canv.setStrokeColor(self.color)
+        canv.line(x, y, x + self.width, y + self.height)
+        canv.restoreState()
+
+
+class HeaderWithPhoto:
+    """Contact details on the left and the photo on the right, as the header table"""
+
+    space_before = 0
+    space_after = 0
+
+    # Column widths of the platypus header table
+    INFO_WIDTH = 130*mm
+    PHOTO_WIDTH = 40*mm
+
+    def __init__(self, info_items, photo, frame_width):
+        self.info_items = info_items
+        self.photo = photo
+        _, photo_height = photo.wrapOn(None, self.PHOTO_WIDTH, UNBOUNDED_HEIGHT)
+        self.photo_size = photo.drawWidth, photo_height
+        self.height = max(stacked_height(info_items), photo_height)
+        # The 170mm table is centered in the narrower frame
+        self.offset = (frame_width - self.INFO_WIDTH - self.PHOTO_WIDTH) / 2
+
+    def split(self, available_height):
+        return []
+
+    def draw(self, canv, x, y):
+        x += self.offset
+        top = y + self.height
+
+        previous_after = None
+        for item in self.info_items:
+            if previous_after is not None:
+                top -= max(item.space_before - previous_after, 0)
+            item.draw(canv, x, top - item.height)
+            top -= item.height + item.space_after
+            previous_after = item.space_after
+
+        photo_width, photo_height = self.photo_size
+        self.photo.drawOn(canv, x + self.INFO_WIDTH + self.PHOTO_WIDTH - photo_width, y + self.height - photo_height)
+
+
+def stacked_height(items):
+    """Height of items stacked with collapsed spacing, as platypus measures lists"""
+    height = 0
+    space_after = 0
+    for i, item in enumerate(items):
+        if i:
+            height += max(item.space_before - space_after, 0)
+        height += item.height + item.space_after
+        space_after = item.space_after
+    return height - space_after
+
+
+class CanvasRenderer:
+    """Lay out and draw one CV straight onto a Canvas, page by page"""
+
+    def __init__(self, generator, output):
+        self.generator = generator
+        self.styles = generator.styles
+        self.canvas = generator._make_canvas(output, pagesize=PAGE_SIZE)
+
+        page_width, page_height = PAGE_SIZE
+        self.x = PAGE_MARGIN + FRAME_PADDING
+        self.top = page_height - PAGE_MARGIN - FRAME_PADDING
+        self.bottom = PAGE_MARGIN + FRAME_PADDING
+        self.width = page_width - 2 * PAGE_MARGIN - 2 * FRAME_PADDING
+        self.frame_height = self.top - self.bottom
+
+        self.y = self.top
+        self.at_top = True
+        self.previous_after = 0
+        self.pages = 1
+
+    # Items
+
+    def text(self, text, style_name, width=None):
+        return TextItem(text, self.styles[style_name], width or self.width)
+
+    def label(self, text, style_name, bold_prefix=''):
+        return FlowableItem(text_line(text, self.styles[style_name], bold_prefix=bold_prefix), self.width)
+
+    def section_header(self, title):
+        return [
+            self.text(title.upper(), 'SectionHeader'),
+            RuleItem(self.width, colors.HexColor(self.generator.colors['primary']))
+        ]
+
+    # Pagination
+
+    def new_page(self):
+        self.canvas.showPage()
+        self.pages += 1
+        self.y = self.top
+        self.at_top = True
+        self.previous_after = 0
+
+    def _space_before(self, item):
+        return 0 if self.at_top else max(item.space_before - self.previous_after, 0)
+
+    def place(self, item):
+        """Draw an item at the cursor, splitting it or moving to the next page as needed"""
+        while True:
+            space = self._space_before(item)
+            available = self.y - self.bottom - space
+            if item.height <= available + FUZZ:
+                item.draw(self.canvas, self.x, self.y - space - item.height)
+                self.y -= space + item.height + item.space_after
+                self.previous_after = item.space_after
+                self.at_top = False
+                return
+
+            parts = item.split(available) if available > 0 else []
+            if len(parts) == 2:
+                head, item = parts
+                head.draw(self.canvas, self.x, self.y - space - head.height)
+            elif self.at_top:
+                # Taller than an empty page and not splittable: draw and overflow
+                item.draw(self.canvas, self.x, self.y - item.height)
+                self.new_page()
+                return
+            self.new_page()
+
+    def place_block(self, items, keep_together=True):
+        """Place a block, starting a new page first if it fits on one page but not in the space left"""
+        check_memory_budget()
+        if keep_together and not self.at_top and items:
+            height = self._space_before(items[0]) + stacked_height(items)
+            if height <= self.frame_height and height > self.y - self.bottom + FUZZ:
+                self.new_page()
+        for item in items:
+            self.place(item)
+
+    def place_blocks(self, blocks, heading=None, keep_whole=False):
+        """Same policy as CVGenerator._keep_together, applied while drawing"""
+        blocks = [block for block in blocks if block]
+        if heading:
+            blocks = [heading + blocks[0]] + blocks[1:] if blocks else [heading]
+        if keep_whole:
+            whole = [item for block in blocks for item in block]
+            if stacked_height(whole) <= self.frame_height:
+                blocks = [whole]
+        for block in blocks:
+            self.place_block(block)
+
+    # Sections
+
+    def render(self):
+        with stage('story_build'):
+            header = self.build_header()
+            sections = [(name, getattr(self, f'build_{name}')) for name, _ in self.generator._enabled_sections()]
+
+        with stage('canvas_draw'):
+            for item in header:
+                self.place(item)
+            for _, build in sections:
+                build()
+            self.canvas.save()
+
+    def build_header(self):
+        generator = self.generator
+        profile = generator.data.get('profile', {})
+        items = []
+
+        # Next to the photo, lines break at the width of the table's info column
+        photo = generator._create_photo_image() if generator.data.get('photo') is not None else None
+        width = HeaderWithPhoto.INFO_WIDTH if photo is not None else self.width
+
+        full_name = f"{profile.get('first_name', '')} {profile.get('last_name', '')}".strip()
+        if full_name:
+            items.append(self.text(full_name, 'Name', width))
+        if profile.get('headline'):
+            items.append(self.text(profile['headline'], 'Headline', width))
+
+        line1_parts = []
+        if profile.get('email'):
+            line1_parts.append(f"Email: {profile['email']}")
+        if profile.get('phone'):
+            line1_parts.append(f"Tel: {profile['phone']}")
+        contact_lines = [' | '.join(line1_parts)] if line1_parts else []
+        if profile.get('address'):
+            contact_lines.append(f"Adresse: {profile['address']}")
+        items.extend(self.text(line, 'Contact', width) for line in contact_lines)
+
+        if photo is not None:
+            items = [HeaderWithPhoto(items, photo, self.width)]
+
+        items.append(SpaceItem(4*mm))
+        return items
+
+    def build_summary(self):
+        summary = self.generator._format_description(self.generator.data['profile']['summary'])
+        self.place_blocks(
+            [[self.text(summary, 'Summary'), SpaceItem(4*mm)]],
+            heading=self.section_header("À Propos")
+        )
+
+    def build_experience(self):
+        generator = self.generator
+        visible_indices = generator.config.get('experience_visible')
+        all_positions = generator.data.get('positions', [])
+        if visible_indices is not None:
+            positions = [all_positions[i] for i in visible_indices if i < len(all_positions)]
+        else:
+            positions = all_positions
+
+        blocks = []
+        for i, position in enumerate(positions):
+            items = []
+            if position.get('title'):
+                items.append(self.label(position['title'], 'JobTitle'))
+            if position.get('company'):
+                items.append(self.label(position['company'], 'Company'))
+            date_location = [position[key] for key in ('duration', 'location') if position.get(key)]
+            if date_location:
+                items.append(self.label(' | '.join(date_location), 'DateLocation'))
+            description = generator._experience_description(position.get('description'))
+            if description:
+                items.append(self.text(description, 'Description'))
+
+            position_blocks = [items]
+            for m, mission in enumerate(position.get('missions') or []):
+                if m:
+                    items = []
+                    position_blocks.append(items)
+                items.append(SpaceItem(2*mm))
+                items.append(self.label(f"→ Mission chez {mission.get('client', 'Client')}", 'MissionClient'))
+                if mission.get('title'):
+                    items.append(self.label(mission['title'], 'MissionTitle'))
+                mission_date_loc = [mission[key] for key in ('duration', 'location') if mission.get(key)]
+                if mission_date_loc:
+                    items.append(self.label(' | '.join(mission_date_loc), 'DateLocation'))
+                description = generator._experience_description(mission.get('description'))
+                if description:
+                    items.append(self.text(description, 'MissionDescription'))
+
+            if i < len(positions) - 1:
+                items.append(SpaceItem(4*mm))
+            blocks.extend(position_blocks)
+
+        self.place_blocks(blocks, heading=self.section_header("Expérience Professionnelle"))
+        self.place(SpaceItem(2*mm))
+
+    def build_education(self):
+        generator = self.generator
+        visible_indices = generator.config.get('education_visible')
+        all_education = generator.data.get('education', [])
+        if visible_indices is not None:
+            education = [all_education[i] for i in visible_indices if i < len(all_education)]
+        else:
+            education = all_education
+
+        blocks = []
+        for i, edu in enumerate(education):
+            items = []
+            degree_text = [edu[key] for key in ('degree', 'field_of_study') if edu.get(key)]
+            if degree_text:
+                items.append(self.label(' - '.join(degree_text), 'JobTitle'))
+            if edu.get('school'):
+                items.append(self.label(edu['school'], 'Company'))
+            date_range = [edu[key] for key in ('start_date', 'end_date') if edu.get(key)]
+            if date_range:
+                items.append(self.label(' - '.join(date_range), 'DateLocation'))
+            if i < len(education) - 1:
+                items.append(SpaceItem(4*mm))
+            blocks.append(items)
+        blocks.append([SpaceItem(2*mm)])
+
+        self.place_blocks(blocks, heading=self.section_header("Formation"), keep_whole=True)
+
+    def build_skills(self):
+        skills = self.generator.data.get('skills', [])
+        num_cols = 3 if len(skills) > 10 else 2
+        labels = [f"- {' '.join(str(skill).split())}" for skill in skills]
+        grid = SkillsGrid(labels, self.styles['SkillItem'], num_cols, 170*mm/num_cols)
+        # The grid is wider than the frame and centered, as the former table
+        item = FlowableItem(grid, self.width, offset=(self.width - num_cols * grid.col_width) / 2)
+
+        self.place_blocks([[item, SpaceItem(2*mm)]], heading=self.section_header("Compétences"), keep_whole=True)
+
+    def build_languages(self):
+        blocks = []
+        for lang in self.generator.data.get('languages', []):
+            lang_text = f" - {lang['proficiency']}" if lang.get('proficiency') else ''
+            blocks.append([self.label(lang_text, 'SkillItem', bold_prefix=lang.get('name', ''))])
+        blocks.append([SpaceItem(2*mm)])
+
+        self.place_blocks(blocks, heading=self.section_header("Langues"), keep_whole=True)
+
+    def build_certifications(self):
+        certifications = self.generator.data.get('certifications', [])
+        blocks = []
+        for i, cert in enumerate(certifications):
+            items = []
+            if cert.get('name'):
+                items.append(self.label(cert['name'], 'JobTitle'))
+            if cert.get('authority'):
+                items.append(self.label(cert['authority'], 'Company'))
+            if cert.get('start_date'):
+                date_text = cert['start_date']
+                if cert.get('end_date'):
+                    date_text += f" - {cert['end_date']}"
+                items.append(self.label(date_text, 'DateLocation'))
+            if i < len(certifications) - 1:
+                items.append(SpaceItem(3*mm))
+            blocks.append(items)
+
+        self.place_blocks(blocks, heading=self.section_header("Certifications"), keep_whole=True)
+
+
+class CanvasEngine(RenderEngine):
+    """Draw the modern template directly on a Canvas, without platypus frames
+
+    Text is broken into lines with stringWidth and justified with word
+    spacing; pagination follows the platypus engine's keep-together policy.
+    Other templates are rendered by the platypus engine.
+    """
+
+    name = 'canvas'
+    templates = ('modern',)
+
+    def supports(self, generator):
+        return generator.template in self.templates
+
+    def render(self, generator, output):
+        renderer = CanvasRenderer(generator, output)
+        renderer.render()
+        return renderer.pages
@@ -0,0 +1,169 @@
+import csv
+import json
+import logging
+import mmap
+import os
+import threading
+import uuid
+
+logger = logging.getLogger(__name__)
+
+INDEX_VERSION = 1
+INDEX_SUFFIX = '.idx.json'
+
+_cache = {}
+_cache_lock = threading.Lock()
+
+
+def _record_spans(mm, start):
+    """(offset, end) of each CSV record from `start`, newlines excluded
+
+    A newline ends a record only outside quotes: with RFC 4180 escaping ("")
+    a line break is inside a quoted field exactly when the number of quotes
+    seen since the record started is odd.
+    """
+    size = len(mm)
+    offset = start
+    while offset < size:
+        end = offset
+        quotes = 0
+        while True:
+            newline = mm.find(b'\n', end)
+            if newline == -1:
+                newline = size
+            quotes += mm[end:newline].count(b'"')
+            if quotes % 2 == 0 or newline == size:
+                break
+            end = newline + 1
+        yield offset, newline
+        offset = newline + 1
+
+
+class CSVIndex:
+    """Byte offsets of the rows of each person in a multi-person CSV file
+
+    Built by scanning the memory-mapped file once; rows(person_id) then reads
+    only that person's rows. The index is saved next to the file
+    (`<file>.idx.json`) and reused while the file's size and mtime are
+    unchanged.
+    """
+
+    def __init__(self, path, id_column, header, offsets, size, mtime_ns):
+        self.path = path
+        self.id_column = id_column
+        self.header = header
+        self.offsets = offsets  # person id -> [offset, length, offset, length, ...]
+        self.size = size
+        self.mtime_ns = mtime_ns
+
+    @classmethod
+    def open(cls, path, id_column):
+        """Index of `path`: cached in memory, loaded from disk or built"""
+        stat = os.stat(path)
+        key = (os.path.abspath(path), id_column)
+        with _cache_lock:
+            index = _cache.get(key)
+        if index is None or not index.matches(stat):
+            index = cls.load(path, id_column, stat)
+            if index is None:
+                index = cls.build(path, id_column)
+                index.save()
+            with _cache_lock:
+                _cache[key] = index
+        return index
+
+    @classmethod
+    def build(cls, path, id_column):
+        """Scan `path` and index its rows by the value of `id_column`
+
+        Raises:
+            ValueError: If the file has no `id_column` column
+        """
+        stat = os.stat(path)
+        offsets = {}
+        with open(path, 'rb') as f:
+            if stat.st_size == 0:
+                raise ValueError(f"{os.path.basename(path)} has no '{id_column}' column")
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                start = 3 if mm[:3] == b'\xef\xbb\xbf' else 0
+                spans = _record_spans(mm, start)
+                header_span = next(spans)
+                header = next(csv.reader([mm[slice(*header_span)].decode('utf-8')]), [])
+                if id_column not in header:
+                    raise ValueError(f"{os.path.basename(path)} has no '{id_column}' column")
+                column = header.index(id_column)
+
+                current = []
+
+                def records():
+                    for span in spans:
+                        current[:] = span
+                        yield mm[span[0]:span[1]].decode('utf-8')
+
+                for values in csv.reader(records()):
+                    person_id = values[column].strip() if len(values) > column else ''
+                    if person_id:
+                        offset, end = current
+                        offsets.setdefault(person_id, []).extend((offset, end - offset))
+
+        logger.info(f"Indexed {len(offsets)} people in {os.path.basename(path)}")
+        return cls(path, id_column, header, offsets, stat.st_size, stat.st_mtime_ns)
+
+    @classmethod
+    def load(cls, path, id_column, stat=None):
+        """Index saved next to `path`, or None if missing, unreadable or stale"""
+        stat = stat or os.stat(path)
+        try:
+            with open(path + INDEX_SUFFIX, encoding='utf-8') as f:
+                saved = json.load(f)
+            if saved['version'] != INDEX_VERSION:
+                return None
+            index = cls(path, saved['id_column'], saved['header'], saved['offsets'],
+                        saved['size'], saved['mtime_ns'])
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+        if index.id_column != id_column or not index.matches(stat):
+            return None
+        return index
+
+    def save(self):
+        """Write the index next to the file (atomically); failures are only logged"""
+        index_path = self.path + INDEX_SUFFIX
+        temp_path = f"{index_path}.{uuid.uuid4().hex}.tmp"
+        try:
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump({
+                    'version': INDEX_VERSION,
+                    'id_column': self.id_column,
+                    'size': self.size,
+                    'mtime_ns': self.mtime_ns,
+                    'header': self.header,
+                    'offsets': self.offsets
+                }, f, separators=(',', ':'))
+            os.replace(temp_path, index_path)
+        except OSError as e:
+            logger.warning(f"Could not save CSV index {index_path}: {e}")
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    def matches(self, stat):
+        """Whether the index still describes a file with this os.stat() result"""
+        return stat.st_size == self.size and stat.st_mtime_ns == self.mtime_ns
+
+    def person_ids(self):
+        return list(self.offsets)
+
+    def rows(self, person_id):
+        """Rows of one person (dicts keyed by header, id column removed), in file order"""
+        spans = self.offsets.get(person_id)
+        if not spans:
+            return []
+        rows = []
+        with open(self.path, 'rb') as f:
+            for i in range(0, len(spans), 2):
+                f.seek(spans[i])
+                record = f.read(spans[i + 1]).decode('utf-8')
+                row = dict(zip(self.header, next(csv.reader([record]))))
+                row.pop(self.id_column, None)
+                rows.append(row)
+        return rows
@@ -6,22 +6,237 @@ from reportlab.lib.enums import TA_LEFT, TA_CENTER, TA_JUSTIFY, TA_RIGHT
 from reportlab.lib import colors
 from reportlab.pdfbase import pdfmetrics
 from reportlab.pdfbase.ttfonts import TTFont
+from reportlab.pdfgen.canvas import Canvas
 import os
+import hashlib
+import json
 import tempfile
 import base64
 import re
 from io import BytesIO
 from PIL import Image as PILImage
-from datetime import datetime
+from datetime import datetime, timezone
+from importlib import import_module
+from metrics import stage, timed
+from memory_guard import check_memory_budget
+from flowables import SkillsGrid, text_line
+from fonts import get_family
+from artifact_store import get_store
+from page_estimate import estimate_layout, fit_layout, get_measure_cache
+import unicodedata
+
+# Page geometry shared by the document template and the layout measurements
+PAGE_SIZE = A4
+PAGE_MARGIN = 20*mm
+FRAME_PADDING = 6  # Frame default padding (points) on each side
+
+# Height passed to wrap() when measuring, as ReportLab's own list measurement does
+UNBOUNDED_HEIGHT = 0xfffffff
+
+# Byte-identical PDFs for identical inputs unless config.deterministic says otherwise
+DETERMINISTIC_DEFAULT = os.getenv('CV_DETERMINISTIC_PDF', 'False').lower() == 'true'
+
+
+def payload_digest(data, config=None):
+    """SHA-256 hex digest of a CV payload, independent of key order"""
+    canonical = json.dumps([data, config or {}], sort_keys=True, separators=(',', ':'),
+                           ensure_ascii=False, default=str)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+def is_deterministic(config=None):
+    """Whether a render with this config is byte-identical for identical inputs"""
+    deterministic = (config or {}).get('deterministic')
+    return deterministic if isinstance(deterministic, bool) else DETERMINISTIC_DEFAULT
+
+
+def pdf_date(value):
+    """PDF date string (D:YYYYMMDDHHmmSS+00'00') for an ISO date or datetime, in UTC"""
+    date = datetime.fromisoformat(str(value))
+    if date.tzinfo is not None:
+        date = date.astimezone(timezone.utc)
+    return date.strftime("D:%Y%m%d%H%M%S+00'00'")
+
+
+class MeasuredKeepTogether(KeepTogether):
+    """KeepTogether that reuses the height measured when the story was built
+
+    KeepTogether wraps all of its content (and deep-copies the frame) every
+    time it is laid out. Blocks built by the layout policy are measured once
+    at the frame width, so wrap() only falls back to a full measurement if
+    the available width differs.
+    """
+
+    def __init__(self, flowables, width, height, first_height, avail_width):
+        super().__init__(flowables)
+        self._measured = (width, height, first_height, avail_width)
+
+    def wrap(self, aW, aH):
+        width, height, first_height, avail_width = self._measured
+        if abs(aW - avail_width) > 1e-6:
+            return super().wrap(aW, aH)
+        self._H = height
+        self._H0 = first_height
+        self._wrapInfo = aW, aH
+        return width, 0xffffff  # force a split, like KeepTogether
+
+
+class RenderEngine:
+    """Turns a prepared CVGenerator (data, config, styles) into a PDF
+
+    Engines are selected per request with the 'engine' config key. An engine
+    that does not support the requested template leaves it to the default
+    platypus engine.
+    """
+
+    name = None
+
+    def supports(self, generator):
+        """Whether this engine can render the generator's template"""
+        return True
+
+    def render(self, generator, output):
+        """Render to a filename or writable file-like object"""
+        raise NotImplementedError
+
+
+class PlatypusEngine(RenderEngine):
+    """Build a story of flowables and lay it out with SimpleDocTemplate"""
+
+    name = 'platypus'
+
+    def render(self, generator, output):
+        doc = generator._create_document(output)
+
+        with stage('story_build'):
+            story = generator._build_story()
+
+        # Abort between flowables if the render outgrows its memory budget
+        doc.afterFlowable = lambda flowable: check_memory_budget()
+
+        # Build PDF
+        with stage('doc_build'):
+            doc.build(story, canvasmaker=generator._make_canvas)
+
+
+DEFAULT_ENGINE = 'platypus'
+
+# Render engines by name: (module, class), imported on first use
+RENDER_ENGINES = {
+    'platypus': ('cv_generator', 'PlatypusEngine'),
+    'canvas': ('canvas_engine', 'CanvasEngine'),
+}
+
+_engine_instances = {}
+
+
+def get_render_engine(name):
+    """Engine instance for a name, falling back to the default engine for unknown names"""
+    if name not in RENDER_ENGINES:
+        name = DEFAULT_ENGINE
+    if name not in _engine_instances:
+        module_name, class_name = RENDER_ENGINES[name]
+        _engine_instances[name] = getattr(import_module(module_name), class_name)()
+    return _engine_instances[name]
+
+
+# Typographic apostrophes normalized to ASCII, so words like "d'une" stay intact
+APOSTROPHES = {0x2019: "'", 0x2018: "'", 0x201B: "'"}
+
+# Bullet characters become line breaks; _format_description re-adds "• " bullets
+BULLET_SEPARATORS = frozenset(map(ord, '\u2022\u2023\u25E6\u2043\u2219'))
+
+# Emoji blocks act as bullet separators whatever the font can draw
+EMOJI_RANGES = (
+    (0x1F000, 0x1FAFF),  # emoticons, pictographs, transport, flags, supplemental symbols
+    (0x2600, 0x27BF),    # miscellaneous symbols and dingbats (⚡ ✅ ✨)
+    (0x2B00, 0x2BFF),    # miscellaneous symbols and arrows (⭐)
+)
+
+# Emoji modifiers with no glyph of their own
+INVISIBLE = frozenset([0x200D, 0x20E3]) | frozenset(range(0xFE00, 0xFE10))
+
+
+class SanitizeTable(dict):
+    """str.translate table deciding each character once against a font's coverage
+
+    Emojis, bullets and symbols the font cannot draw become line breaks (list
+    separators); other characters the font cannot draw are removed; the rest
+    is kept. Decisions are cached in the dict as characters are first seen.
+    """
+
+    def __init__(self, coverage):
+        super().__init__(APOSTROPHES)
+        self.coverage = coverage
+
+    def __missing__(self, codepoint):
+        char = chr(codepoint)
+        if codepoint in BULLET_SEPARATORS or any(low <= codepoint <= high for low, high in EMOJI_RANGES):
+            value = '\n'
+        elif codepoint in INVISIBLE:
+            value = None
+        elif codepoint in self.coverage or char.isspace():
+            value = codepoint
+        elif unicodedata.category(char) in ('So', 'Co'):
+            value = '\n'
+        else:
+            value = None
+        self[codepoint] = value
+        return value
+
+
+_sanitize_tables = {}
+
+
+def sanitize_table(family):
+    """Shared SanitizeTable for a font family"""
+    table = _sanitize_tables.get(family.name)
+    if table is None:
+        table = _sanitize_tables.setdefault(family.name, SanitizeTable(family.coverage))
+    return table
+
+
+class PreparedCV:
+    """CV data prepared once, to be rendered with several configs
+
+    Holds the emoji-cleaned data (sanitized for one font family), the
+    formatted descriptions and the processed photo (JPEG bytes, or None if it
+    could not be loaded), with the digest of the data before the photo was
+    taken out (deterministic document IDs). Only plain values, so it can be
+    pickled to worker processes.
+    """
+
+    def __init__(self, data, descriptions, photo, font, digest):
+        self.data = data
+        self.descriptions = descriptions
+        self.photo = photo
+        self.font = font
+        self.digest = digest
+
 
 class CVGenerator:
     """Generate PDF CV from parsed LinkedIn data"""
 
     def __init__(self, data, config=None):
-        # Clean emojis from data before storing
-        self.data = self._clean_emoji_from_data(data)
         self.config = config or {}
-        self.styles = getSampleStyleSheet()
+
+        # Font family from config (registered once per process); unknown names use the default
+        self.font_family = get_family(self.config.get('font'))
+
+        if isinstance(data, PreparedCV):
+            if data.font != self.font_family.name:
+                raise ValueError(f"Data prepared for font {data.font!r}, not {self.font_family.name!r}")
+            # Shared work already done by prepare()
+            self.data = data.data
+            self._descriptions = dict(data.descriptions)
+            self._photo = (data.photo,)
+            self._data_digest = data.digest
+        else:
+            # Clean emojis from data before storing
+            self.data = self._clean_emoji_from_data(data)
+            self._descriptions = {}
+            self._photo = None  # (JPEG bytes or None,) once processed
+            self._data_digest = None  # payload_digest(self.data), once needed
 
         # Extract colors from config or use defaults
         colors_config = self.config.get('colors', {})
@@ -34,70 +249,39 @@ class CVGenerator:
         # Extract template from config or use default
         self.template = self.config.get('template', 'modern')
 
-        self._setup_custom_styles()
+        # Render engine from config; engines that lack the template use platypus
+        self.engine = self.config.get('engine', DEFAULT_ENGINE)
+
+        # Deterministic mode: fixed creation date and document ID (see _make_canvas)
+        self.deterministic = is_deterministic(self.config)
+
+        # Layout scale (font sizes, leading, paragraph spacing) and length of
+        # experience descriptions, chosen by fit_pages (see page_estimate.fit_layout)
+        self.layout_scale = float(self.config.get('layout_scale', 1))
+        self.description_limit = self.config.get('description_limit')
+        self.fit = None  # parameters chosen for fit_pages, once rendered or estimated
+
+        self._style_keys = {}  # id(style) -> _style_key(style)
 
+        with stage('style_setup'):
+            self.styles = getSampleStyleSheet()
+            self._setup_custom_styles()
+
+    @timed('emoji_clean')
     def _clean_emoji_from_data(self, data):
-        """Remove all emojis and problematic Unicode characters from data to avoid encoding issues with Helvetica font
+        """Remove emojis and the characters the CV's font family cannot draw
 
         Emojis are treated as bullet point separators - they create new lines that will be formatted as bullet points.
+        Accents, dashes and symbols the font has glyphs for are kept (see sanitize_table).
         """
+        table = sanitize_table(self.font_family)
+
         def remove_emoji(text):
             if not isinstance(text, str):
                 return text
 
-            # ÉTAPE 1: Normaliser les apostrophes typographiques en apostrophes ASCII
-            # pour préserver les mots comme "d'une", "l'API"
-            # U+2019 (') → U+0027 (')
-            # U+2018 (') → U+0027 (')
-            text = text.replace('\u2019', "'")  # Right single quotation mark
-            text = text.replace('\u2018', "'")  # Left single quotation mark
-            text = text.replace('\u201B', "'")  # Single high-reversed-9 quotation mark
-
-            # ÉTAPE 2: Pattern exhaustif pour capturer TOUS les emojis et symboles Unicode problématiques
-            # Cette approche couvre toutes les plages d'emojis Unicode connues
-            emoji_pattern = re.compile(
-                "["
-                "\U0001F600-\U0001F64F"  # emoticons
-                "\U0001F300-\U0001F5FF"  # symbols & pictographs (inclut 🎉 🔄 🗄️)
-                "\U0001F680-\U0001F6FF"  # transport & map symbols
-                "\U0001F1E0-\U0001F1FF"  # flags (iOS)
-                "\U0001F700-\U0001F77F"  # alchemical symbols
-                "\U0001F780-\U0001F7FF"  # geometric shapes extended
-                "\U0001F800-\U0001F8FF"  # supplemental arrows-C
-                "\U0001F900-\U0001F9FF"  # supplemental symbols (inclut 🤖)
-                "\U0001FA00-\U0001FA6F"  # extended symbols
-                "\U0001FA70-\U0001FAFF"  # symbols and pictographs extended-A
-                "\U00002600-\U000026FF"  # miscellaneous symbols (inclut ⚡)
-                "\U00002700-\U000027BF"  # dingbats
-                "\U00002300-\U000023FF"  # miscellaneous technical
-                "\U00002B00-\U00002BFF"  # miscellaneous symbols and arrows
-                "\U00003000-\U0000303F"  # CJK symbols and punctuation
-                "\U0000FE00-\U0000FE0F"  # variation selectors (modificateurs d'emojis)
-                "\U0000FF00-\U0000FFEF"  # halfwidth and fullwidth forms
-                "\U00002000-\U0000206F"  # general punctuation (apostrophes déjà normalisées)
-                "\U00002190-\U000021FF"  # arrows
-                "\U00002300-\U000023FF"  # miscellaneous technical
-                "\U00002460-\U000024FF"  # enclosed alphanumerics
-                "\U00002500-\U000025FF"  # box drawing
-                "\U00002600-\U000027BF"  # miscellaneous symbols and dingbats
-                "\U00002900-\U000029FF"  # supplemental arrows-B
-                "\U00002A00-\U00002AFF"  # supplemental mathematical operators
-                "\U00003200-\U000032FF"  # enclosed CJK letters and months
-                "\U0000E000-\U0000F8FF"  # private use area
-                "\u2022"  # bullet point •
-                "\u2023"  # triangular bullet ‣
-                "\u25E6"  # white bullet ◦
-                "\u2043"  # hyphen bullet ⁃
-                "\u2219"  # bullet operator ∙
-                "\u00A0"  # non-breaking space
-                "]+",
-                flags=re.UNICODE
-            )
-
-            # IMPORTANT: Remplacer les emojis par des sauts de ligne au lieu de les supprimer
-            # Cela permet de traiter chaque emoji comme un séparateur de bullet point
-            # Ex: "🎉 Item 1 🤖 Item 2" devient "Item 1\nItem 2"
-            cleaned = emoji_pattern.sub('\n', text)
+            # Plain ASCII needs no translation (every family draws it)
+            cleaned = text if text.isascii() else text.translate(table)
 
             # Nettoyer les espaces multiples (mais pas les \n)
             # Remplacer plusieurs espaces consécutifs par un seul, sauf les sauts de ligne
@@ -136,6 +320,9 @@ class CVGenerator:
         """
         if not text or not isinstance(text, str):
             return text
+        if text in self._descriptions:
+            return self._descriptions[text]
+        original = text
 
         # IMPORTANT: Détecter UNIQUEMENT les 'n' qui sont des marqueurs de saut de ligne
         # et non pas le 'n' qui fait partie de mots français
@@ -210,8 +397,24 @@ class CVGenerator:
         # Les doubles <br/> (paragraphes) deviennent des espacements plus grands
         formatted_text = formatted_text.replace('<br/><br/>', '<br/><br/>')
 
+        self._descriptions[original] = formatted_text
         return formatted_text
 
+    def _experience_description(self, text):
+        """Formatted position or mission description, cut to the description limit
+
+        Descriptions longer than the limit (in characters) end at the last
+        whole word, with an ellipsis; a limit of 0 leaves them out.
+        """
+        limit = self.description_limit
+        if text and limit is not None and len(text) > limit:
+            if not limit:
+                return ''
+            text = text[:limit].rsplit(' ', 1)[0]
+            # No dangling line break marker (see _format_description) or punctuation
+            text = re.sub(r'(\s+n+)+$', '', text).rstrip(' ,;:.•-') + '…'
+        return self._format_description(text)
+
     def _setup_custom_styles(self):
         """Setup custom paragraph styles with template-specific configurations"""
 
@@ -226,6 +429,32 @@ class CVGenerator:
             # Default to modern
             self._setup_modern_styles()
 
+        self._apply_font_family()
+        self._scale_styles()
+
+    def _apply_font_family(self):
+        """Switch styles from the Helvetica faces to the configured font family"""
+        faces = self.font_family.faces
+        if faces['normal'] == 'Helvetica':
+            return
+
+        helvetica = get_family('Helvetica').faces
+        replacements = {helvetica[face]: faces[face] for face in faces}
+        for style in self.styles.byName.values():
+            for attribute in ('fontName', 'bulletFontName'):
+                font_name = getattr(style, attribute, None)
+                if font_name in replacements:
+                    setattr(style, attribute, replacements[font_name])
+
+    def _scale_styles(self):
+        """Scale font sizes, leading and paragraph spacing by the layout scale"""
+        if self.layout_scale == 1:
+            return
+        for style in self.styles.byName.values():
+            if isinstance(style, ParagraphStyle):
+                for attribute in ('fontSize', 'leading', 'spaceBefore', 'spaceAfter', 'bulletFontSize'):
+                    setattr(style, attribute, getattr(style, attribute) * self.layout_scale)
+
     def _setup_modern_styles(self):
         """Setup modern template styles"""
         # Name style - Bold and large
@@ -689,12 +918,31 @@ class CVGenerator:
             alignment=TA_JUSTIFY
         ))
 
-    def generate(self):
-        """Generate the PDF CV"""
-        # Create CV folder if it doesn't exist
-        cv_folder = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'cv')
-        os.makedirs(cv_folder, exist_ok=True)
+    def prepare(self):
+        """Do the config-independent work once and return it as a PreparedCV
 
+        Descriptions are formatted and the photo is processed up front, so
+        that generators built from the result only lay out and draw.
+        """
+        profile = self.data.get('profile', {})
+        texts = [profile.get('summary')]
+        for position in self.data.get('positions', []):
+            texts.append(position.get('description'))
+            texts.extend(mission.get('description') for mission in position.get('missions') or [])
+        for text in texts:
+            self._format_description(text)
+
+        data = dict(self.data)
+        photo = None
+        if data.get('photo') is not None:
+            photo = self._processed_photo()
+            # The processed photo replaces the (large) base64 payload
+            data['photo'] = ''
+
+        return PreparedCV(data, dict(self._descriptions), photo, self.font_family.name, self._digest())
+
+    def generate(self):
+        """Generate the PDF CV into the artifact store (cv/ folder) and return its path"""
         # Extract name from profile for filename
         profile = self.data.get('profile', {})
         last_name = profile.get('last_name', 'Inconnu').strip()
@@ -708,24 +956,194 @@ class CVGenerator:
         # Generate filename with name and timestamp
         timestamp = datetime.now().strftime('%Y-%m-%d_%H%M%S')
         filename = f"CV_{last_name_clean.upper()}_{first_name_clean.capitalize()}_{timestamp}.pdf"
-        pdf_path = os.path.join(cv_folder, filename)
 
+        # Written atomically; identical PDFs share their content, old ones are evicted
+        return get_store().save(filename, self.render)
+
+    def estimate(self):
+        """Estimated page count and per-section heights, without rendering (see page_estimate)
+
+        With fit_pages, the estimate of the fitted layout, with the chosen
+        parameters under `fit`.
+        """
+        if self.config.get('fit_pages'):
+            generator, self.fit = fit_layout(self)
+            return dict(estimate_layout(generator), fit=self.fit)
+        return estimate_layout(self)
+
+    def render(self, output):
+        """Render the CV to a filename or writable file-like object
+
+        With fit_pages, the layout that fits that many pages is chosen from
+        estimates first and only that one is rendered (parameters kept in
+        self.fit).
+        """
+        if self.config.get('fit_pages'):
+            generator, self.fit = fit_layout(self)
+            generator.render(output)
+            return
+        engine = get_render_engine(self.engine)
+        if not engine.supports(self):
+            engine = get_render_engine(DEFAULT_ENGINE)
+        engine.render(self, output)
+
+    def _make_canvas(self, output, **kwargs):
+        """Canvas the engines draw on (also the platypus canvasmaker)
+
+        In deterministic mode the PDF carries no time of rendering and no
+        random data: ReportLab's invariant mode fixes the creation date
+        (SOURCE_DATE_EPOCH, else 2000-01-01) unless config.creation_date
+        gives one, and the document ID is derived from the payload.
+        """
+        if not self.deterministic:
+            return Canvas(output, **kwargs)
+
+        kwargs['invariant'] = 1
+        canvas = Canvas(output, **kwargs)
+
+        creation_date = self.config.get('creation_date')
+        if creation_date:
+            date = pdf_date(creation_date)
+            canvas.setDateFormatter(lambda *_: date)
+
+        # Same payload, same ID; different CVs still get different IDs
+        canvas._doc.updateSignature(payload_digest(self._digest(), self.config))
+        return canvas
+
+    def _digest(self):
+        """payload_digest of the CV data as given (photo included), shared with prepared copies"""
+        if self._data_digest is None:
+            self._data_digest = payload_digest(self.data)
+        return self._data_digest
+
+    def _create_document(self, output):
+        """Create the A4 document template used for rendering"""
         # Create PDF with better margins
-        doc = SimpleDocTemplate(
-            pdf_path,
-            pagesize=A4,
-            rightMargin=20*mm,
-            leftMargin=20*mm,
-            topMargin=20*mm,
-            bottomMargin=20*mm
+        return SimpleDocTemplate(
+            output,
+            pagesize=PAGE_SIZE,
+            rightMargin=PAGE_MARGIN,
+            leftMargin=PAGE_MARGIN,
+            topMargin=PAGE_MARGIN,
+            bottomMargin=PAGE_MARGIN
         )
 
-        # Build content
+    def _frame_size(self):
+        """Width and height available to flowables in the document frame"""
+        width, height = PAGE_SIZE
+        return (width - 2 * PAGE_MARGIN - 2 * FRAME_PADDING,
+                height - 2 * PAGE_MARGIN - 2 * FRAME_PADDING)
+
+    def _keep_together(self, blocks, heading=None, keep_whole=False):
+        """Lay out consecutive blocks of flowables, keeping together only those that fit on a page
+
+        Every flowable is measured once at the frame width. Each block that
+        fits is wrapped in a MeasuredKeepTogether; a block taller than a page
+        flows normally, since KeepTogether could not place it anyway and would
+        only split and re-wrap it. With keep_whole, all blocks are first kept
+        together as one when they fit (short sections keep their layout).
+
+        Args:
+            blocks (list): Lists of flowables (one per entry)
+            heading (list): Flowables added to the first block, so that a
+                section header is never left alone at the bottom of a page
+            keep_whole (bool): Keep all blocks together when they fit
+
+        Returns:
+            list: Flowables for the story
+        """
+        if heading:
+            blocks = [heading + blocks[0]] + blocks[1:] if blocks else [heading]
+
+        frame_width, frame_height = self._frame_size()
+        blocks = [[(flowable, self._measure(flowable, frame_width)) for flowable in block]
+                  for block in blocks if block]
+
+        if keep_whole and blocks:
+            whole = [item for block in blocks for item in block]
+            if self._stacked_height(whole) <= frame_height:
+                blocks = [whole]
+
+        elements = []
+        for block in blocks:
+            height = self._stacked_height(block)
+            flowables = [flowable for flowable, _ in block]
+            if len(flowables) > 1 and height <= frame_height:
+                width = max(dims[0] for _, dims in block)
+                elements.append(MeasuredKeepTogether(flowables, width, height, block[0][1][1], frame_width))
+            else:
+                elements.extend(flowables)
+        return elements
+
+    def _measure(self, flowable, width):
+        """Wrap a flowable once: (width, height, space before, space after)
+
+        Paragraph measurements are shared between generators through a
+        process-wide cache keyed by text, style and width; a paragraph taken
+        from the cache is wrapped again only when laid out. The result is
+        kept on the flowable, for page estimates to reuse. Parts produced by
+        split() carry no text (only their lines), so they are always wrapped.
+        """
+        def wrap():
+            w, h = flowable.wrapOn(None, width, UNBOUNDED_HEIGHT)
+            return w, h, flowable.getSpaceBefore(), flowable.getSpaceAfter()
+
+        if isinstance(flowable, Paragraph) and flowable.text is not None:
+            key = (flowable.text, flowable.bulletText, self._style_key(flowable.style), width)
+            dims = get_measure_cache().get(key, wrap)
+        else:
+            dims = wrap()
+        flowable._measured_at = (width, dims)
+        return dims
+
+    def _style_key(self, style):
+        """Hashable summary of a paragraph style and the styles it inherits from"""
+        key = self._style_keys.get(id(style))
+        if key is None:
+            chain = []
+            while style is not None:
+                chain.append(style)
+                style = style.parent
+            properties = {}
+            for ancestor in reversed(chain):
+                properties.update(ancestor.__dict__)
+            key = tuple(sorted((name, repr(value)) for name, value in properties.items()
+                               if name not in ('name', 'parent')))
+            self._style_keys[id(chain[0])] = key
+        return key
+
+    def _stacked_height(self, measured):
+        """Height of measured flowables stacked in a frame, with collapsed spacing
+
+        Mirrors ReportLab's list measurement: space before the first flowable
+        and after the last one is dropped, and adjacent spaces collapse to the
+        larger of the two.
+        """
+        height = 0
+        space_after = 0
+        for i, (_, (_, h, before, after)) in enumerate(measured):
+            height += h
+            if i:
+                height += max(before - space_after, 0)
+            space_after = after
+            height += space_after
+        return height - space_after
+
+    def _build_story(self):
+        """Build the list of flowables for the header and all enabled sections"""
         story = []
 
         # Header section (always included)
         story.extend(self._build_header())
 
+        for section_name, builder in self._enabled_sections():
+            check_memory_budget()
+            story.extend(builder())
+
+        return story
+
+    def _enabled_sections(self):
+        """Return (name, builder) pairs for enabled sections with data, in configured order"""
         # Get section configuration
         sections_config = self.config.get('sections', {})
         section_order = self.config.get('section_order', [
@@ -742,6 +1160,8 @@ class CVGenerator:
             'certifications': self._build_certifications
         }
 
+        sections = []
+
         # Build sections in configured order
         for section_name in section_order:
             # Check if section is enabled (default to True if not specified)
@@ -757,12 +1177,9 @@ class CVGenerator:
                     has_data = bool(self.data.get(data_key))
 
                 if has_data:
-                    story.extend(section_builders[section_name]())
+                    sections.append((section_name, section_builders[section_name]))
 
-        # Build PDF
-        doc.build(story)
-
-        return pdf_path
+        return sections
 
     def _create_section_header(self, title):
         """Create a section header with horizontal line"""
@@ -777,6 +1194,7 @@ class CVGenerator:
         ))
         return elements
 
+    @timed('build_header')
     def _build_header(self):
         """Build header section with name, contact info, and photo"""
         elements = []
@@ -872,6 +1290,20 @@ class CVGenerator:
 
     def _create_photo_image(self):
         """Create photo image from base64 data with fixed square dimensions"""
+        photo = self._processed_photo()
+        if photo is None:
+            return None
+        return Image(BytesIO(photo), width=35*mm, height=35*mm)
+
+    def _processed_photo(self):
+        """Square JPEG bytes of the photo, processed once per generator"""
+        if self._photo is None:
+            self._photo = (self._process_photo(),)
+        return self._photo[0]
+
+    @timed('photo_process')
+    def _process_photo(self):
+        """Crop and resize the base64 photo to a square JPEG; None if it cannot be loaded"""
         try:
             photo_data = self.data.get('photo', '')
 
@@ -933,12 +1365,8 @@ class CVGenerator:
             # Save to BytesIO
             img_buffer = BytesIO()
             pil_image.save(img_buffer, format='JPEG', quality=85)
-            img_buffer.seek(0)
 
-            # Create ReportLab Image with exact dimensions
-            img = Image(img_buffer, width=35*mm, height=35*mm)
-
-            return img
+            return img_buffer.getvalue()
 
         except Exception as e:
             import logging
@@ -946,19 +1374,22 @@ class CVGenerator:
             # Return None instead of empty Paragraph to avoid breaking table layout
             return None
 
+    @timed('build_summary')
     def _build_summary(self):
         """Build summary/about section"""
         elements = []
         profile = self.data.get('profile', {})
 
-        elements.extend(self._create_section_header("À Propos"))
-
         formatted_summary = self._format_description(profile['summary'])
         summary_para = Paragraph(formatted_summary, self.styles['Summary'])
-        elements.append(KeepTogether([summary_para, Spacer(1, 4*mm)]))
+        elements.extend(self._keep_together(
+            [[summary_para, Spacer(1, 4*mm)]],
+            heading=self._create_section_header("À Propos")
+        ))
 
         return elements
 
+    @timed('build_experience')
     def _build_experience(self):
         """Build experience section"""
         elements = []
@@ -975,16 +1406,19 @@ class CVGenerator:
         else:
             positions = all_positions
 
+        # Blocks kept together when they fit: position header with its
+        # description and first mission, then each following mission
+        blocks = []
         for i, position in enumerate(positions):
             position_elements = []
 
             # Job title
             if position.get('title'):
-                position_elements.append(Paragraph(position['title'], self.styles['JobTitle']))
+                position_elements.append(text_line(position['title'], self.styles['JobTitle']))
 
             # Company
             if position.get('company'):
-                position_elements.append(Paragraph(position['company'], self.styles['Company']))
+                position_elements.append(text_line(position['company'], self.styles['Company']))
 
             # Dates and location
             date_location = []
@@ -994,27 +1428,33 @@ class CVGenerator:
                 date_location.append(position['location'])
 
             if date_location:
-                position_elements.append(Paragraph(' | '.join(date_location), self.styles['DateLocation']))
+                position_elements.append(text_line(' | '.join(date_location), self.styles['DateLocation']))
 
             # Description
-            if position.get('description'):
-                formatted_desc = self._format_description(position['description'])
+            formatted_desc = self._experience_description(position.get('description'))
+            if formatted_desc:
                 position_elements.append(Paragraph(formatted_desc, self.styles['Description']))
 
+            position_blocks = [position_elements]
+
             # Missions (for consultants with nested client missions)
             if position.get('missions'):
-                for mission in position['missions']:
+                for m, mission in enumerate(position['missions']):
+                    if m:
+                        position_elements = []
+                        position_blocks.append(position_elements)
+
                     # Add spacing before mission
                     position_elements.append(Spacer(1, 2*mm))
 
                     # Mission client name (as a sub-header)
                     client_name = mission.get('client', 'Client')
                     mission_header = f"→ Mission chez {client_name}"
-                    position_elements.append(Paragraph(mission_header, self.styles['MissionClient']))
+                    position_elements.append(text_line(mission_header, self.styles['MissionClient']))
 
                     # Mission title (if different from main title)
                     if mission.get('title'):
-                        position_elements.append(Paragraph(mission['title'], self.styles['MissionTitle']))
+                        position_elements.append(text_line(mission['title'], self.styles['MissionTitle']))
 
                     # Mission dates and location
                     mission_date_loc = []
@@ -1024,30 +1464,29 @@ class CVGenerator:
                         mission_date_loc.append(mission['location'])
 
                     if mission_date_loc:
-                        position_elements.append(Paragraph(' | '.join(mission_date_loc), self.styles['DateLocation']))
+                        position_elements.append(text_line(' | '.join(mission_date_loc), self.styles['DateLocation']))
 
                     # Mission description
-                    if mission.get('description'):
-                        formatted_mission_desc = self._format_description(mission['description'])
+                    formatted_mission_desc = self._experience_description(mission.get('description'))
+                    if formatted_mission_desc:
                         position_elements.append(Paragraph(formatted_mission_desc, self.styles['MissionDescription']))
 
             # Add spacing between positions
             if i < len(positions) - 1:
                 position_elements.append(Spacer(1, 4*mm))
 
-            # Keep each position together
-            elements.append(KeepTogether(position_elements))
+            blocks.extend(position_blocks)
+
+        # Keep the section header with the first position
+        elements = self._keep_together(blocks, heading=elements)
 
         elements.append(Spacer(1, 2*mm))
         return elements
 
+    @timed('build_education')
     def _build_education(self):
         """Build education section"""
-        all_elements = []
-        section_content = []
-
-        # Add section header
-        section_content.extend(self._create_section_header("Formation"))
+        section_blocks = []
 
         # Get visible education configuration
         visible_indices = self.config.get('education_visible')
@@ -1070,11 +1509,11 @@ class CVGenerator:
                 degree_text.append(edu['field_of_study'])
 
             if degree_text:
-                edu_elements.append(Paragraph(' - '.join(degree_text), self.styles['JobTitle']))
+                edu_elements.append(text_line(' - '.join(degree_text), self.styles['JobTitle']))
 
             # School
             if edu.get('school'):
-                edu_elements.append(Paragraph(edu['school'], self.styles['Company']))
+                edu_elements.append(text_line(edu['school'], self.styles['Company']))
 
             # Dates
             date_range = []
@@ -1084,97 +1523,73 @@ class CVGenerator:
                 date_range.append(edu['end_date'])
 
             if date_range:
-                edu_elements.append(Paragraph(' - '.join(date_range), self.styles['DateLocation']))
+                edu_elements.append(text_line(' - '.join(date_range), self.styles['DateLocation']))
 
             # Add spacing between education entries
             if i < len(education) - 1:
                 edu_elements.append(Spacer(1, 4*mm))
 
-            # Add each education entry to section content
-            section_content.extend(edu_elements)
+            # Each education entry is a block
+            section_blocks.append(edu_elements)
 
-        section_content.append(Spacer(1, 2*mm))
-
-        # Keep entire education section together
-        if section_content:
-            all_elements.append(KeepTogether(section_content))
+        section_blocks.append([Spacer(1, 2*mm)])
 
-        return all_elements
+        # Keep entire education section together when it fits on a page
+        return self._keep_together(
+            section_blocks,
+            heading=self._create_section_header("Formation"),
+            keep_whole=True
+        )
 
+    @timed('build_skills')
     def _build_skills(self):
         """Build skills section in a grid layout"""
-        all_elements = []
         section_content = []
 
-        # Add section header
-        section_content.extend(self._create_section_header("Compétences"))
-
         skills = self.data.get('skills', [])
 
         # Create a 2-column or 3-column layout based on number of skills
         num_cols = 3 if len(skills) > 10 else 2
 
-        # Group skills into columns
-        skill_rows = []
-        for i in range(0, len(skills), num_cols):
-            row = []
-            for j in range(num_cols):
-                if i + j < len(skills):
-                    row.append(Paragraph(f"- {skills[i + j]}", self.styles['SkillItem']))
-                else:
-                    row.append(Paragraph("", self.styles['SkillItem']))
-            skill_rows.append(row)
-
-        # Create table
-        if skill_rows:
-            skill_table = Table(skill_rows, colWidths=[170*mm/num_cols]*num_cols)
-            skill_table.setStyle(TableStyle([
-                ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-                ('LEFTPADDING', (0, 0), (-1, -1), 0),
-                ('RIGHTPADDING', (0, 0), (-1, -1), 5),
-                ('TOPPADDING', (0, 0), (-1, -1), 1),
-                ('BOTTOMPADDING', (0, 0), (-1, -1), 1),
-            ]))
-            section_content.append(skill_table)
+        # Draw skills in columns without a Paragraph per cell
+        if skills:
+            labels = [f"- {' '.join(str(skill).split())}" for skill in skills]
+            section_content.append(SkillsGrid(labels, self.styles['SkillItem'], num_cols, 170*mm/num_cols))
 
         section_content.append(Spacer(1, 2*mm))
 
-        # Keep entire skills section together
-        if section_content:
-            all_elements.append(KeepTogether(section_content))
-
-        return all_elements
+        # Keep entire skills section together when it fits on a page
+        return self._keep_together(
+            [section_content],
+            heading=self._create_section_header("Compétences"),
+            keep_whole=True
+        )
 
+    @timed('build_languages')
     def _build_languages(self):
         """Build languages section"""
-        all_elements = []
-        section_content = []
-
-        # Add section header
-        section_content.extend(self._create_section_header("Langues"))
+        section_blocks = []
 
         # Build language items
         for lang in self.data.get('languages', []):
-            lang_text = f"<b>{lang.get('name', '')}</b>"
+            lang_text = ''
             if lang.get('proficiency'):
-                lang_text += f" - {lang['proficiency']}"
-            section_content.append(Paragraph(lang_text, self.styles['SkillItem']))
-
-        section_content.append(Spacer(1, 2*mm))
+                lang_text = f" - {lang['proficiency']}"
+            section_blocks.append([text_line(lang_text, self.styles['SkillItem'], bold_prefix=lang.get('name', ''))])
 
-        # Keep entire languages section together
-        if section_content:
-            all_elements.append(KeepTogether(section_content))
+        section_blocks.append([Spacer(1, 2*mm)])
 
-        return all_elements
+        # Keep entire languages section together when it fits on a page
+        return self._keep_together(
+            section_blocks,
+            heading=self._create_section_header("Langues"),
+            keep_whole=True
+        )
 
+    @timed('build_certifications')
     def _build_certifications(self):
         """Build certifications section"""
-        all_elements = []
-        section_content = []
-
-        # Add section header
-        section_content.extend(self._create_section_header("Certifications"))
+        section_blocks = []
 
         # Build all certifications
         for i, cert in enumerate(self.data.get('certifications', [])):
@@ -1182,28 +1597,29 @@ class CVGenerator:
 
             # Certification name
             if cert.get('name'):
-                cert_elements.append(Paragraph(cert['name'], self.styles['JobTitle']))
+                cert_elements.append(text_line(cert['name'], self.styles['JobTitle']))
 
             # Authority
             if cert.get('authority'):
-                cert_elements.append(Paragraph(cert['authority'], self.styles['Company']))
+                cert_elements.append(text_line(cert['authority'], self.styles['Company']))
 
             # Date
             if cert.get('start_date'):
                 date_text = cert['start_date']
                 if cert.get('end_date'):
                     date_text += f" - {cert['end_date']}"
-                cert_elements.append(Paragraph(date_text, self.styles['DateLocation']))
+                cert_elements.append(text_line(date_text, self.styles['DateLocation']))
 
             # Add spacing between certifications
             if i < len(self.data.get('certifications', [])) - 1:
                 cert_elements.append(Spacer(1, 3*mm))
 
-            # Add certification elements to section
-            section_content.extend(cert_elements)
+            # Each certification is a block
+            section_blocks.append(cert_elements)
 
-        # Keep entire certifications section together
-        if section_content:
-            all_elements.append(KeepTogether(section_content))
-
-        return all_elements
+        # Keep entire certifications section together when it fits on a page
+        return self._keep_together(
+            section_blocks,
+            heading=self._create_section_header("Certifications"),
+            keep_whole=True
+        )
@@ -0,0 +1,123 @@
+import heapq
+import itertools
+import threading
+import time
+
+
+def _text_len(value):
+    return len(value) if isinstance(value, str) else 0
+
+
+def _dict_items(value):
+    return [item for item in value if isinstance(item, dict)] if isinstance(value, list) else []
+
+
+def describe_cv_payload(data, config=None):
+    """Summarize the shape of a CV payload without keeping any of its content
+
+    Only counts and sizes are returned so entries can be shown to operators
+    without exposing personal data.
+    """
+    positions = _dict_items(data.get('positions'))
+    missions = [mission for position in positions for mission in _dict_items(position.get('missions'))]
+    profile = data.get('profile') if isinstance(data.get('profile'), dict) else {}
+    config = config if isinstance(config, dict) else {}
+
+    def count(key):
+        value = data.get(key)
+        return len(value) if isinstance(value, list) else 0
+
+    return {
+        'positions': len(positions),
+        'missions': len(missions),
+        'education': count('education'),
+        'skills': count('skills'),
+        'languages': count('languages'),
+        'certifications': count('certifications'),
+        'description_chars': (
+            sum(_text_len(item.get('description')) for item in positions + missions)
+            + _text_len(profile.get('summary'))
+        ),
+        'photo_bytes': _text_len(data.get('photo')) * 3 // 4,
+        'template': config.get('template', 'modern'),
+        'engine': config.get('engine', 'platypus')
+    }
+
+
+def describe_upload(files):
+    """Summarize an upload as file count and total bytes (no file names)"""
+    total_bytes = 0
+    for file in files:
+        file.seek(0, 2)
+        total_bytes += file.tell()
+        file.seek(0)
+    return {'files': len(files), 'upload_bytes': total_bytes}
+
+
+class SlowRequestRecorder:
+    """Bounded in-memory record of the slowest recent requests
+
+    Keeps at most `capacity` entries in a min-heap keyed by duration, so a new
+    request only displaces the fastest recorded one. Entries older than
+    `max_age` seconds are dropped, keeping the recorder focused on recent
+    traffic.
+    """
+
+    def __init__(self, capacity=50, max_age=3600):
+        self.capacity = capacity
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._heap = []
+        self._sequence = itertools.count()
+
+    def _expire(self, now):
+        if self.max_age is None:
+            return
+        cutoff = now - self.max_age
+        if any(entry['timestamp'] < cutoff for _, _, entry in self._heap):
+            self._heap = [item for item in self._heap if item[2]['timestamp'] >= cutoff]
+            heapq.heapify(self._heap)
+
+    def record(self, endpoint, duration, stages, shape, outcome):
+        """Record a finished request if it is among the slowest recent ones
+
+        Returns:
+            bool: True if the request was kept
+        """
+        if self.capacity <= 0:
+            return False
+
+        now = time.time()
+        with self._lock:
+            self._expire(now)
+
+            # Full and faster than the fastest kept entry: nothing to do
+            if len(self._heap) >= self.capacity and duration <= self._heap[0][0]:
+                return False
+
+            entry = {
+                'endpoint': endpoint,
+                'timestamp': now,
+                'duration_ms': round(duration * 1000, 1),
+                'stages_ms': {name: round(seconds * 1000, 1) for name, seconds in stages.items()},
+                'payload': dict(shape or {}),
+                'outcome': outcome
+            }
+            item = (duration, next(self._sequence), entry)
+
+            if len(self._heap) < self.capacity:
+                heapq.heappush(self._heap, item)
+            else:
+                heapq.heapreplace(self._heap, item)
+            return True
+
+    def snapshot(self):
+        """Return recorded entries, slowest first"""
+        with self._lock:
+            self._expire(time.time())
+            items = sorted(self._heap, key=lambda item: item[0], reverse=True)
+        return [dict(entry) for _, _, entry in items]
+
+    def clear(self):
+        with self._lock:
+            self._heap = []
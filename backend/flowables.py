@@ -0,0 +1,205 @@
+import re
+
+from reportlab.lib.enums import TA_CENTER, TA_RIGHT
+from reportlab.lib.fonts import ps2tt, tt2ps
+from reportlab.pdfbase.pdfmetrics import stringWidth
+from reportlab.platypus import Flowable, Paragraph
+
+# Characters that make Paragraph interpret text as markup or entities
+MARKUP_CHARS = ('<', '&')
+
+
+def wrap_words(text, font_name, font_size, width):
+    """Greedy word wrap of plain text measured with stringWidth
+
+    Breaks at spaces like Paragraph does; a single word wider than `width`
+    is kept whole on its own line.
+    """
+    lines = []
+    current = ''
+    for word in text.split():
+        candidate = f"{current} {word}" if current else word
+        if current and stringWidth(candidate, font_name, font_size) > width:
+            lines.append(current)
+            current = word
+        else:
+            current = candidate
+    if current:
+        lines.append(current)
+    return lines
+
+
+class SkillsGrid(Flowable):
+    """Skill labels laid out in columns and drawn directly on the canvas
+
+    Matches the former Table of Paragraph cells (same column widths, cell
+    padding, line breaking and baselines) but only measures strings, so the
+    cost is linear in the number of skills. Splits between rows across pages.
+    """
+
+    # Cell padding of the former skills table, in points
+    LEFT_PADDING = 0
+    RIGHT_PADDING = 5
+    TOP_PADDING = 1
+    BOTTOM_PADDING = 1
+
+    def __init__(self, labels, style, num_cols, col_width, rows=None):
+        super().__init__()
+        self.style = style
+        self.num_cols = num_cols
+        self.col_width = col_width
+        # Former table was centered in the frame
+        self.hAlign = 'CENTER'
+        self.rows = rows if rows is not None else self._layout_rows(labels)
+
+    def _layout_rows(self, labels):
+        """Group labels into rows of wrapped cells: [(height, [lines, ...]), ...]"""
+        style = self.style
+        text_width = self.col_width - self.LEFT_PADDING - self.RIGHT_PADDING
+        rows = []
+        for i in range(0, len(labels), self.num_cols):
+            cells = [wrap_words(label, style.fontName, style.fontSize, text_width)
+                     for label in labels[i:i + self.num_cols]]
+            lines = max((len(cell) for cell in cells), default=0)
+            rows.append((lines * style.leading + self.TOP_PADDING + self.BOTTOM_PADDING, cells))
+        return rows
+
+    def wrap(self, availWidth, availHeight):
+        self.width = self.num_cols * self.col_width
+        self.height = sum(height for height, _ in self.rows)
+        return self.width, self.height
+
+    def split(self, availWidth, availHeight):
+        used = 0
+        for count, (height, _) in enumerate(self.rows):
+            if used + height > availHeight:
+                break
+            used += height
+        else:
+            return [self]
+
+        if count == 0:
+            return []
+        return [
+            SkillsGrid(None, self.style, self.num_cols, self.col_width, rows=self.rows[:count]),
+            SkillsGrid(None, self.style, self.num_cols, self.col_width, rows=self.rows[count:])
+        ]
+
+    def draw(self):
+        style = self.style
+        canv = self.canv
+        canv.setFont(style.fontName, style.fontSize)
+        canv.setFillColor(style.textColor)
+
+        top = self.height
+        for height, cells in self.rows:
+            # First baseline sits one font size below the cell's top padding, as in Paragraph
+            baseline = top - self.TOP_PADDING - style.fontSize
+            for col, lines in enumerate(cells):
+                x = col * self.col_width + self.LEFT_PADDING
+                for line_number, line in enumerate(lines):
+                    canv.drawString(x, baseline - line_number * style.leading, line)
+            top -= height
+
+
+def bold_font(font_name):
+    """Bold variant of a registered font family, as Paragraph resolves <b>"""
+    family, _, italic = ps2tt(font_name)
+    return tt2ps(family, 1, italic)
+
+
+def text_line(text, style, bold_prefix=''):
+    """Flowable for a short label: PlainLine for plain text, Paragraph for markup
+
+    `bold_prefix` is drawn in bold before `text`, like '<b>prefix</b>text'.
+    """
+    if any(char in text or char in bold_prefix for char in MARKUP_CHARS) \
+            or style.backColor or style.borderWidth or style.textTransform:
+        markup = f"<b>{bold_prefix}</b>{text}" if bold_prefix else text
+        return Paragraph(markup, style)
+    return PlainLine(text, style, bold_prefix)
+
+
+class PlainLine(Flowable):
+    """Single line of plain text drawn directly on the canvas
+
+    Skips Paragraph's markup parsing and line breaking for short labels. Text
+    and placement match a one-line Paragraph with the same style; when the
+    text does not fit the available width, wrapping is delegated to a
+    Paragraph.
+    """
+
+    def __init__(self, text, style, bold_prefix=''):
+        super().__init__()
+        # Paragraph collapses runs of whitespace and strips both ends of the line
+        text = re.sub(r'\s+', ' ', text).rstrip()
+        bold_prefix = re.sub(r'\s+', ' ', bold_prefix).lstrip()
+        self.text = text if bold_prefix else text.lstrip()
+        self.bold_prefix = bold_prefix
+        self.style = style
+        self._paragraph = None
+
+    def _text_width(self):
+        style = self.style
+        width = stringWidth(self.text, style.fontName, style.fontSize)
+        if self.bold_prefix:
+            width += stringWidth(self.bold_prefix, bold_font(style.fontName), style.fontSize)
+        return width
+
+    def _fallback(self):
+        if self._paragraph is None:
+            markup = f"<b>{self.bold_prefix}</b>{self.text}" if self.bold_prefix else self.text
+            self._paragraph = Paragraph(markup, self.style)
+        return self._paragraph
+
+    def wrap(self, availWidth, availHeight):
+        style = self.style
+        self._line_width = self._text_width()
+        indent = style.leftIndent + style.firstLineIndent + style.rightIndent
+        if self._paragraph is not None or self._line_width > availWidth - indent:
+            self.width, self.height = self._fallback().wrap(availWidth, availHeight)
+        else:
+            self.width, self.height = availWidth, style.leading
+        return self.width, self.height
+
+    def split(self, availWidth, availHeight):
+        if self._paragraph is not None:
+            return self._paragraph.split(availWidth, availHeight)
+        return []
+
+    def getSpaceBefore(self):
+        return self.style.spaceBefore
+
+    def getSpaceAfter(self):
+        return self.style.spaceAfter
+
+    def drawOn(self, canvas, x, y, _sW=0):
+        if self._paragraph is not None:
+            self._paragraph.drawOn(canvas, x, y, _sW)
+        else:
+            super().drawOn(canvas, x, y, _sW)
+
+    def draw(self):
+        style = self.style
+        canv = self.canv
+        canv.setFillColor(style.textColor)
+
+        # Same first baseline as a one-line Paragraph
+        y = self.height - style.fontSize
+        left = style.leftIndent + style.firstLineIndent
+        right = self.width - style.rightIndent
+        if style.alignment == TA_CENTER:
+            x = left + (right - left - self._line_width) / 2
+        elif style.alignment == TA_RIGHT:
+            x = right - self._line_width
+        else:
+            x = left
+
+        if self.bold_prefix:
+            font = bold_font(style.fontName)
+            canv.setFont(font, style.fontSize)
+            canv.drawString(x, y, self.bold_prefix)
+            x += stringWidth(self.bold_prefix, font, style.fontSize)
+
+        canv.setFont(style.fontName, style.fontSize)
+        canv.drawString(x, y, self.text)
@@ -0,0 +1,149 @@
+import json
+import logging
+import os
+import threading
+
+import reportlab
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+
+logger = logging.getLogger(__name__)
+
+# Face keys of a family, as reportlab.lib.fonts maps <b> and <i>
+FACES = ('normal', 'bold', 'italic', 'boldItalic')
+
+# Built-in PDF fonts need no registration but only draw WinAnsi characters
+STANDARD_FAMILIES = {
+    'Helvetica': {
+        'normal': 'Helvetica',
+        'bold': 'Helvetica-Bold',
+        'italic': 'Helvetica-Oblique',
+        'boldItalic': 'Helvetica-BoldOblique',
+    },
+}
+
+# Bitstream Vera ships with ReportLab, so one TTF family is always available
+_REPORTLAB_FONTS = os.path.join(os.path.dirname(reportlab.__file__), 'fonts')
+BUNDLED_FAMILIES = {
+    'Vera': {
+        'normal': os.path.join(_REPORTLAB_FONTS, 'Vera.ttf'),
+        'bold': os.path.join(_REPORTLAB_FONTS, 'VeraBd.ttf'),
+        'italic': os.path.join(_REPORTLAB_FONTS, 'VeraIt.ttf'),
+        'boldItalic': os.path.join(_REPORTLAB_FONTS, 'VeraBI.ttf'),
+    },
+}
+
+DEFAULT_FAMILY = os.getenv('CV_FONT_FAMILY', 'Helvetica')
+
+
+def _winansi_coverage():
+    """Code points the standard fonts can draw (WinAnsiEncoding)"""
+    return frozenset(map(ord, bytes(range(32, 256)).decode('cp1252', errors='ignore')))
+
+
+class FontFamily:
+    """A registered font family
+
+    `faces` maps each face key (normal, bold, italic, boldItalic) to the
+    registered font name; `coverage` is the frozenset of code points every
+    face has a glyph for.
+    """
+
+    def __init__(self, name, faces, coverage):
+        self.name = name
+        self.faces = faces
+        self.coverage = coverage
+
+    def can_draw(self, text):
+        """Whether every character of `text` has a glyph in all faces"""
+        coverage = self.coverage
+        return all(ord(char) in coverage for char in text)
+
+
+class FontRegistry:
+    """Process-wide font families, registered with ReportLab on first use
+
+    TTF files are parsed and registered once per process, however many
+    renders use them. ReportLab embeds TTF fonts as subsets, so PDFs only
+    carry the glyphs they actually draw.
+    """
+
+    def __init__(self):
+        self._sources = {}
+        self._families = {}
+        self._lock = threading.Lock()
+        for name, faces in STANDARD_FAMILIES.items():
+            self._families[name] = FontFamily(name, dict(faces), _winansi_coverage())
+
+    def add(self, name, normal, bold=None, italic=None, bold_italic=None):
+        """Declare a TTF family; missing faces fall back to the regular one"""
+        with self._lock:
+            if name in self._families:
+                raise ValueError(f"Font family {name!r} is already registered")
+            self._sources[name] = {
+                'normal': normal,
+                'bold': bold or normal,
+                'italic': italic or normal,
+                'boldItalic': bold_italic or bold or italic or normal,
+            }
+
+    def names(self):
+        """Names of all declared families"""
+        return sorted(set(self._families) | set(self._sources))
+
+    def get(self, name):
+        """FontFamily for a name, registering its TTF files on first use; None if unknown"""
+        family = self._families.get(name)
+        if family is not None:
+            return family
+
+        with self._lock:
+            if name not in self._families:
+                if name not in self._sources:
+                    return None
+                self._families[name] = self._register(name, self._sources[name])
+            return self._families[name]
+
+    def _register(self, name, paths):
+        faces = {}
+        coverage = None
+        fonts = {}
+        for face in FACES:
+            path = paths[face]
+            # Faces sharing a file are loaded and registered once
+            if path not in fonts:
+                font_name = name if face == 'normal' else f"{name}-{face[0].upper()}{face[1:]}"
+                font = TTFont(font_name, path)
+                pdfmetrics.registerFont(font)
+                fonts[path] = font
+                face_coverage = frozenset(font.face.charToGlyph)
+                coverage = face_coverage if coverage is None else coverage & face_coverage
+            faces[face] = fonts[path].fontName
+
+        pdfmetrics.registerFontFamily(name, **faces)
+        logger.info(f"Registered font family {name} ({len(fonts)} files, {len(coverage)} characters)")
+        return FontFamily(name, faces, coverage)
+
+
+def _load_configured_families(registry):
+    """Families from CV_FONT_FAMILIES: {"Name": {"normal": path, "bold": path, ...}}"""
+    configured = os.getenv('CV_FONT_FAMILIES', '')
+    if not configured:
+        return
+    try:
+        families = json.loads(configured)
+        for name, paths in families.items():
+            registry.add(name, paths['normal'], paths.get('bold'), paths.get('italic'), paths.get('boldItalic'))
+    except (ValueError, KeyError, AttributeError) as e:
+        logger.error(f"Ignoring invalid CV_FONT_FAMILIES: {e}")
+
+
+registry = FontRegistry()
+for _name, _paths in BUNDLED_FAMILIES.items():
+    registry.add(_name, _paths['normal'], _paths['bold'], _paths['italic'], _paths['boldItalic'])
+_load_configured_families(registry)
+
+
+def get_family(name=None):
+    """Font family for a name, or the default family (CV_FONT_FAMILY) for unknown names"""
+    return registry.get(name or DEFAULT_FAMILY) or registry.get(DEFAULT_FAMILY) or registry.get('Helvetica')
@@ -0,0 +1,62 @@
+import gzip
+import zlib
+
+# Content codings offered for JSON responses, in order of preference
+ENCODINGS = ('gzip', 'deflate')
+
+
+def omit_empty(value):
+    """Copy of a JSON value without empty strings, None, empty lists and empty objects
+
+    Empty values are dropped from objects, and from lists only once their
+    own content turned out empty; 0 and False are kept.
+    """
+    if isinstance(value, dict):
+        compact = {}
+        for key, item in value.items():
+            item = omit_empty(item)
+            if item not in ('', None, [], {}):
+                compact[key] = item
+        return compact
+    if isinstance(value, list):
+        return [item for item in map(omit_empty, value) if item not in ('', None, [], {})]
+    return value
+
+
+def negotiate_encoding(accept_encodings):
+    """Best content coding we offer for a request's Accept-Encoding, or None for identity"""
+    return accept_encodings.best_match(ENCODINGS)
+
+
+def compress(body, encoding, level=6):
+    """Encode a response body with gzip or deflate (zlib stream, as HTTP 'deflate' means)"""
+    if encoding == 'gzip':
+        # mtime=0 keeps identical bodies byte-identical
+        return gzip.compress(body, compresslevel=level, mtime=0)
+    if encoding == 'deflate':
+        return zlib.compress(body, level)
+    raise ValueError(f"Unsupported content coding: {encoding}")
+
+
+def compress_response(response, accept_encodings, min_size=1024, level=6):
+    """Content-encode a JSON response in place when the client accepts it
+
+    Streamed responses, responses already encoded and bodies under
+    `min_size` bytes are left alone.
+    """
+    if (response.mimetype != 'application/json' or response.direct_passthrough
+            or 'Content-Encoding' in response.headers):
+        return response
+
+    response.vary.add('Accept-Encoding')
+    body = response.get_data()
+    if len(body) < min_size:
+        return response
+
+    encoding = negotiate_encoding(accept_encodings)
+    if encoding is None:
+        return response
+
+    response.set_data(compress(body, encoding, level))
+    response.headers['Content-Encoding'] = encoding
+    return response
@@ -0,0 +1,368 @@
+"""
+HTTP load generator for the CV Generator API.
+
+Replays a weighted mix of parse, preview and final-render requests against a
+running server (--url) or a server started on a free local port (default),
+either at a fixed concurrency (closed loop) or at a fixed arrival rate (open
+loop), then reports throughput, latency percentiles and error rates per
+scenario.
+
+The local server runs in a separate process so the client threads do not
+compete with it for the GIL. --in-process serves the app from a thread of the
+load generator instead; the report then carries a warning, as its latencies
+and throughput include that contention.
+
+Every preview and render request carries a request number in the profile
+summary, so each one is a distinct CV: identical payloads would be coalesced
+and deduplicated by the server and measure waits rather than render capacity.
+
+Usage (from backend/):
+    python loadtest.py --concurrency 8 --duration 30
+    python loadtest.py --rate 5 --duration 60 --mix parse=1,preview=4,render=1
+    python loadtest.py --url http://127.0.0.1:5000 --requests 200 --json report.json
+"""
+
+import argparse
+import glob
+import itertools
+import json
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_EXPORT_DIR = os.path.join(BACKEND_DIR, '..', 'mock')
+DEFAULT_MIX = 'parse=1,preview=4,render=1'
+
+# Run by start_server_process(): serve the app on a free port and print the port
+SERVER_SCRIPT = (
+    "import logging; from werkzeug.serving import make_server; from app import app; "
+    "logging.getLogger('werkzeug').setLevel(logging.WARNING); "
+    "server = make_server('127.0.0.1', 0, app, threaded=True); "
+    "print(server.server_port, flush=True); server.serve_forever()"
+)
+
+IN_PROCESS_WARNING = ("Server ran in the load generator's process: it shared the GIL with the "
+                      "client threads, so latencies are overstated and throughput understated")
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return None
+    rank = max(1, int(round(pct / 100 * len(sorted_values))))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def encode_multipart(files):
+    """Encode (field, filename, bytes) tuples as multipart/form-data"""
+    boundary = uuid.uuid4().hex
+    body = BytesIO()
+    for field, filename, content in files:
+        body.write(f'--{boundary}\r\n'.encode())
+        body.write(f'Content-Disposition: form-data; name="{field}"; filename="{filename}"\r\n'.encode())
+        body.write(b'Content-Type: text/csv\r\n\r\n')
+        body.write(content)
+        body.write(b'\r\n')
+    body.write(f'--{boundary}--\r\n'.encode())
+    return body.getvalue(), f'multipart/form-data; boundary={boundary}'
+
+
+def unique_bodies(payload):
+    """Body factory: number -> the JSON payload with that number in the profile summary
+
+    The payload (photo included) is serialized once; only the number changes.
+    """
+    marker = uuid.uuid4().hex
+    profile = dict(payload.get('profile') or {})
+    profile['summary'] = f"{profile.get('summary') or ''} #{marker}".strip()
+    prefix, suffix = json.dumps(dict(payload, profile=profile)).encode().split(marker.encode())
+    return lambda number: prefix + str(number).encode() + suffix
+
+
+def build_scenarios(export_dir, payload_path=None):
+    """Prepare request bodies for each scenario
+
+    Returns:
+        dict: scenario -> (path, body bytes or body factory (see unique_bodies), content type)
+    """
+    csv_files = []
+    for path in sorted(glob.glob(os.path.join(export_dir, '*.csv'))):
+        with open(path, 'rb') as f:
+            csv_files.append(('files', os.path.basename(path), f.read()))
+    if not csv_files:
+        raise ValueError(f"No CSV files found in {export_dir}")
+    parse_body, parse_type = encode_multipart(csv_files)
+
+    from warmup import SAMPLE_CV, _sample_photo
+
+    if payload_path:
+        with open(payload_path, 'r', encoding='utf-8') as f:
+            payload = json.load(f)
+    else:
+        payload = dict(SAMPLE_CV)
+
+    preview = {key: value for key, value in payload.items() if key != 'photo'}
+    render = dict(payload, photo=payload.get('photo') or _sample_photo())
+
+    return {
+        'parse': ('/api/parse-linkedin', parse_body, parse_type),
+        'preview': ('/api/generate-pdf', unique_bodies(preview), 'application/json'),
+        'render': ('/api/generate-pdf', unique_bodies(render), 'application/json')
+    }
+
+
+def parse_mix(mix):
+    """Parse 'parse=1,preview=4' into {'parse': 1.0, 'preview': 4.0}"""
+    weights = {}
+    for item in mix.split(','):
+        name, _, weight = item.partition('=')
+        weights[name.strip()] = float(weight or 1)
+    return {name: weight for name, weight in weights.items() if weight > 0}
+
+
+class LoadTest:
+    """Send requests and collect per-scenario latencies and errors"""
+
+    def __init__(self, base_url, scenarios, mix, timeout=60, seed=0):
+        unknown = set(mix) - set(scenarios)
+        if unknown:
+            raise ValueError(f"Unknown scenario(s): {', '.join(sorted(unknown))}")
+
+        self.base_url = base_url.rstrip('/')
+        self.scenarios = scenarios
+        self.names = list(mix)
+        self.weights = [mix[name] for name in self.names]
+        self.timeout = timeout
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._request_numbers = itertools.count()
+        self.samples = {name: [] for name in self.names}
+        self.errors = {name: {} for name in self.names}
+
+    def pick(self):
+        with self._lock:
+            return self._rng.choices(self.names, self.weights)[0]
+
+    def send(self, name):
+        path, body, content_type = self.scenarios[name]
+        if callable(body):
+            with self._lock:
+                number = next(self._request_numbers)
+            body = body(number)
+        req = urllib.request.Request(
+            self.base_url + path,
+            data=body,
+            headers={'Content-Type': content_type},
+            method='POST'
+        )
+
+        start = time.perf_counter()
+        error = None
+        try:
+            with urllib.request.urlopen(req, timeout=self.timeout) as response:
+                response.read()
+        except urllib.error.HTTPError as e:
+            e.read()
+            error = str(e.code)
+        except Exception as e:
+            error = type(e).__name__
+        elapsed = time.perf_counter() - start
+
+        with self._lock:
+            self.samples[name].append(elapsed)
+            if error:
+                self.errors[name][error] = self.errors[name].get(error, 0) + 1
+
+    def run_closed_loop(self, concurrency, duration=None, requests=None):
+        """Each worker sends its next request as soon as the previous one completes"""
+        deadline = time.perf_counter() + duration if duration else None
+        remaining = [requests] if requests else None
+
+        def take():
+            if remaining is None:
+                return True
+            with self._lock:
+                if remaining[0] <= 0:
+                    return False
+                remaining[0] -= 1
+                return True
+
+        def worker():
+            while (deadline is None or time.perf_counter() < deadline) and take():
+                self.send(self.pick())
+
+        threads = [threading.Thread(target=worker, daemon=True) for _ in range(concurrency)]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return time.perf_counter() - start
+
+    def run_open_loop(self, rate, duration=None, requests=None, max_concurrency=256):
+        """Start requests at a fixed mean arrival rate (Poisson), whatever the latency"""
+        total = requests or int(rate * duration)
+        start = time.perf_counter()
+        next_at = start
+
+        with ThreadPoolExecutor(max_workers=max_concurrency) as pool:
+            for _ in range(total):
+                delay = next_at - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                pool.submit(self.send, self.pick())
+                next_at += self._rng.expovariate(rate)
+
+        return time.perf_counter() - start
+
+    def report(self, elapsed):
+        """Summarize throughput, latency percentiles (ms) and error rate per scenario"""
+        scenarios = {}
+        for name in self.names:
+            latencies = sorted(self.samples[name])
+            count = len(latencies)
+            errors = sum(self.errors[name].values())
+            scenarios[name] = {
+                'endpoint': self.scenarios[name][0],
+                'requests': count,
+                'errors': errors,
+                'error_rate': round(errors / count, 4) if count else 0,
+                'errors_by_type': self.errors[name],
+                'throughput_rps': round(count / elapsed, 2) if elapsed else 0,
+                'p50_ms': _ms(percentile(latencies, 50)),
+                'p95_ms': _ms(percentile(latencies, 95)),
+                'p99_ms': _ms(percentile(latencies, 99)),
+                'max_ms': _ms(latencies[-1] if latencies else None)
+            }
+
+        total = sum(s['requests'] for s in scenarios.values())
+        return {
+            'elapsed_seconds': round(elapsed, 3),
+            'requests': total,
+            'throughput_rps': round(total / elapsed, 2) if elapsed else 0,
+            'scenarios': scenarios
+        }
+
+
+def _ms(seconds):
+    return round(seconds * 1000, 1) if seconds is not None else None
+
+
+def start_server_process():
+    """Serve the app from a new Python process on a free port
+
+    Returns:
+        tuple: (base URL, subprocess.Popen); stop it with stop_server_process()
+    """
+    process = subprocess.Popen([sys.executable, '-c', SERVER_SCRIPT], cwd=BACKEND_DIR,
+                               stdout=subprocess.PIPE, text=True)
+    port = process.stdout.readline().strip()
+    if not port.isdigit():
+        stop_server_process(process)
+        raise RuntimeError(f"Local server failed to start (exit code {process.returncode})")
+    return f'http://127.0.0.1:{port}', process
+
+
+def stop_server_process(process, timeout=10):
+    process.terminate()
+    try:
+        process.wait(timeout)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+    process.stdout.close()
+
+
+def start_local_server():
+    """Serve the app in a background thread of this process on a free port and return its base URL"""
+    from werkzeug.serving import make_server
+    from app import app
+
+    server = make_server('127.0.0.1', 0, app, threaded=True)
+    thread = threading.Thread(target=server.serve_forever, name='loadtest-server', daemon=True)
+    thread.start()
+    return f'http://127.0.0.1:{server.server_port}', server
+
+
+def print_report(report):
+    print(f"\n{report['requests']} requests in {report['elapsed_seconds']}s "
+          f"({report['throughput_rps']} req/s)\n")
+    print(f"{'scenario':<10}{'endpoint':<22}{'reqs':>7}{'rps':>8}{'err%':>7}{'p50':>9}{'p95':>9}{'p99':>9}")
+    for name, s in report['scenarios'].items():
+        print(f"{name:<10}{s['endpoint']:<22}{s['requests']:>7}{s['throughput_rps']:>8}"
+              f"{s['error_rate'] * 100:>6.1f}%"
+              f"{_fmt(s['p50_ms']):>9}{_fmt(s['p95_ms']):>9}{_fmt(s['p99_ms']):>9}")
+    for warning in report.get('warnings', ()):
+        print(f"\nWARNING: {warning}")
+
+
+def _fmt(ms):
+    return '-' if ms is None else f"{ms:.0f}ms"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--url', help='Target base URL (default: start the app in a local server process)')
+    parser.add_argument('--in-process', action='store_true',
+                        help='Serve the app from a thread of this process (shares the GIL with the clients)')
+    parser.add_argument('--mix', default=DEFAULT_MIX, help=f'Scenario weights (default: {DEFAULT_MIX})')
+    parser.add_argument('--concurrency', type=int, default=4, help='Closed-loop workers')
+    parser.add_argument('--rate', type=float, help='Open-loop arrival rate in requests/second')
+    parser.add_argument('--duration', type=float, help='Test duration in seconds')
+    parser.add_argument('--requests', type=int, help='Total number of requests')
+    parser.add_argument('--export-dir', default=DEFAULT_EXPORT_DIR, help='LinkedIn CSV export used for parse requests')
+    parser.add_argument('--payload', help='JSON CV payload used for preview/render requests')
+    parser.add_argument('--timeout', type=float, default=60, help='Per-request timeout in seconds')
+    parser.add_argument('--json', dest='json_path', help='Also write the report as JSON')
+    args = parser.parse_args(argv)
+
+    if not args.duration and not args.requests:
+        args.duration = 10
+
+    server = process = None
+    base_url = args.url
+    if not base_url and args.in_process:
+        base_url, server = start_local_server()
+        print(f"Started in-process server on {base_url}")
+    elif not base_url:
+        base_url, process = start_server_process()
+        print(f"Started local server process on {base_url}")
+
+    try:
+        test = LoadTest(base_url, build_scenarios(args.export_dir, args.payload), parse_mix(args.mix),
+                        timeout=args.timeout)
+        if args.rate:
+            print(f"Open loop: {args.rate} req/s")
+            elapsed = test.run_open_loop(args.rate, args.duration, args.requests)
+        else:
+            print(f"Closed loop: {args.concurrency} concurrent workers")
+            elapsed = test.run_closed_loop(args.concurrency, args.duration, args.requests)
+    finally:
+        if server is not None:
+            server.shutdown()
+        if process is not None:
+            stop_server_process(process)
+
+    report = test.report(elapsed)
+    if server is not None:
+        report['warnings'] = [IN_PROCESS_WARNING]
+    print_report(report)
+
+    if args.json_path:
+        with open(args.json_path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,96 @@
+import logging
+import os
+import tracemalloc
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+logger = logging.getLogger(__name__)
+
+MEMORY_MODES = ('rss', 'tracemalloc')
+
+# (guard, baseline bytes) of the render running in the current context
+_active_budget = ContextVar('memory_budget', default=None)
+
+
+class MemoryBudgetExceeded(Exception):
+    """Raised when a render grows past its memory budget"""
+
+    def __init__(self, used, limit):
+        super().__init__(
+            f"Render exceeded its memory budget ({used // (1024 * 1024)}MB used, "
+            f"limit {limit // (1024 * 1024)}MB)"
+        )
+        self.used = used
+        self.limit = limit
+
+
+def _rss_bytes():
+    """Current resident set size, or None where /proc is not available"""
+    try:
+        with open('/proc/self/statm', 'rb') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class MemoryGuard:
+    """Abort renders whose memory growth exceeds `limit_bytes`
+
+    Growth is measured from the start of `watch()` either as process RSS
+    (`rss`, cheap, Linux only) or as memory traced by tracemalloc
+    (`tracemalloc`, portable but slows allocations while tracing is on).
+    Both are process-wide figures, so concurrent renders in the same worker
+    count against each other: the budget bounds the worker, not one request.
+    A limit of 0 disables the guard.
+    """
+
+    def __init__(self, limit_bytes=0, mode='rss'):
+        if mode not in MEMORY_MODES:
+            raise ValueError(f"Unknown memory guard mode: {mode}")
+        self.limit_bytes = limit_bytes
+        self.mode = mode
+
+    @property
+    def enabled(self):
+        return self.limit_bytes > 0
+
+    def current(self):
+        """Memory currently used according to the configured mode"""
+        if self.mode == 'tracemalloc':
+            if not tracemalloc.is_tracing():
+                # Started once and left running: stopping it would discard
+                # the baseline of renders still in progress
+                logger.info("Starting tracemalloc for the render memory guard")
+                tracemalloc.start()
+            return tracemalloc.get_traced_memory()[0]
+        return _rss_bytes()
+
+    @contextmanager
+    def watch(self):
+        """Enforce the budget on check_memory_budget() calls in the enclosed block"""
+        baseline = self.current() if self.enabled else None
+        if baseline is None:
+            yield
+            return
+
+        token = _active_budget.set((self, baseline))
+        try:
+            yield
+        finally:
+            _active_budget.reset(token)
+
+    def check(self, baseline):
+        current = self.current()
+        if current is not None and current - baseline > self.limit_bytes:
+            raise MemoryBudgetExceeded(current - baseline, self.limit_bytes)
+
+
+def check_memory_budget():
+    """Raise MemoryBudgetExceeded if the render being watched is over budget
+
+    A no-op outside MemoryGuard.watch(), so renderers can call it freely.
+    """
+    active = _active_budget.get()
+    if active is not None:
+        guard, baseline = active
+        guard.check(baseline)
@@ -0,0 +1,304 @@
+import os
+import threading
+from collections import OrderedDict
+
+from reportlab.platypus import KeepTogether
+from reportlab.platypus.doctemplate import ActionFlowable
+
+from metrics import REGISTRY, stage
+
+# Same tolerance as ReportLab's Frame when checking that a flowable fits
+FUZZ = 1e-6
+
+# Config keys that do not change the layout, left out of section cache keys
+# (fit_pages candidates carry their layout_scale and description_limit instead)
+LAYOUT_NEUTRAL_KEYS = frozenset(['deterministic', 'creation_date', 'engine', 'colors', 'fit_pages'])
+
+# Data read by each section builder (sections not listed read the key of their own name)
+SECTION_DATA = {
+    'header': ('profile', 'photo'),
+    'summary': ('profile',),
+    'experience': ('positions',)
+}
+
+# Auto-fit steps (config.fit_pages), from the original layout to the most
+# compact one: the typography shrinks first, then experience descriptions
+# are cut shorter (characters), then left out
+FIT_SCALES = (1.0, 0.95, 0.9, 0.85)
+FIT_DESCRIPTION_LIMITS = (600, 400, 250, 150, 0)
+FIT_STEPS = (tuple((scale, None) for scale in FIT_SCALES) +
+             tuple((FIT_SCALES[-1], limit) for limit in FIT_DESCRIPTION_LIMITS))
+
+SECTION_CACHE_SIZE = int(os.getenv('CV_ESTIMATE_CACHE_SIZE', '256'))
+MEASURE_CACHE_SIZE = int(os.getenv('CV_MEASURE_CACHE_SIZE', '4096'))
+
+LAYOUT_CACHE = REGISTRY.counter(
+    'cv_layout_cache_total',
+    'Layout cache lookups, by cache (section, measure) and result (hit, miss)',
+    ('cache', 'result')
+)
+
+
+class LayoutCache:
+    """Thread-safe LRU cache of layout work, counted on /api/metrics
+
+    Measuring is what makes a layout expensive (Paragraph line breaking), and
+    an edit in the editor usually changes one section, one entry: the rest is
+    reused from here.
+    """
+
+    def __init__(self, name, max_entries):
+        self.name = name
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+
+    def get(self, key, build):
+        """Cached value for key, else build() (then cached)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+        if entry is not None:
+            LAYOUT_CACHE.inc(self.name, 'hit')
+            return entry
+
+        LAYOUT_CACHE.inc(self.name, 'miss')
+        entry = build()
+        if self.max_entries > 0:
+            with self._lock:
+                self._entries[key] = entry
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return entry
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+# Built and measured sections, keyed by their data and layout config
+_section_cache = LayoutCache('section', SECTION_CACHE_SIZE)
+
+# Paragraph measurements, keyed by text, style and width (see CVGenerator._measure)
+_measure_cache = LayoutCache('measure', MEASURE_CACHE_SIZE)
+
+# Split flowables wrap again, which mutates them: cached flowables are shared between requests
+_split_lock = threading.Lock()
+
+
+def get_section_cache():
+    return _section_cache
+
+
+def get_measure_cache():
+    return _measure_cache
+
+
+def section_key(generator, name):
+    """Cache key of a section: its name, the data its builder reads and the layout config"""
+    from cv_generator import payload_digest
+
+    data = {key: generator.data.get(key) for key in SECTION_DATA.get(name, (name,))}
+    config = {key: value for key, value in generator.config.items() if key not in LAYOUT_NEUTRAL_KEYS}
+    return f"{name}:{payload_digest(data, config)}"
+
+
+def measure_elements(generator, elements, width):
+    """(flowable, (width, height, space before, space after)) for story elements
+
+    Measurements taken while the story was built are reused.
+    """
+    measured = []
+    for flowable in elements:
+        if hasattr(flowable, '_measured'):
+            # MeasuredKeepTogether: height of the whole block
+            block_width, height, _, _ = flowable._measured
+            dims = (block_width, height, flowable.getSpaceBefore(), flowable.getSpaceAfter())
+        else:
+            cached = getattr(flowable, '_measured_at', None)
+            dims = cached[1] if cached and cached[0] == width else generator._measure(flowable, width)
+        measured.append((flowable, dims))
+    return measured
+
+
+class Paginator:
+    """Place measured flowables into pages the way SimpleDocTemplate's frame would
+
+    Flowables that fit are only subtracted from the remaining height; only
+    those crossing a page boundary are split (split() re-wraps just them).
+    Nothing is drawn.
+    """
+
+    def __init__(self, generator, frame_width, frame_height):
+        self.generator = generator
+        self.frame_width = frame_width
+        self.frame_height = frame_height
+        self.pages = 1
+        self.remaining = frame_height
+        self.at_top = True
+        self.space_after = 0
+
+    def new_page(self):
+        self.pages += 1
+        self.remaining = self.frame_height
+        self.at_top = True
+        self.space_after = 0
+
+    def place(self, space, height, space_after):
+        self.remaining -= space + height + space_after
+        self.space_after = space_after
+        self.at_top = False
+
+    def add(self, flowable, dims=None):
+        """Place a flowable (and its split parts); returns the page it starts on"""
+        start_page = None
+        pending = [(flowable, dims)]
+        while pending:
+            flowable, dims = pending.pop()
+            if isinstance(flowable, ActionFlowable):
+                # PageBreak and friends
+                if not self.at_top:
+                    self.new_page()
+                continue
+
+            if dims is None:
+                dims = self.generator._measure(flowable, self.frame_width)
+            _, height, space_before, space_after = dims
+            space = 0 if self.at_top else max(space_before - self.space_after, 0)
+            available = self.remaining - space
+
+            if height <= available + FUZZ:
+                start_page = start_page or self.pages
+                self.place(space, height, space_after)
+                continue
+
+            if isinstance(flowable, KeepTogether):
+                # A block that fits on a page starts a new one; a taller one flows
+                if not self.at_top and height <= self.frame_height + FUZZ:
+                    self.new_page()
+                    pending.append((flowable, dims))
+                else:
+                    pending.extend((content, None) for content in reversed(flowable._content))
+                continue
+
+            parts = []
+            if available > 0:
+                with _split_lock:
+                    parts = flowable.splitOn(None, self.frame_width, available)
+            if parts:
+                # The first part is placed on this page, the rest continue on the next
+                first_dims = self.generator._measure(parts[0], self.frame_width)
+                start_page = start_page or self.pages
+                self.place(space, first_dims[1], first_dims[3])
+                pending.extend((part, None) for part in reversed(parts[1:]))
+            elif self.at_top:
+                # Taller than a page and unsplittable: it takes the page
+                start_page = start_page or self.pages
+                self.place(space, height, space_after)
+            else:
+                self.new_page()
+                pending.append((flowable, dims))
+        return start_page
+
+
+def estimate_layout(generator):
+    """Estimated page count and per-section heights of a CV, without rendering
+
+    The story is built section by section (sections whose data and config
+    were seen before come from the cache) and paginated from the heights
+    measured at the frame width. Follows the platypus layout used by the
+    default render engine.
+
+    Returns:
+        dict: pages, frame height, height used on the last page and, per
+            section, its height and first/last page (heights in points)
+    """
+    frame_width, frame_height = generator._frame_size()
+    sections = [('header', generator._build_header)] + generator._enabled_sections()
+    paginator = Paginator(generator, frame_width, frame_height)
+    result = []
+
+    with stage('estimate'):
+        for name, builder in sections:
+            def build(builder=builder):
+                measured = measure_elements(generator, builder(), frame_width)
+                return measured, generator._stacked_height(measured)
+
+            measured, height = _section_cache.get(section_key(generator, name), build)
+            pages = [paginator.add(flowable, dims) for flowable, dims in measured]
+            result.append({
+                'name': name,
+                'height': round(height, 1),
+                'first_page': pages[0] if pages else paginator.pages,
+                'last_page': paginator.pages
+            })
+
+    return {
+        'pages': paginator.pages,
+        'frame_height': round(frame_height, 1),
+        'last_page_height': round(frame_height - max(paginator.remaining, 0), 1),
+        'sections': result
+    }
+
+
+def fit_layout(generator):
+    """Generator for the least compact layout of a CV that fits config.fit_pages
+
+    Binary search over FIT_STEPS on estimated page counts: each candidate
+    is only measured (see estimate_layout), sharing the section and
+    paragraph caches, and the caller renders the winner alone. Config-
+    independent work (descriptions, photo) is done once for all candidates.
+    When even the most compact layout is too long, it is used anyway.
+
+    Returns:
+        tuple: (CVGenerator for the chosen layout, dict with the target and
+            estimated pages, layout_scale, description_limit and whether it fits)
+    """
+    from cv_generator import CVGenerator
+
+    target = int(generator.config['fit_pages'])
+    if target < 1:
+        raise ValueError(f"fit_pages must be a positive page count, got {target}")
+
+    config = {key: value for key, value in generator.config.items()
+              if key not in ('fit_pages', 'layout_scale', 'description_limit')}
+    prepared = generator.prepare()
+    candidates = {}
+
+    def candidate(step):
+        """(generator, estimated pages) of a fit step, estimated once"""
+        if step not in candidates:
+            scale, limit = FIT_STEPS[step]
+            step_config = dict(config)
+            # The original layout keeps the config (and cache keys) of a plain render
+            if scale != 1:
+                step_config['layout_scale'] = scale
+            if limit is not None:
+                step_config['description_limit'] = limit
+            step_generator = CVGenerator(prepared, step_config)
+            candidates[step] = (step_generator, estimate_layout(step_generator)['pages'])
+        return candidates[step]
+
+    with stage('fit'):
+        # Invariant: step low does not fit, step high fits (or is the last one)
+        low, high = 0, len(FIT_STEPS) - 1
+        if candidate(low)[1] <= target:
+            high = low
+        else:
+            while high - low > 1:
+                middle = (low + high) // 2
+                if candidate(middle)[1] <= target:
+                    high = middle
+                else:
+                    low = middle
+
+    chosen, pages = candidate(high)
+    return chosen, {
+        'target': target,
+        'pages': pages,
+        'layout_scale': chosen.layout_scale,
+        'description_limit': chosen.description_limit,
+        'fits': pages <= target,
+        'candidates': len(candidates)
+    }
@@ -0,0 +1,104 @@
+import cProfile
+import logging
+import os
+import random
+import threading
+import time
+import tracemalloc
+import uuid
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+
+class RequestProfiler:
+    """Sampled cProfile / tracemalloc capture of individual requests
+
+    Dumps are written to `directory` as `<id>.prof` (cProfile stats, open with
+    pstats or snakeviz) and `<id>.tracemalloc` (tracemalloc.Snapshot.load).
+    The directory is capped by file count and total size; oldest dumps are
+    removed first.
+    """
+
+    def __init__(self, directory, sample_rate=0.0, memory=False, max_files=50, max_bytes=100 * 1024 * 1024):
+        self.directory = directory
+        self.sample_rate = sample_rate
+        self.memory = memory
+        self.max_files = max_files
+        self.max_bytes = max_bytes
+        # tracemalloc is process-wide: only one request traces allocations at a time
+        self._memory_lock = threading.Lock()
+
+    def should_sample(self, rate=None):
+        """Decide whether to profile a request, using `rate` instead of the default when given"""
+        rate = self.sample_rate if rate is None else rate
+        return rate > 0 and random.random() < rate
+
+    @contextmanager
+    def profile(self, name, memory=None):
+        """Profile the enclosed block and dump the results
+
+        Yields the profile id, or None when profiling could not start (e.g.
+        another profiler is already active in this thread).
+        """
+        memory = self.memory if memory is None else memory
+        profile_id = f"{time.strftime('%Y%m%d-%H%M%S')}_{name}_{uuid.uuid4().hex[:8]}"
+
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError as e:
+            logger.warning(f"Profiling skipped for {name}: {e}")
+            yield None
+            return
+
+        trace_memory = memory and not tracemalloc.is_tracing() and self._memory_lock.acquire(blocking=False)
+        if trace_memory:
+            tracemalloc.start(25)
+
+        try:
+            yield profile_id
+        finally:
+            profiler.disable()
+            snapshot = None
+            if trace_memory:
+                snapshot = tracemalloc.take_snapshot()
+                tracemalloc.stop()
+                self._memory_lock.release()
+
+            try:
+                self._dump(profile_id, profiler, snapshot)
+            except Exception as e:
+                logger.error(f"Failed to write profile {profile_id}: {e}")
+
+    def _dump(self, profile_id, profiler, snapshot):
+        os.makedirs(self.directory, exist_ok=True)
+        profiler.dump_stats(os.path.join(self.directory, f"{profile_id}.prof"))
+        if snapshot is not None:
+            snapshot.dump(os.path.join(self.directory, f"{profile_id}.tracemalloc"))
+        logger.info(f"Profile written: {profile_id}")
+        self.rotate()
+
+    def rotate(self):
+        """Delete the oldest dumps until the directory is within its caps"""
+        entries = []
+        for filename in os.listdir(self.directory):
+            if not filename.endswith(('.prof', '.tracemalloc')):
+                continue
+            path = os.path.join(self.directory, filename)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        entries.sort()
+        total_bytes = sum(size for _, size, _ in entries)
+
+        while entries and (len(entries) > self.max_files or total_bytes > self.max_bytes):
+            _, size, path = entries.pop(0)
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total_bytes -= size
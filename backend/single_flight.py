@@ -0,0 +1,158 @@
+import logging
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+
+from metrics import REGISTRY, stage
+
+logger = logging.getLogger(__name__)
+
+COALESCED_REQUESTS = REGISTRY.counter(
+    'cv_coalesced_requests_total',
+    'Requests served by an identical in-flight computation, by scope (process, lock_dir)',
+    ('scope',)
+)
+
+# Results of finished computations are only read by requests that were waiting on them
+RESULT_MAX_AGE = 60  # seconds
+
+
+class SingleFlight:
+    """Run a computation once for concurrent callers sharing the same key
+
+    The first caller for a key computes; callers arriving while it runs wait
+    for the same result (or exception) instead of computing again. Only
+    in-flight work is shared: a caller arriving after the computation
+    finished computes afresh.
+
+    With `lock_dir`, workers of the same host also coalesce: the leader holds
+    `<key>.lock` (created exclusively) and publishes its result to
+    `<key>.result`; workers finding the lock poll until it is released. Results
+    must then be strings (e.g. the path of a generated file). A lock older
+    than `timeout` is considered left by a crashed worker.
+    """
+
+    def __init__(self, lock_dir=None, timeout=60.0, poll_interval=0.05):
+        self.lock_dir = lock_dir
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+        self._lock = threading.Lock()
+        self._flights = {}
+        self._last_prune = 0.0
+        if lock_dir:
+            os.makedirs(lock_dir, exist_ok=True)
+
+    def do(self, key, compute):
+        """Result of `compute()` for `key`, shared with concurrent callers
+
+        Returns:
+            tuple: (result, shared) where shared is True when another caller computed it
+        """
+        with self._lock:
+            future = self._flights.get(key)
+            leader = future is None
+            if leader:
+                future = self._flights[key] = Future()
+
+        if not leader:
+            COALESCED_REQUESTS.inc('process')
+            try:
+                with stage('coalesce_wait'):
+                    return future.result(timeout=self.timeout), True
+            except FutureTimeout:
+                logger.warning(f"Gave up waiting for in-flight computation {key[:12]}")
+                return compute(), False
+
+        try:
+            result, shared = self._lead(key, compute)
+            future.set_result(result)
+            return result, shared
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+
+    def _lead(self, key, compute):
+        """Compute as this process's leader, coordinating with other workers if configured"""
+        if not self.lock_dir:
+            return compute(), False
+
+        lock_path = os.path.join(self.lock_dir, f"{key}.lock")
+        result_path = os.path.join(self.lock_dir, f"{key}.result")
+        start = time.time()
+        while True:
+            try:
+                os.close(os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+                break
+            except FileExistsError:
+                pass
+
+            # Another worker is computing: wait for it to release the lock
+            with stage('coalesce_wait'):
+                released = self._wait_for_release(lock_path)
+            if released:
+                result = self._read_result(result_path, newer_than=start)
+                if result is not None:
+                    COALESCED_REQUESTS.inc('lock_dir')
+                    return result, True
+                # The other worker failed: try to compute ourselves
+
+        try:
+            result = compute()
+            self._write_result(result_path, result)
+            return result, False
+        finally:
+            try:
+                os.remove(lock_path)
+            except FileNotFoundError:
+                pass
+            self._prune()
+
+    def _wait_for_release(self, lock_path):
+        """Poll until the lock is released (True) or found stale and removed (False)"""
+        while True:
+            try:
+                locked_at = os.stat(lock_path).st_mtime
+            except FileNotFoundError:
+                return True
+            if time.time() - locked_at > self.timeout:
+                logger.warning(f"Removing stale coalescing lock {lock_path}")
+                try:
+                    os.remove(lock_path)
+                except FileNotFoundError:
+                    pass
+                return False
+            time.sleep(self.poll_interval)
+
+    def _write_result(self, result_path, result):
+        temp_path = f"{result_path}.{uuid.uuid4().hex}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write(result)
+        os.replace(temp_path, result_path)
+
+    def _read_result(self, result_path, newer_than):
+        try:
+            if os.stat(result_path).st_mtime < newer_than - 1:
+                return None
+            with open(result_path, encoding='utf-8') as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def _prune(self):
+        """Remove old results, at most once per RESULT_MAX_AGE"""
+        now = time.time()
+        if now - self._last_prune < RESULT_MAX_AGE:
+            return
+        self._last_prune = now
+        for entry in os.scandir(self.lock_dir):
+            if entry.name.endswith('.result'):
+                try:
+                    if now - entry.stat().st_mtime > RESULT_MAX_AGE:
+                        os.remove(entry.path)
+                except FileNotFoundError:
+                    pass
@@ -0,0 +1,111 @@
+import logging
+import multiprocessing
+import threading
+import uuid
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from io import BytesIO
+
+from cv_generator import CVGenerator
+from fonts import get_family
+from metrics import stage
+
+logger = logging.getLogger(__name__)
+
+# Workers are never forked from the server process: its threads (request
+# handlers, janitor, warm-up) may hold locks a forked child would inherit
+START_METHOD = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+
+# Worker processes shared by all variant requests, started on first use
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _render_variant(prepared, config):
+    """Render one variant of a prepared CV to PDF bytes (runs in a worker process)"""
+    output = BytesIO()
+    CVGenerator(prepared, config).render(output)
+    return output.getvalue()
+
+
+def get_pool(workers):
+    """Process pool for variant renders, created on first use"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=workers,
+                                        mp_context=multiprocessing.get_context(START_METHOD))
+            logger.info(f"Started variant render pool with {workers} workers")
+        return _pool
+
+
+def shutdown_pool():
+    """Stop the worker processes; the next request starts a new pool"""
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(cancel_futures=True)
+
+
+def render_variants(data, configs, workers=1):
+    """Render the same CV with several configs
+
+    Emoji cleaning, description formatting and photo processing are done
+    once per font family (sanitization depends on the glyphs it has); each
+    config is then rendered from the prepared data, in worker processes when
+    `workers` > 1.
+
+    Returns:
+        list: PDF bytes, in the order of `configs`
+    """
+    with stage('prepare'):
+        fonts = [get_family(config.get('font')).name for config in configs]
+        prepared = {font: CVGenerator(data, {'font': font}).prepare() for font in dict.fromkeys(fonts)}
+    jobs = [(prepared[font], config) for font, config in zip(fonts, configs)]
+
+    with stage('variants_render'):
+        if workers <= 1 or len(configs) == 1:
+            return [_render_variant(*job) for job in jobs]
+
+        try:
+            futures = [get_pool(workers).submit(_render_variant, *job) for job in jobs]
+            return [future.result() for future in futures]
+        except BrokenProcessPool:
+            # A worker died (e.g. killed for memory); start fresh next time
+            shutdown_pool()
+            raise
+
+
+def variant_filename(index, config):
+    """File name of a variant in the response: cv_<n>_<template>.pdf"""
+    template = config.get('template', 'modern') if isinstance(config, dict) else 'modern'
+    template = ''.join(char for char in str(template) if char.isalnum()) or 'cv'
+    return f"cv_{index + 1}_{template}.pdf"
+
+
+def build_zip(pdfs, configs):
+    """ZIP archive of the variants (stored: PDFs are already compressed)"""
+    buffer = BytesIO()
+    with zipfile.ZipFile(buffer, 'w', compression=zipfile.ZIP_STORED) as archive:
+        for index, (pdf, config) in enumerate(zip(pdfs, configs)):
+            archive.writestr(variant_filename(index, config), pdf)
+    return buffer.getvalue()
+
+
+def build_multipart(pdfs, configs):
+    """multipart/mixed body of the variants: (body bytes, boundary)"""
+    boundary = uuid.uuid4().hex
+    parts = []
+    for index, (pdf, config) in enumerate(zip(pdfs, configs)):
+        headers = (
+            f"--{boundary}\r\n"
+            "Content-Type: application/pdf\r\n"
+            f"Content-Disposition: attachment; filename=\"{variant_filename(index, config)}\"\r\n"
+            f"Content-Length: {len(pdf)}\r\n"
+            "\r\n"
+        )
+        parts.append(headers.encode('ascii') + pdf + b"\r\n")
+    parts.append(f"--{boundary}--\r\n".encode('ascii'))
+    return b''.join(parts), boundary
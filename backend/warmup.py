@@ -0,0 +1,148 @@
+import base64
+import logging
+import threading
+import time
+from io import BytesIO
+from metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+# Templates rendered during warm-up (see CVGenerator._setup_custom_styles)
+WARMUP_TEMPLATES = ('modern', 'classic', 'creative')
+
+WARMUP_SECONDS = REGISTRY.gauge(
+    'cv_warmup_duration_seconds',
+    'Duration of the startup warm-up phase'
+)
+
+# Small built-in CV exercising every section builder
+SAMPLE_CV = {
+    'profile': {
+        'first_name': 'Camille',
+        'last_name': 'Martin',
+        'headline': 'Développeuse Full Stack',
+        'email': 'camille.martin@example.com',
+        'phone': '+33 6 00 00 00 00',
+        'address': 'Paris, France',
+        'summary': 'Développeuse passionnée. n - Conception d\'API n - Intégration continue'
+    },
+    'positions': [
+        {
+            'company': 'Zenika',
+            'title': 'Consultante',
+            'duration': 'Jan 2020 - Présent',
+            'location': 'Paris',
+            'description': 'Accompagnement de clients grands comptes',
+            'missions': [
+                {
+                    'client': 'Aircall',
+                    'title': 'Software Engineer @ Aircall',
+                    'duration': 'Mar 2021 - Présent',
+                    'location': 'Paris',
+                    'description': 'Refonte du front • Mise en place des tests'
+                }
+            ]
+        }
+    ],
+    'education': [
+        {
+            'school': 'Université de Lyon',
+            'degree': 'Master',
+            'field_of_study': 'Informatique',
+            'start_date': '2014',
+            'end_date': '2019'
+        }
+    ],
+    'skills': ['Python', 'JavaScript', 'Docker', 'PostgreSQL'],
+    'languages': [
+        {'name': 'Français', 'proficiency': 'Native or bilingual proficiency'},
+        {'name': 'Anglais', 'proficiency': 'Professional working proficiency'}
+    ],
+    'certifications': [
+        {
+            'name': 'AWS Certified Developer',
+            'authority': 'Amazon',
+            'start_date': '2021',
+            'end_date': '2024'
+        }
+    ]
+}
+
+
+def _sample_photo():
+    """Build a small base64 PNG so warm-up also loads PIL's image plugins"""
+    from PIL import Image as PILImage
+
+    buffer = BytesIO()
+    PILImage.new('RGBA', (64, 48), (52, 152, 219, 255)).save(buffer, format='PNG')
+    return base64.b64encode(buffer.getvalue()).decode('ascii')
+
+
+class WarmupState:
+    """Readiness flag and timing of the startup warm-up phase"""
+
+    def __init__(self):
+        self._ready = threading.Event()
+        self.enabled = False
+        self.duration = None
+        self.error = None
+
+    @property
+    def ready(self):
+        return self._ready.is_set()
+
+    def mark_ready(self):
+        self._ready.set()
+
+    def wait(self, timeout=None):
+        return self._ready.wait(timeout)
+
+    def to_dict(self):
+        return {
+            'ready': self.ready,
+            'warmup_enabled': self.enabled,
+            'warmup_seconds': round(self.duration, 3) if self.duration is not None else None,
+            'warmup_error': self.error
+        }
+
+
+def warm_up(templates=WARMUP_TEMPLATES):
+    """Render the sample CV once per template into memory
+
+    Pays ReportLab module loading, font metrics parsing, getSampleStyleSheet
+    and PIL plugin registration up front instead of on the first request.
+
+    Returns:
+        float: Warm-up duration in seconds
+    """
+    from cv_generator import CVGenerator
+
+    start = time.perf_counter()
+    sample = dict(SAMPLE_CV, photo=_sample_photo())
+
+    for template in templates:
+        CVGenerator(sample, config={'template': template}).render(BytesIO())
+
+    return time.perf_counter() - start
+
+
+def run_warmup(state, templates=WARMUP_TEMPLATES):
+    """Run warm-up and mark the state ready, even if warm-up fails"""
+    try:
+        state.duration = warm_up(templates)
+        WARMUP_SECONDS.set(state.duration)
+        logger.info(f"Warm-up completed in {state.duration:.3f}s ({', '.join(templates)})")
+    except Exception as e:
+        # A failed warm-up must not keep the worker out of rotation forever
+        state.error = str(e)
+        logger.error(f"Warm-up failed: {e}", exc_info=True)
+    finally:
+        state.mark_ready()
+
+
+def start_warmup(state, templates=WARMUP_TEMPLATES):
+    """Start warm-up in a background thread so the server can bind immediately"""
+    state.enabled = True
+    thread = threading.Thread(target=run_warmup, args=(state, templates), name='cv-warmup', daemon=True)
+    thread.start()
+    return thread
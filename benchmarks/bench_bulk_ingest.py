@@ -0,0 +1,127 @@
+"""
+Time and peak-memory benchmark for multi-person bulk ingestion.
+
+Writes a synthetic agency export (one CSV per entity type, rows of all people
+shuffled together) and walks every person's CV data with iter_people, fully
+in memory and with sorted runs spilled to disk. A `load_all` entry parses the
+whole export into memory at once, for reference: that peak grows with the
+export, the streaming ones should not.
+
+It then times regenerating a single person's data: by scanning the export
+(`person_scan`) and through the row-offset indexes (`person_lookup`), with
+the cost of building the indexes (`index_build`) and of loading them back
+from disk in a new process (`index_load`).
+
+Usage:
+    python benchmarks/bench_bulk_ingest.py                    # 100 and 500 people, 20 positions each
+    python benchmarks/bench_bulk_ingest.py --people 2000 --chunk-rows 5000
+"""
+
+import argparse
+import gc
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from common import measure, write_results, load_results, compare_to_baseline, report_regressions
+from synthetic import write_agency_export
+
+import csv_index
+from bulk_ingest import iter_people, person_data
+from csv_index import CSVIndex
+
+MIB = 1024 * 1024
+
+
+def traced(func):
+    """Run func under tracemalloc and return (seconds, peak MiB, result)"""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return round(elapsed, 3), round(peak / MIB, 3), result
+
+
+def walk(paths, **options):
+    """Consume iter_people, keeping only the number of people seen"""
+    return sum(1 for _ in iter_people(paths, **options))
+
+
+def bench_case(people, positions, chunk_rows):
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        paths = write_agency_export(directory, people, positions)
+        rows = sum(1 for path in paths for _ in open(path, encoding='utf-8')) - len(paths)
+
+        cases = {
+            'load_all': lambda: len(list(iter_people(paths, chunk_rows=rows + 1))),
+            'in_memory': lambda: walk(paths, chunk_rows=rows + 1),
+            'spilled': lambda: walk(paths, chunk_rows=chunk_rows, spill_dir=directory)
+        }
+        for name, func in cases.items():
+            elapsed, peak, count = traced(func)
+            assert count == people, (name, count)
+            results[f'{name}_seconds'] = elapsed
+            results[f'{name}_peak'] = peak
+
+        # Single-person regeneration: the last person is the worst case for a scan
+        target = f"P{people - 1:06d}"
+        def scan():
+            return next(data for person_id, data in iter_people(paths, chunk_rows=rows + 1) if person_id == target)
+
+        results['person_scan_seconds'] = measure(scan, 1)[0]
+
+        def open_indexes():
+            csv_index._cache.clear()
+            return [CSVIndex.open(path, 'Person Id') for path in paths]
+
+        results['index_build_seconds'] = measure(open_indexes, 1)[0]
+        results['index_load_seconds'] = measure(open_indexes)[0]
+        results['person_lookup_seconds'] = round(measure(lambda: person_data(paths, target), 10)[0], 6)
+        csv_index._cache.clear()
+
+    print(f"  {people:>5} people, ~{rows} rows: "
+          f"load all {results['load_all_peak']:.1f} MiB ({results['load_all_seconds']:.2f}s), "
+          f"in memory {results['in_memory_peak']:.1f} MiB ({results['in_memory_seconds']:.2f}s), "
+          f"spilled {results['spilled_peak']:.1f} MiB ({results['spilled_seconds']:.2f}s)")
+    print(f"        one person: scan {results['person_scan_seconds']:.2f}s, "
+          f"indexed {results['person_lookup_seconds'] * 1000:.2f}ms "
+          f"(index build {results['index_build_seconds']:.2f}s, load {results['index_load_seconds']:.3f}s)")
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--people', default='100,500', help='Comma-separated numbers of people')
+    parser.add_argument('--positions', type=int, default=20, help='Positions per person')
+    parser.add_argument('--chunk-rows', type=int, default=2000, help='Rows per sorted run in the spilled case')
+    parser.add_argument('--output', default=os.path.join(os.path.dirname(__file__), 'results', 'bulk_ingest.json'))
+    parser.add_argument('--baseline', help='Baseline JSON to compare against (regression mode)')
+    parser.add_argument('--threshold', type=float, default=20.0, help='Allowed growth per value, in percent')
+    parser.add_argument('--min-delta', type=float, default=0.5, help='Ignore differences below this amount')
+    args = parser.parse_args(argv)
+
+    print(f"Bulk ingestion benchmark ({args.positions} positions per person, MiB / seconds)")
+    results = {}
+    for people in map(int, args.people.split(',')):
+        results[str(people)] = bench_case(people, args.positions, args.chunk_rows)
+
+    write_results(args.output, 'bulk_ingest', results, unit='MiB / seconds')
+    print(f"Results written to {args.output}")
+
+    if args.baseline:
+        baseline = load_results(args.baseline)['results']
+        regressions = compare_to_baseline(results, baseline, args.threshold, args.min_delta)
+        return report_regressions(regressions, '')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,97 @@
+"""
+Render engine benchmark: platypus vs direct canvas.
+
+Renders the same CVs with the modern template through each render engine and
+reports the median render time (story + layout + PDF) and page count, so the
+direct-canvas engine can be compared with the platypus one on identical input.
+
+Usage:
+    python benchmarks/bench_engines.py                    # sm, md and the consultant CV
+    python benchmarks/bench_engines.py --sizes sm,md,xl
+"""
+
+import argparse
+import os
+import re
+import sys
+import tempfile
+from io import BytesIO
+
+from common import measure, write_results, load_results, compare_to_baseline, report_regressions
+from synthetic import SIZES, write_export
+
+from linkedin_parser import LinkedInParser
+from cv_generator import CVGenerator, RENDER_ENGINES
+
+# Consultant CV from the layout benchmark: 20 Positions.csv rows of 1,500-character missions
+CONSULTANT = (20, 1500)
+
+
+def count_pages(pdf_bytes):
+    return len(re.findall(rb'/Type /Page\b(?!s)', pdf_bytes))
+
+
+def build_cv(positions, description_chars=None):
+    with tempfile.TemporaryDirectory() as directory:
+        if description_chars:
+            paths = write_export(directory, positions, description_chars=description_chars, mission_ratio=1.0)
+        else:
+            paths = write_export(directory, positions)
+        return LinkedInParser(paths).parse()
+
+
+def bench_case(name, data, engines, repeat):
+    timings = {}
+    pages = {}
+    for engine in engines:
+        generator = CVGenerator(data, {'engine': engine})
+
+        def render():
+            output = BytesIO()
+            generator.render(output)
+            return output.getvalue()
+
+        timings[f'render_{engine}'], pdf_bytes = measure(render, repeat)
+        pages[engine] = count_pages(pdf_bytes)
+
+    summary = ', '.join(f"{engine} {timings[f'render_{engine}']:.3f}s ({pages[engine]} pages)" for engine in engines)
+    print(f"  {name:<12} {summary}")
+    return timings
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--sizes', default='sm,md',
+                        help=f"Comma-separated sizes among {', '.join(f'{k}={v}' for k, v in SIZES.items())} "
+                             "or raw position counts")
+    parser.add_argument('--engines', default=','.join(RENDER_ENGINES), help='Comma-separated engine names')
+    parser.add_argument('--no-consultant', action='store_true', help='Skip the consultant CV case')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per engine (median is kept)')
+    parser.add_argument('--output', default=os.path.join(os.path.dirname(__file__), 'results', 'engines.json'))
+    parser.add_argument('--baseline', help='Baseline JSON to compare against (regression mode)')
+    parser.add_argument('--threshold', type=float, default=20.0, help='Allowed slowdown per engine, in percent')
+    parser.add_argument('--min-delta', type=float, default=0.005, help='Ignore slowdowns below this many seconds')
+    args = parser.parse_args(argv)
+
+    engines = args.engines.split(',')
+    sizes = [SIZES.get(size, None) or int(size) for size in args.sizes.split(',')]
+
+    print(f"Render engine benchmark ({args.repeat} runs per engine)")
+    results = {}
+    for positions in sizes:
+        results[str(positions)] = bench_case(f"{positions} pos.", build_cv(positions), engines, args.repeat)
+    if not args.no_consultant:
+        results['consultant'] = bench_case('consultant', build_cv(*CONSULTANT), engines, args.repeat)
+
+    write_results(args.output, 'engines', results, unit='seconds')
+    print(f"Results written to {args.output}")
+
+    if args.baseline:
+        baseline = load_results(args.baseline)['results']
+        regressions = compare_to_baseline(results, baseline, args.threshold, args.min_delta)
+        return report_regressions(regressions, 's')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,115 @@
+"""
+Page estimate benchmark: estimate vs full render, and auto-fit cost.
+
+For each CV, reports the median time of a platypus render, of a cold page
+estimate (empty section and measurement caches: every section is built and
+measured) and of a warm one after editing a single position (only the
+experience section is built again, and only the edited paragraph measured),
+the way the editor calls /api/estimate on every change.
+The estimated and rendered page counts are checked against each other.
+
+`fit` renders with config.fit_pages one page below the rendered count, from
+empty caches: candidate layouts are estimated and only the chosen one is
+rendered. Its cost is reported as a multiple of the plain render.
+
+Usage:
+    python benchmarks/bench_estimate.py                  # sm, md and the consultant CV
+    python benchmarks/bench_estimate.py --sizes xs,sm,md,xl
+"""
+
+import argparse
+import copy
+import os
+import sys
+
+from common import measure, write_results, load_results, compare_to_baseline, report_regressions
+from synthetic import SIZES
+from bench_engines import CONSULTANT, build_cv, count_pages
+
+from io import BytesIO
+from cv_generator import CVGenerator
+from page_estimate import get_section_cache, get_measure_cache
+
+
+def bench_case(name, data, repeat):
+    def render():
+        output = BytesIO()
+        CVGenerator(copy.deepcopy(data)).render(output)
+        return count_pages(output.getvalue())
+
+    def cold():
+        get_section_cache().clear()
+        get_measure_cache().clear()
+        return CVGenerator(copy.deepcopy(data)).estimate()['pages']
+
+    edits = iter(range(1000000))
+
+    def warm():
+        edited = copy.deepcopy(data)
+        edited['positions'][0]['description'] += f" Édition {next(edits)}."
+        return CVGenerator(edited).estimate()['pages']
+
+    def fit():
+        get_section_cache().clear()
+        get_measure_cache().clear()
+        generator = CVGenerator(copy.deepcopy(data), {'fit_pages': max(pages - 1, 1)})
+        output = BytesIO()
+        generator.render(output)
+        assert count_pages(output.getvalue()) == generator.fit['pages']
+        return generator.fit
+
+    results = {}
+    get_measure_cache().clear()
+    results['render'], pages = measure(render, repeat)
+    results['estimate_cold'], estimated = measure(cold, repeat)
+    cold()
+    results['estimate_warm'], _ = measure(warm, repeat)
+    results['fit'], fitted = measure(fit, repeat)
+    get_section_cache().clear()
+    get_measure_cache().clear()
+
+    print(f"  {name:<12} render {results['render']:.3f}s ({pages} pages), "
+          f"estimate cold {results['estimate_cold']:.3f}s ({estimated} pages), "
+          f"warm {results['estimate_warm']:.4f}s ({results['render'] / results['estimate_warm']:.0f}x cheaper)")
+    print(f"  {'':<12} fit to {fitted['target']} pages {results['fit']:.3f}s "
+          f"({results['fit'] / results['render']:.1f}x a render, {fitted['candidates']} layouts estimated): "
+          f"{fitted['pages']} pages at scale {fitted['layout_scale']}, "
+          f"description limit {fitted['description_limit']}")
+    assert estimated == pages, (name, estimated, pages)
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--sizes', default='sm,md',
+                        help=f"Comma-separated sizes among {', '.join(f'{k}={v}' for k, v in SIZES.items())} "
+                             "or raw position counts")
+    parser.add_argument('--no-consultant', action='store_true', help='Skip the consultant CV case')
+    parser.add_argument('--repeat', type=int, default=5, help='Runs per case (median is kept)')
+    parser.add_argument('--output', default=os.path.join(os.path.dirname(__file__), 'results', 'estimate.json'))
+    parser.add_argument('--baseline', help='Baseline JSON to compare against (regression mode)')
+    parser.add_argument('--threshold', type=float, default=20.0, help='Allowed slowdown per case, in percent')
+    parser.add_argument('--min-delta', type=float, default=0.005, help='Ignore slowdowns below this many seconds')
+    args = parser.parse_args(argv)
+
+    sizes = [SIZES.get(size, None) or int(size) for size in args.sizes.split(',')]
+
+    print(f"Page estimate benchmark ({args.repeat} runs per case)")
+    results = {}
+    for positions in sizes:
+        results[str(positions)] = bench_case(f"{positions} pos.", build_cv(positions), args.repeat)
+    if not args.no_consultant:
+        results['consultant'] = bench_case('consultant', build_cv(*CONSULTANT), args.repeat)
+
+    write_results(args.output, 'estimate', results, unit='seconds')
+    print(f"Results written to {args.output}")
+
+    if args.baseline:
+        baseline = load_results(args.baseline)['results']
+        regressions = compare_to_baseline(results, baseline, args.threshold, args.min_delta)
+        return report_regressions(regressions, 's')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
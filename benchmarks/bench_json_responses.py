@@ -0,0 +1,104 @@
+"""
+Response size and latency benchmark for /api/parse-linkedin.
+
+Uploads the mock/ export and synthetic exports through the Flask test client
+with each Accept-Encoding (identity, gzip, deflate), with and without
+?omit_empty=true, and reports the response body size and the median request
+latency.
+
+Usage:
+    python benchmarks/bench_json_responses.py                 # mock/ export, 10, 100 and 1,000 positions
+    python benchmarks/bench_json_responses.py --sizes sm,md,xl --level 1
+"""
+
+import argparse
+import glob
+import os
+import sys
+import tempfile
+
+from common import measure, write_results, load_results, compare_to_baseline, report_regressions
+from synthetic import SIZES, write_export
+
+import app as app_module
+
+ENCODINGS = ('identity', 'gzip', 'deflate')
+
+# Hand-written export with the sparse fields of a real one (empty maiden_name, birth_date, ...)
+MOCK_DIR = os.path.join(os.path.dirname(__file__), '..', 'mock')
+
+
+def upload(client, paths, encoding, omit_empty):
+    files = [(open(path, 'rb'), os.path.basename(path)) for path in paths]
+    try:
+        response = client.post(
+            '/api/parse-linkedin' + ('?omit_empty=true' if omit_empty else ''),
+            data={'files': files},
+            content_type='multipart/form-data',
+            headers={'Accept-Encoding': encoding}
+        )
+    finally:
+        for f, _ in files:
+            f.close()
+    assert response.status_code == 200, response.status_code
+    return response
+
+
+def bench_case(name, paths, repeat):
+    results = {}
+    client = app_module.app.test_client()
+    for omit_empty in (False, True):
+        for encoding in ENCODINGS:
+            case = f"{encoding}{'_omit_empty' if omit_empty else ''}"
+            elapsed, response = measure(lambda: upload(client, paths, encoding, omit_empty), repeat)
+            results[f'{case}_bytes'] = len(response.data)
+            results[f'{case}_seconds'] = elapsed
+
+    plain = results['identity_bytes']
+    print(f"  {name:<10} identity {plain // 1024} KB ({results['identity_seconds']:.3f}s), "
+          f"gzip {results['gzip_bytes'] // 1024} KB ({results['gzip_seconds']:.3f}s), "
+          f"deflate {results['deflate_bytes'] // 1024} KB, "
+          f"omit_empty {results['identity_omit_empty_bytes'] // 1024} KB, "
+          f"omit_empty+gzip {results['gzip_omit_empty_bytes'] // 1024} KB "
+          f"({100 * results['gzip_omit_empty_bytes'] / plain:.1f}%)")
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--sizes', default='xs,sm,md',
+                        help=f"Comma-separated sizes among {', '.join(f'{k}={v}' for k, v in SIZES.items())} "
+                             "or raw position counts")
+    parser.add_argument('--no-mock', action='store_true', help='Skip the mock/ export')
+    parser.add_argument('--level', type=int, default=app_module.JSON_COMPRESSION_LEVEL, help='Compression level')
+    parser.add_argument('--repeat', type=int, default=3, help='Requests per case (median is kept)')
+    parser.add_argument('--output', default=os.path.join(os.path.dirname(__file__), 'results', 'json_responses.json'))
+    parser.add_argument('--baseline', help='Baseline JSON to compare against (regression mode)')
+    parser.add_argument('--threshold', type=float, default=20.0, help='Allowed growth per value, in percent')
+    parser.add_argument('--min-delta', type=float, default=0.005, help='Ignore differences below this amount')
+    args = parser.parse_args(argv)
+
+    app_module.JSON_COMPRESSION_LEVEL = args.level
+    sizes = [SIZES.get(size, None) or int(size) for size in args.sizes.split(',')]
+
+    print(f"parse-linkedin response benchmark (level {args.level}, {args.repeat} requests per case)")
+    results = {}
+    if not args.no_mock:
+        results['mock'] = bench_case('mock', sorted(glob.glob(os.path.join(MOCK_DIR, '*.csv'))), args.repeat)
+    for positions in sizes:
+        with tempfile.TemporaryDirectory() as directory:
+            paths = write_export(directory, positions)
+            results[str(positions)] = bench_case(f"{positions} pos.", paths, args.repeat)
+
+    write_results(args.output, 'json_responses', results, unit='bytes / seconds')
+    print(f"Results written to {args.output}")
+
+    if args.baseline:
+        baseline = load_results(args.baseline)['results']
+        regressions = compare_to_baseline(results, baseline, args.threshold, args.min_delta)
+        return report_regressions(regressions, '')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,105 @@
+"""
+Label flowable benchmark: PlainLine fast path vs Paragraph.
+
+Builds and lays out CVs with many entries twice: once with the short labels
+(titles, companies, dates, mission clients, languages, certification
+authorities) as PlainLine, as CVGenerator does, and once with every label
+forced through Paragraph, to show what the fast path saves.
+
+Usage:
+    python benchmarks/bench_labels.py                  # sm, md
+    python benchmarks/bench_labels.py --sizes sm,md,xl
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from io import BytesIO
+
+from common import write_results, load_results, compare_to_baseline, report_regressions
+from synthetic import SIZES, write_export
+
+import cv_generator
+from linkedin_parser import LinkedInParser
+from cv_generator import CVGenerator
+from reportlab.platypus import Paragraph
+
+
+def paragraph_line(text, style, bold_prefix=''):
+    """text_line() without the fast path"""
+    return Paragraph(f"<b>{bold_prefix}</b>{text}" if bold_prefix else text, style)
+
+
+def time_render(generator, repeat):
+    """Median story build and doc.build times over `repeat` fresh stories"""
+    story_builds = []
+    doc_builds = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        story = generator._build_story()
+        story_builds.append(time.perf_counter() - start)
+
+        doc = generator._create_document(BytesIO())
+        start = time.perf_counter()
+        doc.build(story)
+        doc_builds.append(time.perf_counter() - start)
+    return statistics.median(story_builds), statistics.median(doc_builds)
+
+
+def bench_case(positions, repeat):
+    with tempfile.TemporaryDirectory() as directory:
+        data = LinkedInParser(write_export(directory, positions)).parse()
+    generator = CVGenerator(data)
+
+    timings = {}
+    fast_path = cv_generator.text_line
+    for mode, factory in (('paragraph', paragraph_line), ('plain', fast_path)):
+        cv_generator.text_line = factory
+        try:
+            story_build, doc_build = time_render(generator, repeat)
+        finally:
+            cv_generator.text_line = fast_path
+        timings[f'story_build_{mode}'] = story_build
+        timings[f'doc_build_{mode}'] = doc_build
+        timings[f'total_{mode}'] = story_build + doc_build
+
+    saved = 1 - timings['total_plain'] / timings['total_paragraph']
+    print(f"  {positions:>6} positions: Paragraph {timings['total_paragraph']:.3f}s, "
+          f"PlainLine {timings['total_plain']:.3f}s ({saved:.0%} less)")
+    return timings
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--sizes', default='sm,md',
+                        help=f"Comma-separated sizes among {', '.join(f'{k}={v}' for k, v in SIZES.items())} "
+                             "or raw position counts")
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per mode (median is kept)')
+    parser.add_argument('--output', default=os.path.join(os.path.dirname(__file__), 'results', 'labels.json'))
+    parser.add_argument('--baseline', help='Baseline JSON to compare against (regression mode)')
+    parser.add_argument('--threshold', type=float, default=20.0, help='Allowed slowdown per stage, in percent')
+    parser.add_argument('--min-delta', type=float, default=0.005, help='Ignore slowdowns below this many seconds')
+    args = parser.parse_args(argv)
+
+    sizes = [SIZES.get(size, None) or int(size) for size in args.sizes.split(',')]
+
+    print(f"Label flowable benchmark ({args.repeat} runs per mode)")
+    results = {}
+    for positions in sizes:
+        results[str(positions)] = bench_case(positions, args.repeat)
+
+    write_results(args.output, 'labels', results, unit='seconds')
+    print(f"Results written to {args.output}")
+
+    if args.baseline:
+        baseline = load_results(args.baseline)['results']
+        regressions = compare_to_baseline(results, baseline, args.threshold, args.min_delta)
+        return report_regressions(regressions, 's')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
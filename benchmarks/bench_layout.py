@@ -0,0 +1,96 @@
+"""
+Layout benchmark on long consultant CVs.
+
+Consultant histories group many client missions under a few positions, so
+single entries are often taller than a page. This benchmark times the story
+build and doc.build of such CVs and reports the page count, to track how the
+keep-together policy scales with entries that do not fit on one page.
+
+Usage:
+    python benchmarks/bench_layout.py                    # ~10 and ~80 page CVs
+    python benchmarks/bench_layout.py --cases consultant
+    python benchmarks/bench_layout.py --baseline benchmarks/layout_baseline.json
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from io import BytesIO
+
+from common import measure, write_results, load_results, compare_to_baseline, report_regressions
+from synthetic import write_export
+
+from linkedin_parser import LinkedInParser
+from cv_generator import CVGenerator
+
+# Named cases: (rows in Positions.csv, characters per description)
+CASES = {
+    'consultant': (20, 1500),         # ~10 pages, a few positions with many missions
+    'consultant_long': (160, 1500),   # ~80 pages
+    'oversized_missions': (12, 6000)  # single missions taller than a page
+}
+
+
+def build_consultant_cv(rows, description_chars):
+    """Parse a synthetic export where every company runs consultant missions"""
+    with tempfile.TemporaryDirectory() as directory:
+        paths = write_export(directory, rows, description_chars=description_chars, mission_ratio=1.0)
+        return LinkedInParser(paths).parse()
+
+
+def bench_case(name, rows, description_chars, repeat):
+    data = build_consultant_cv(rows, description_chars)
+    generator = CVGenerator(data)
+    timings = {}
+
+    timings['story_build'], _ = measure(generator._build_story, repeat)
+
+    # Split flowables keep layout state, so every build gets a fresh story
+    doc_builds = []
+    for _ in range(repeat):
+        story = generator._build_story()
+        doc = generator._create_document(BytesIO())
+        start = time.perf_counter()
+        doc.build(story)
+        doc_builds.append(time.perf_counter() - start)
+    timings['doc_build'] = statistics.median(doc_builds)
+    pages = doc.page
+    timings['total'] = timings['story_build'] + timings['doc_build']
+
+    missions = sum(len(position.get('missions', [])) for position in data['positions'])
+    print(f"  {name:<20} {len(data['positions']):>3} positions, {missions:>3} missions, {pages:>3} pages: "
+          f"story {timings['story_build']:.3f}s, doc.build {timings['doc_build']:.3f}s")
+    return timings
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--cases', default=','.join(CASES), help=f"Comma-separated cases among {', '.join(CASES)}")
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per stage (median is kept)')
+    parser.add_argument('--output', default=os.path.join(os.path.dirname(__file__), 'results', 'layout.json'))
+    parser.add_argument('--baseline', help='Baseline JSON to compare against (regression mode)')
+    parser.add_argument('--threshold', type=float, default=20.0, help='Allowed slowdown per stage, in percent')
+    parser.add_argument('--min-delta', type=float, default=0.005, help='Ignore slowdowns below this many seconds')
+    args = parser.parse_args(argv)
+
+    print(f"Layout benchmark ({args.repeat} runs per stage)")
+    results = {}
+    for name in args.cases.split(','):
+        rows, description_chars = CASES[name]
+        results[name] = bench_case(name, rows, description_chars, args.repeat)
+
+    write_results(args.output, 'layout', results, unit='seconds')
+    print(f"Results written to {args.output}")
+
+    if args.baseline:
+        baseline = load_results(args.baseline)['results']
+        regressions = compare_to_baseline(results, baseline, args.threshold, args.min_delta)
+        return report_regressions(regressions, 's')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
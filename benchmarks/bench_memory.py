@@ -0,0 +1,128 @@
+"""
+Peak-memory benchmark for the PDF render pipeline.
+
+Replays what /api/generate-pdf does with a payload (JSON decode, emoji
+cleaning deep copy, style setup, photo decoding, story build, doc.build)
+under tracemalloc, and reports for each stage the peak allocation above the
+stage's starting point and the memory still retained once it returns (MiB).
+A `render` entry traces the whole pipeline in one go: that peak is the figure
+to size worker memory limits with.
+
+Usage:
+    python benchmarks/bench_memory.py                            # small, medium, huge
+    python benchmarks/bench_memory.py --cases small,medium
+    python benchmarks/bench_memory.py --baseline benchmarks/memory_baseline.json --threshold 10
+"""
+
+import argparse
+import gc
+import json
+import os
+import sys
+import tempfile
+import tracemalloc
+from io import BytesIO
+
+from common import write_results, load_results, compare_to_baseline, report_regressions
+from synthetic import write_export, build_photo
+
+from linkedin_parser import LinkedInParser
+from cv_generator import CVGenerator
+
+MIB = 1024 * 1024
+
+# Named cases: (positions, photo side in pixels)
+CASES = {
+    'small': (10, 200),
+    'medium': (100, 800),
+    'huge': (1000, 2000)
+}
+
+
+def traced(func):
+    """Run func under tracemalloc and return (peak MiB, retained MiB, result)
+
+    Both figures are relative to the memory traced when func starts, so
+    earlier stages do not count against later ones.
+    """
+    gc.collect()
+    tracemalloc.reset_peak()
+    before = tracemalloc.get_traced_memory()[0]
+    result = func()
+    current, peak = tracemalloc.get_traced_memory()
+    return round((peak - before) / MIB, 3), round((current - before) / MIB, 3), result
+
+
+def build_payload(positions, photo_px):
+    """Build the JSON request body the frontend would send for this export"""
+    with tempfile.TemporaryDirectory() as directory:
+        data = LinkedInParser(write_export(directory, positions)).parse()
+    data['photo'] = build_photo(photo_px)
+    return json.dumps(data).encode('utf-8')
+
+
+def bench_case(name, positions, photo_px):
+    """Trace every render stage for one case"""
+    body = build_payload(positions, photo_px)
+    results = {}
+
+    def record(stage_name, func):
+        peak, retained, result = traced(func)
+        results[f'{stage_name}_peak'] = peak
+        results[f'{stage_name}_retained'] = retained
+        return result
+
+    tracemalloc.start()
+    try:
+        data = record('json_decode', lambda: json.loads(body))
+        generator = record('init', lambda: CVGenerator(data))
+        record('emoji_clean', lambda: generator._clean_emoji_from_data(data))
+        record('photo_process', generator._create_photo_image)
+        story = record('story_build', generator._build_story)
+        record('doc_build', lambda: generator._create_document(BytesIO()).build(story))
+        del data, generator, story
+
+        def render():
+            buffer = BytesIO()
+            CVGenerator(json.loads(body)).render(buffer)
+            return buffer.tell()
+
+        pdf_bytes = record('render', render)
+    finally:
+        tracemalloc.stop()
+
+    print(f"  {name:<8} {positions:>5} positions, {len(body) / MIB:6.1f} MiB payload: "
+          f"render peak {results['render_peak']:.1f} MiB, {pdf_bytes // 1024} KB PDF")
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--cases', default=','.join(CASES), help=f"Comma-separated cases among {', '.join(CASES)}")
+    parser.add_argument('--output', default=os.path.join(os.path.dirname(__file__), 'results', 'memory.json'))
+    parser.add_argument('--baseline', help='Baseline JSON to compare against (regression mode)')
+    parser.add_argument('--threshold', type=float, default=10.0, help='Allowed peak growth per stage, in percent')
+    parser.add_argument('--min-delta', type=float, default=0.5, help='Ignore growth below this many MiB')
+    args = parser.parse_args(argv)
+
+    print("Peak-memory benchmark (tracemalloc, MiB)")
+    results = {}
+    for name in args.cases.split(','):
+        positions, photo_px = CASES[name]
+        results[name] = bench_case(name, positions, photo_px)
+
+    write_results(args.output, 'memory', results, unit='MiB')
+    print(f"Results written to {args.output}")
+
+    if args.baseline:
+        baseline = load_results(args.baseline)['results']
+        # Only peaks gate the run: retained memory is reported for information
+        peaks = {case: {k: v for k, v in stages.items() if k.endswith('_peak')}
+                 for case, stages in results.items()}
+        regressions = compare_to_baseline(peaks, baseline, args.threshold, args.min_delta)
+        return report_regressions(regressions, 'MiB')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
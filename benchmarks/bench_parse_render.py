@@ -0,0 +1,98 @@
+"""
+Scaling benchmark for LinkedIn parsing and PDF rendering.
+
+Times LinkedInParser.parse, CVGenerator.__init__, each _build_* section and
+doc.build on synthetic exports of increasing size, and writes the median
+timings (seconds) as JSON.
+
+Usage:
+    python benchmarks/bench_parse_render.py                       # xs, sm, md
+    python benchmarks/bench_parse_render.py --sizes xs,sm,md,xl   # up to 10,000 positions
+    python benchmarks/bench_parse_render.py --output results.json
+    python benchmarks/bench_parse_render.py --baseline benchmarks/baseline.json --threshold 25
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+from io import BytesIO
+
+from common import measure, write_results, load_results, compare_to_baseline, report_regressions
+from synthetic import SIZES, write_export, build_photo
+
+from linkedin_parser import LinkedInParser
+from cv_generator import CVGenerator
+
+
+def bench_case(positions, repeat, photo_px):
+    """Time every parse/render stage for one export size"""
+    timings = {}
+
+    with tempfile.TemporaryDirectory() as directory:
+        paths = write_export(directory, positions)
+        timings['parse'], data = measure(lambda: LinkedInParser(paths).parse(), repeat)
+
+    if photo_px:
+        data['photo'] = build_photo(photo_px)
+
+    timings['init'], generator = measure(lambda: CVGenerator(data), repeat)
+
+    # Build each section separately, then lay out the assembled story
+    story = []
+    elapsed, header = measure(generator._build_header, repeat)
+    timings['build_header'] = elapsed
+    story.extend(header)
+
+    for section_name, builder in generator._enabled_sections():
+        elapsed, flowables = measure(builder, repeat)
+        timings[f'build_{section_name}'] = elapsed
+        story.extend(flowables)
+
+    def doc_build():
+        buffer = BytesIO()
+        # doc.build consumes the story list, so give it a copy each time
+        generator._create_document(buffer).build(list(story))
+        return buffer.tell()
+
+    timings['doc_build'], pdf_bytes = measure(doc_build, repeat)
+    timings['total'] = sum(timings.values())
+
+    print(f"  {positions:>6} positions: parse {timings['parse']:.3f}s, "
+          f"build {sum(v for k, v in timings.items() if k.startswith('build_')):.3f}s, "
+          f"doc.build {timings['doc_build']:.3f}s, {pdf_bytes // 1024} KB")
+    return timings
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--sizes', default='xs,sm,md',
+                        help=f"Comma-separated sizes among {', '.join(f'{k}={v}' for k, v in SIZES.items())} "
+                             "or raw position counts")
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per stage (median is kept)')
+    parser.add_argument('--photo', type=int, default=800, help='Photo side in pixels (0 to disable)')
+    parser.add_argument('--output', default=os.path.join(os.path.dirname(__file__), 'results', 'parse_render.json'))
+    parser.add_argument('--baseline', help='Baseline JSON to compare against (regression mode)')
+    parser.add_argument('--threshold', type=float, default=20.0, help='Allowed slowdown per stage, in percent')
+    parser.add_argument('--min-delta', type=float, default=0.005, help='Ignore slowdowns below this many seconds')
+    args = parser.parse_args(argv)
+
+    sizes = [SIZES.get(size, None) or int(size) for size in args.sizes.split(',')]
+
+    print(f"Parse/render benchmark ({args.repeat} runs per stage)")
+    results = {}
+    for positions in sizes:
+        results[str(positions)] = bench_case(positions, args.repeat, args.photo)
+
+    write_results(args.output, 'parse_render', results, unit='seconds')
+    print(f"Results written to {args.output}")
+
+    if args.baseline:
+        baseline = load_results(args.baseline)['results']
+        regressions = compare_to_baseline(results, baseline, args.threshold, args.min_delta)
+        return report_regressions(regressions, 's')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,104 @@
+"""
+Shared helpers for benchmark scripts: backend import path, timing,
+JSON result files and baseline regression checks.
+"""
+
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime, timezone
+
+# Add backend directory to Python path
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'backend'))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+
+def measure(func, repeat=3):
+    """Call func `repeat` times and return (median seconds, last result)"""
+    timings = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings), result
+
+
+def environment():
+    """Describe the machine and library versions a result was measured with"""
+    import reportlab
+    import PIL
+
+    return {
+        'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'reportlab': reportlab.Version,
+        'pillow': PIL.__version__
+    }
+
+
+def write_results(path, benchmark, results, unit):
+    """Write results as JSON: {benchmark, unit, environment, results: {case: {stage: value}}}"""
+    payload = {
+        'benchmark': benchmark,
+        'unit': unit,
+        'environment': environment(),
+        'results': results
+    }
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(payload, f, indent=2, sort_keys=True)
+    return payload
+
+
+def load_results(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def compare_to_baseline(results, baseline, threshold_pct, min_delta=0.0):
+    """Find stages that regressed against a stored baseline
+
+    A stage regresses when it is more than `threshold_pct` percent slower (or
+    larger) than the baseline AND the absolute difference exceeds `min_delta`,
+    which filters out noise on very short stages. Cases or stages missing from
+    the baseline are ignored.
+
+    Returns:
+        list of dict: One entry per regression (case, stage, baseline, current, change_pct)
+    """
+    regressions = []
+    for case, stages in results.items():
+        baseline_stages = baseline.get(case, {})
+        for stage_name, current in stages.items():
+            previous = baseline_stages.get(stage_name)
+            if previous is None or previous <= 0:
+                continue
+            change_pct = (current - previous) / previous * 100
+            if change_pct > threshold_pct and current - previous > min_delta:
+                regressions.append({
+                    'case': case,
+                    'stage': stage_name,
+                    'baseline': previous,
+                    'current': current,
+                    'change_pct': round(change_pct, 1)
+                })
+    return regressions
+
+
+def report_regressions(regressions, unit):
+    """Print regressions and return the process exit code"""
+    if not regressions:
+        print("No regression against baseline")
+        return 0
+
+    print(f"{len(regressions)} regression(s) against baseline:")
+    for r in regressions:
+        print(f"  {r['case']:>8} {r['stage']:<28} {r['baseline']:.4f} -> {r['current']:.4f} {unit} (+{r['change_pct']}%)")
+    return 1
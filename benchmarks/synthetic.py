@@ -0,0 +1,216 @@
+"""
+Deterministic synthetic LinkedIn exports for benchmarks.
+
+The same seed and size always produce byte-identical CSV files, so timings
+from different runs (or machines) are measured on the same input.
+"""
+
+import base64
+import csv
+import os
+import random
+from io import BytesIO
+
+MONTHS = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
+
+COMPANIES = ['Zenika', 'Octo', 'Sfeir', 'Capgemini', 'Sopra', 'Accenture', 'Thales', 'Ippon', 'Xebia', 'Publicis']
+CLIENTS = ['Aircall', 'Airbnb', 'BNP Paribas', 'Decathlon', 'SNCF', 'Orange', 'Renault', 'Leboncoin', 'Doctolib', '3M']
+TITLES = ['Développeur Full Stack', 'Software Engineer', 'Tech Lead', 'Architecte Cloud', 'DevOps Engineer', 'Data Engineer']
+EMOJIS = ['🚀', '🎉', '🤖', '⚡', '🔄', '🗄️', '✅', '📈', '💡', '🔧']
+WORDS = (
+    'conception développement intégration continue microservices API REST GraphQL Kubernetes Docker '
+    'Terraform PostgreSQL Kafka React TypeScript Python migration performance observabilité sécurité '
+    'accompagnement équipe agile revue de code tests automatisés déploiement données modération'
+).split()
+SKILLS = [
+    'Python', 'JavaScript', 'TypeScript', 'React', 'Vue.js', 'Node.js', 'Docker', 'Kubernetes', 'Terraform',
+    'PostgreSQL', 'MongoDB', 'Kafka', 'AWS', 'GCP', 'Azure', 'Go', 'Rust', 'Java', 'Spring', 'GraphQL'
+]
+
+# Named sizes used by the benchmark scripts
+SIZES = {
+    'xs': 10,
+    'sm': 100,
+    'md': 1000,
+    'xl': 10000
+}
+
+
+def _date(year, month):
+    return f"{MONTHS[month]} {year}"
+
+
+def _sentence(rng, words):
+    return ' '.join(rng.choice(WORDS) for _ in range(words)).capitalize() + '.'
+
+
+def _description(rng, target_chars):
+    """Build an emoji-laden, bullet-heavy description of roughly target_chars characters"""
+    parts = []
+    length = 0
+    while length < target_chars:
+        style = rng.random()
+        if style < 0.4:
+            part = f"{rng.choice(EMOJIS)} {_sentence(rng, rng.randint(6, 14))}"
+        elif style < 0.7:
+            part = f"• {_sentence(rng, rng.randint(4, 10))}"
+        else:
+            # LinkedIn exports encode line breaks as a bare ' n '
+            part = f"{_sentence(rng, rng.randint(8, 20))} n"
+        parts.append(part)
+        length += len(part) + 1
+    return ' '.join(parts)
+
+
+def build_export(positions, seed=42, description_chars=600, mission_ratio=0.3, skills=None):
+    """Build the rows of a synthetic LinkedIn export
+
+    Args:
+        positions (int): Number of rows in Positions.csv
+        seed (int): Random seed
+        description_chars (int): Approximate length of each description
+        mission_ratio (float): Share of positions that are consultant missions
+            overlapping a generic position at the same company
+        skills (int): Number of skills (defaults to min(positions, 500), at least 20)
+
+    Returns:
+        dict: file name -> (header, rows)
+    """
+    rng = random.Random(seed)
+    skills = skills if skills is not None else max(20, min(positions, 500))
+
+    profile = [{
+        'First Name': 'Camille',
+        'Last Name': 'Martin',
+        'Headline': 'Consultante Full Stack',
+        'Summary': _description(rng, description_chars),
+        'Address': 'Paris, France',
+        'Email Address': 'camille.martin@example.com',
+        'Phone Number': '+33 6 00 00 00 00'
+    }]
+
+    position_rows = []
+    year = 2024
+    month = 11
+    while len(position_rows) < positions:
+        company = f"{rng.choice(COMPANIES)} {len(position_rows) // 20}"
+        start_year = year - rng.randint(1, 3)
+        start = _date(start_year, month)
+        end = _date(year, month) if position_rows else ''
+
+        position_rows.append({
+            'Company Name': company,
+            'Title': rng.choice(TITLES),
+            'Description': _sentence(rng, 5),
+            'Location': 'Paris',
+            'Started On': start,
+            'Finished On': end
+        })
+
+        # Consultant missions: same company, overlapping dates, longer description
+        missions = int(mission_ratio * 10 * rng.random())
+        for _ in range(missions):
+            if len(position_rows) >= positions:
+                break
+            client = rng.choice(CLIENTS)
+            position_rows.append({
+                'Company Name': company,
+                'Title': f"{rng.choice(TITLES)} @ {client}",
+                'Description': _description(rng, description_chars),
+                'Location': 'Paris',
+                'Started On': _date(start_year, rng.randint(0, 11)),
+                'Finished On': _date(year, rng.randint(0, month))
+            })
+
+        year = start_year
+
+    education = [{
+        'School Name': f"Université {i}",
+        'Degree Name': 'Master',
+        'Notes': 'Informatique',
+        'Start Date': str(2000 - 5 * i),
+        'End Date': str(2005 - 5 * i)
+    } for i in range(3)]
+
+    skill_rows = [{'Name': f"{SKILLS[i % len(SKILLS)]} {i // len(SKILLS)}".strip()} for i in range(skills)]
+
+    languages = [
+        {'Name': 'Français', 'Proficiency': 'Native or bilingual proficiency'},
+        {'Name': 'Anglais', 'Proficiency': 'Professional working proficiency'},
+        {'Name': 'Espagnol', 'Proficiency': 'Elementary proficiency'}
+    ]
+
+    certifications = [{
+        'Name': f"Certification {i}",
+        'Authority': rng.choice(['Amazon', 'Google', 'Microsoft', 'CNCF']),
+        'Started On': _date(2015 + i % 10, i % 12),
+        'Finished On': '',
+        'Url': ''
+    } for i in range(max(3, positions // 50))]
+
+    def table(rows):
+        return (list(rows[0].keys()), rows)
+
+    return {
+        'Profile.csv': table(profile),
+        'Positions.csv': table(position_rows),
+        'Education.csv': table(education),
+        'Skills.csv': table(skill_rows),
+        'Languages.csv': table(languages),
+        'Certifications.csv': table(certifications)
+    }
+
+
+def write_export(directory, positions, seed=42, **kwargs):
+    """Write a synthetic export to `directory` and return the CSV paths"""
+    os.makedirs(directory, exist_ok=True)
+    paths = []
+    for filename, (header, rows) in build_export(positions, seed=seed, **kwargs).items():
+        path = os.path.join(directory, filename)
+        with open(path, 'w', encoding='utf-8', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=header)
+            writer.writeheader()
+            writer.writerows(rows)
+        paths.append(path)
+    return paths
+
+
+def write_agency_export(directory, people, positions=20, seed=42, id_column='Person Id', **kwargs):
+    """Write a multi-person export (one CSV per entity type, keyed by `id_column`)
+
+    Rows of all people are shuffled together, as in an HR system export
+    ordered by row id rather than by person. Returns the CSV paths.
+    """
+    os.makedirs(directory, exist_ok=True)
+    rng = random.Random(seed)
+    tables = {}
+    for person in range(people):
+        person_id = f"P{person:06d}"
+        for filename, (header, rows) in build_export(positions, seed=seed + person, **kwargs).items():
+            table = tables.setdefault(filename, ([id_column] + header, []))
+            table[1].extend({id_column: person_id, **row} for row in rows)
+
+    paths = []
+    for filename, (header, rows) in tables.items():
+        rng.shuffle(rows)
+        path = os.path.join(directory, filename)
+        with open(path, 'w', encoding='utf-8', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=header)
+            writer.writeheader()
+            writer.writerows(rows)
+        paths.append(path)
+    return paths
+
+
+def build_photo(size_px, seed=42):
+    """Build a deterministic noisy photo as a base64 PNG data URL
+
+    Noise defeats PNG compression, so the payload size scales with size_px.
+    """
+    from PIL import Image as PILImage
+
+    rng = random.Random(seed)
+    pixels = rng.randbytes(size_px * size_px * 3)
+    buffer = BytesIO()
+    PILImage.frombytes('RGB', (size_px, size_px), pixels).save(buffer, format='PNG')
+    return 'data:image/png;base64,' + base64.b64encode(buffer.getvalue()).decode('ascii')
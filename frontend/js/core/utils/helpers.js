@@ -41,3 +41,27 @@ export const randomId = () => {
 export const sleep = (ms) => {
     return new Promise(resolve => setTimeout(resolve, ms));
 };
+
+/**
+ * Parse a Server-Timing header into { stage: durationMs }
+ * Ex: "emoji_clean;dur=1.2, doc_build;dur=40.5" -> { emoji_clean: 1.2, doc_build: 40.5 }
+ */
+export const parseServerTiming = (header) => {
+    const timings = {};
+    if (!header) {
+        return timings;
+    }
+
+    header.split(',').forEach(entry => {
+        const [name, ...params] = entry.trim().split(';');
+        if (!name) {
+            return;
+        }
+        const dur = params
+            .map(param => param.trim().split('='))
+            .find(([key]) => key === 'dur');
+        timings[name] = dur ? parseFloat(dur[1]) : null;
+    });
+
+    return timings;
+};
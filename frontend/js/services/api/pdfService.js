@@ -6,10 +6,25 @@ import { ApiClient } from '../../core/api/client.js';
 import { ENDPOINTS } from '../../config/endpoints.js';
 import { loading } from '../../core/ui/loading.js';
 import { notifications } from '../../core/ui/notifications.js';
+import { parseServerTiming } from '../../core/utils/helpers.js';
 
 class PdfService {
     constructor() {
         this.client = new ApiClient();
+        this.lastServerTiming = {};
+    }
+
+    /**
+     * Record the server-side stage breakdown (Server-Timing header) of a response
+     */
+    recordServerTiming(response) {
+        this.lastServerTiming = parseServerTiming(response.headers.get('Server-Timing'));
+
+        if (Object.keys(this.lastServerTiming).length > 0) {
+            console.debug('PDF server timing (ms):', this.lastServerTiming);
+        }
+
+        return this.lastServerTiming;
     }
 
     async generatePdf(data) {
@@ -26,6 +41,8 @@ class PdfService {
                 }
             );
 
+            this.recordServerTiming(response);
+
             if (!response.ok) {
                 throw new Error('Erreur lors de la génération du PDF');
             }
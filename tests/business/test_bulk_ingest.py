@@ -0,0 +1,165 @@
+"""
+Bulk Ingestion Tests - HIGH Priority (Business Logic)
+
+Tests for multi-person CSV exports including:
+- Grouping rows of several files by person id
+- File order kept within a person
+- Spilling sorted runs to disk for large files
+- Per-person post-processing (consultant missions)
+- Missing id column, rows without an id and byte order marks
+- One PDF per person
+"""
+
+import pytest
+import os
+import sys
+import csv
+import tempfile
+from unittest.mock import patch
+
+# Add backend to path
+backend_dir = os.path.join(os.path.dirname(__file__), '..', '..', 'backend')
+sys.path.insert(0, os.path.abspath(backend_dir))
+
+from bulk_ingest import iter_people, sort_by_person, generate_cvs
+
+
+def write_csv(directory, filename, header, rows, encoding='utf-8'):
+    path = os.path.join(directory, filename)
+    with open(path, 'w', encoding=encoding, newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(header)
+        writer.writerows(rows)
+    return path
+
+
+@pytest.fixture
+def agency_export(tmp_path):
+    """Export of three people whose rows are interleaved in every file."""
+    return [
+        write_csv(tmp_path, 'Profile.csv', ['Person Id', 'First Name', 'Last Name'], [
+            ['p2', 'Bob', 'Martin'],
+            ['p1', 'Alice', 'Durand'],
+            ['p3', 'Chloé', 'Petit'],
+        ]),
+        write_csv(tmp_path, 'Positions.csv', ['Person Id', 'Company Name', 'Title', 'Description', 'Started On'], [
+            ['p1', 'Zenika', 'Développeuse', 'Line one\nLine two, "quoted"', 'Jan 2020'],
+            ['p2', 'Octo', 'Architecte', '', 'Mar 2019'],
+            ['p1', 'Octo', 'Stagiaire', '', 'Jan 2018'],
+            ['p3', 'Sfeir', 'Tech Lead', '', 'Jun 2021'],
+        ]),
+        write_csv(tmp_path, 'Skills.csv', ['Name', 'Person Id'], [
+            ['Python', 'p3'],
+            ['React', 'p1'],
+            ['Go', 'p2'],
+            ['Docker', 'p1'],
+        ]),
+    ]
+
+
+class TestGrouping:
+    """Test grouping of multi-person files by person id."""
+
+    def test_one_dataset_per_person(self, agency_export):
+        """Test that each person gets their own rows from every file."""
+        people = dict(iter_people(agency_export))
+
+        assert list(people) == ['p1', 'p2', 'p3']
+        assert people['p1']['profile']['first_name'] == 'Alice'
+        assert [p['company'] for p in people['p1']['positions']] == ['Zenika', 'Octo']
+        assert people['p1']['skills'] == ['React', 'Docker']
+        assert people['p2']['skills'] == ['Go']
+        assert people['p3']['positions'][0]['title'] == 'Tech Lead'
+
+    def test_quoted_multiline_fields_kept(self, agency_export):
+        """Test that quoted fields with newlines and quotes survive grouping."""
+        people = dict(iter_people(agency_export))
+        assert people['p1']['positions'][0]['description'] == 'Line one\nLine two, "quoted"'
+
+    def test_lazy(self, agency_export):
+        """Test that people are produced one at a time."""
+        people = iter_people(agency_export)
+        person_id, data = next(people)
+        assert person_id == 'p1'
+        assert data['profile']['last_name'] == 'Durand'
+
+    def test_consultant_missions_merged_per_person(self, tmp_path):
+        """Test that parser post-processing runs on each person separately."""
+        positions = write_csv(tmp_path, 'Positions.csv',
+                              ['Person Id', 'Company Name', 'Title', 'Description', 'Started On', 'Finished On'], [
+            ['p1', 'Zenika', 'Consultant', '', 'Jan 2020', ''],
+            ['p2', 'Zenika', 'Consultant', '', 'Jan 2020', ''],
+            ['p1', 'Zenika', 'Dev @ Aircall', 'Long mission description', 'Mar 2021', 'Dec 2022'],
+        ])
+        people = dict(iter_people([positions]))
+
+        assert people['p1']['positions'][0]['missions'][0]['client'] == 'Aircall'
+        assert 'missions' not in people['p2']['positions'][0]
+
+    def test_unsupported_files_skipped(self, agency_export, tmp_path):
+        """Test that files the parser does not know are ignored."""
+        other = write_csv(tmp_path, 'Badges.csv', ['Person Id', 'Badge'], [['p1', 'Gold']])
+        assert [person_id for person_id, _ in iter_people(agency_export + [other])] == ['p1', 'p2', 'p3']
+
+
+class TestSpilling:
+    """Test bounded-memory sorting of large files."""
+
+    def test_spilled_runs_give_same_result(self, agency_export):
+        """Test that sorting through temporary runs matches the in-memory sort."""
+        with patch('bulk_ingest.tempfile.TemporaryFile', wraps=tempfile.TemporaryFile) as spill:
+            spilled = list(iter_people(agency_export, chunk_rows=1))
+        assert spill.call_count == 11  # one run per row
+
+        assert spilled == list(iter_people(agency_export))
+
+    def test_sort_is_stable(self):
+        """Test that rows of one person keep their input order across runs."""
+        items = [(person_id, {'n': str(n)}) for n, person_id in enumerate('bababcab')]
+        result = list(sort_by_person(iter(items), chunk_rows=3))
+
+        assert [person_id for person_id, _ in result] == list('aaabbbbc')
+        assert [row['n'] for person_id, row in result if person_id == 'b'] == ['0', '2', '4', '7']
+
+
+class TestInvalidInput:
+    """Test handling of malformed exports."""
+
+    def test_missing_id_column(self, tmp_path):
+        """Test that a file without the id column is reported."""
+        path = write_csv(tmp_path, 'Skills.csv', ['Name'], [['Python']])
+        with pytest.raises(ValueError, match='Person Id'):
+            list(iter_people([path]))
+
+    def test_custom_id_column(self, tmp_path):
+        """Test that the id column name is configurable."""
+        path = write_csv(tmp_path, 'Skills.csv', ['Employee ID', 'Name'], [['42', 'Python']])
+        assert list(iter_people([path], id_column='Employee ID')) == [
+            ('42', {'profile': {}, 'positions': [], 'education': [], 'skills': ['Python'],
+                    'languages': [], 'certifications': []})
+        ]
+
+    def test_rows_without_id_skipped(self, tmp_path):
+        """Test that rows with an empty person id are dropped."""
+        path = write_csv(tmp_path, 'Skills.csv', ['Person Id', 'Name'], [['', 'Orphan'], ['p1', 'Python']])
+        assert [data['skills'] for _, data in iter_people([path])] == [['Python']]
+
+    def test_byte_order_mark(self, tmp_path):
+        """Test that a BOM before the id column (Excel exports) is ignored."""
+        path = write_csv(tmp_path, 'Skills.csv', ['Person Id', 'Name'], [['p1', 'Python']], encoding='utf-8-sig')
+        assert [(person_id, data['skills']) for person_id, data in iter_people([path])] == [('p1', ['Python'])]
+
+
+class TestGenerateCVs:
+    """Test rendering one PDF per person."""
+
+    def test_one_pdf_per_person(self, agency_export, tmp_path):
+        """Test that every person gets a PDF named after their id."""
+        output_dir = tmp_path / 'cvs'
+        results = list(generate_cvs(agency_export, str(output_dir), {'template': 'classic'}))
+
+        assert [person_id for person_id, _ in results] == ['p1', 'p2', 'p3']
+        for person_id, path in results:
+            assert os.path.basename(path) == f'CV_{person_id}.pdf'
+            with open(path, 'rb') as f:
+                assert f.read(5) == b'%PDF-'
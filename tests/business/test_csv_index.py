@@ -0,0 +1,141 @@
+"""
+CSV Row Index Tests - HIGH Priority (Business Logic)
+
+Tests for the per-person row-offset index of multi-person CSV files including:
+- Offsets of rows with quoted multi-line fields, CRLF endings and a BOM
+- Persisted index reused while the file is unchanged
+- Rebuild when the file changes or the index is corrupt
+- Reading one person's CV data through the indexes
+"""
+
+import pytest
+import os
+import sys
+import csv
+import json
+from unittest.mock import patch
+
+# Add backend to path
+backend_dir = os.path.join(os.path.dirname(__file__), '..', '..', 'backend')
+sys.path.insert(0, os.path.abspath(backend_dir))
+
+import csv_index
+from csv_index import CSVIndex, INDEX_SUFFIX
+from bulk_ingest import iter_people, person_data
+
+
+def write_csv(path, header, rows, lineterminator='\r\n', bom=False):
+    with open(path, 'w', encoding='utf-8-sig' if bom else 'utf-8', newline='') as f:
+        writer = csv.writer(f, lineterminator=lineterminator)
+        writer.writerow(header)
+        writer.writerows(rows)
+    return str(path)
+
+
+POSITIONS = [
+    ['p1', 'Zenika', 'Line one\nLine two, "quoted"\n\n'],
+    ['p2', 'Octo', 'Plain'],
+    ['p1', 'Sfeir', '"Starts quoted", then\r\ncontinues'],
+    ['p3', 'Ippon', ''],
+]
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    csv_index._cache.clear()
+    yield
+    csv_index._cache.clear()
+
+
+@pytest.fixture
+def positions_csv(tmp_path):
+    return write_csv(tmp_path / 'Positions.csv', ['Person Id', 'Company Name', 'Description'], POSITIONS)
+
+
+class TestBuild:
+    """Test row offsets found by scanning the file."""
+
+    @pytest.mark.parametrize('lineterminator, bom', [('\r\n', False), ('\n', False), ('\n', True)])
+    def test_rows_match_csv_reader(self, tmp_path, lineterminator, bom):
+        """Test that indexed rows equal what csv.DictReader reads, multi-line fields included."""
+        path = write_csv(tmp_path / 'Positions.csv', ['Person Id', 'Company Name', 'Description'],
+                         POSITIONS, lineterminator, bom)
+        index = CSVIndex.build(path, 'Person Id')
+
+        with open(path, encoding='utf-8-sig', newline='') as f:
+            expected = [row for row in csv.DictReader(f) if row.pop('Person Id') == 'p1']
+
+        assert index.person_ids() == ['p1', 'p2', 'p3']
+        assert index.rows('p1') == expected
+        assert index.rows('p1')[1]['Description'] == '"Starts quoted", then\r\ncontinues'
+        assert index.rows('unknown') == []
+
+    def test_no_trailing_newline(self, tmp_path):
+        """Test that a last row without a line break is indexed."""
+        path = tmp_path / 'Skills.csv'
+        path.write_text('Person Id,Name\np1,Python\np2,"Go"', encoding='utf-8')
+        assert CSVIndex.build(str(path), 'Person Id').rows('p2') == [{'Name': 'Go'}]
+
+    def test_missing_id_column(self, tmp_path):
+        """Test that a file without the id column is reported."""
+        path = write_csv(tmp_path / 'Skills.csv', ['Name'], [['Python']])
+        with pytest.raises(ValueError, match='Person Id'):
+            CSVIndex.build(path, 'Person Id')
+
+
+class TestPersistence:
+    """Test the index saved next to the file."""
+
+    def test_saved_and_reused(self, positions_csv):
+        """Test that a second open reads the saved index instead of scanning."""
+        CSVIndex.open(positions_csv, 'Person Id')
+        assert os.path.exists(positions_csv + INDEX_SUFFIX)
+
+        csv_index._cache.clear()
+        with patch.object(CSVIndex, 'build') as build:
+            index = CSVIndex.open(positions_csv, 'Person Id')
+        build.assert_not_called()
+        assert [row['Company Name'] for row in index.rows('p1')] == ['Zenika', 'Sfeir']
+
+    def test_rebuilt_when_file_changes(self, positions_csv):
+        """Test that a modified file is scanned again."""
+        assert CSVIndex.open(positions_csv, 'Person Id').rows('p4') == []
+
+        with open(positions_csv, 'a', encoding='utf-8', newline='') as f:
+            csv.writer(f).writerow(['p4', 'Xebia', 'New hire'])
+
+        assert CSVIndex.open(positions_csv, 'Person Id').rows('p4') == [
+            {'Company Name': 'Xebia', 'Description': 'New hire'}
+        ]
+        with open(positions_csv + INDEX_SUFFIX, encoding='utf-8') as f:
+            assert 'p4' in json.load(f)['offsets']
+
+    def test_corrupt_index_rebuilt(self, positions_csv):
+        """Test that an unreadable index file is replaced."""
+        with open(positions_csv + INDEX_SUFFIX, 'w', encoding='utf-8') as f:
+            f.write('{not json')
+        assert len(CSVIndex.open(positions_csv, 'Person Id').rows('p1')) == 2
+
+    def test_other_id_column_not_reused(self, tmp_path):
+        """Test that an index built for another id column is not used."""
+        path = write_csv(tmp_path / 'Skills.csv', ['Person Id', 'Team', 'Name'], [['p1', 't1', 'Python']])
+        CSVIndex.open(path, 'Person Id')
+        csv_index._cache.clear()
+
+        assert CSVIndex.open(path, 'Team').person_ids() == ['t1']
+
+
+class TestPersonData:
+    """Test regenerating one person's data through the indexes."""
+
+    def test_same_data_as_full_scan(self, positions_csv, tmp_path):
+        """Test that indexed reads give the same CV data as the bulk pipeline."""
+        skills = write_csv(tmp_path / 'Skills.csv', ['Name', 'Person Id'], [['Go', 'p2'], ['React', 'p1']])
+        paths = [positions_csv, skills]
+
+        assert person_data(paths, 'p1') == dict(iter_people(paths))['p1']
+
+    def test_unknown_person(self, positions_csv):
+        """Test that a person without rows is reported."""
+        with pytest.raises(KeyError):
+            person_data([positions_csv], 'nobody')
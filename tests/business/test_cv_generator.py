@@ -8,12 +8,16 @@ Tests for PDF CV generation functionality including:
 - Section generation
 - Layout and styling
 - Pagination
+- Deterministic output
 - Error handling
 """
 
 import pytest
 import os
+import re
 import sys
+import json
+import subprocess
 import tempfile
 from unittest.mock import patch, MagicMock
 from io import BytesIO
@@ -407,6 +411,403 @@ class TestPagination:
             os.remove(pdf_path)
 
 
+class TestKeepTogetherPolicy:
+    """Test that only blocks fitting on a page are kept together."""
+
+    def _consultant_data(self, mission_description):
+        return {
+            "profile": {"first_name": "John", "last_name": "Doe"},
+            "positions": [{
+                "company": "ESN",
+                "title": "Consultant",
+                "duration": "2018 - 2024",
+                "missions": [
+                    {"client": f"Client {i}", "title": "Developer", "description": mission_description}
+                    for i in range(4)
+                ]
+            }]
+        }
+
+    def test_missions_kept_together_separately(self):
+        """Test that a long consultant position is split into per-mission blocks."""
+        from cv_generator import MeasuredKeepTogether
+
+        generator = CVGenerator(self._consultant_data("Long mission description " * 150))
+        blocks = [f for f in generator._build_experience() if isinstance(f, MeasuredKeepTogether)]
+
+        # Header + first mission, then one block per following mission
+        assert len(blocks) == 4
+        assert 'EXPÉRIENCE' in blocks[0]._content[0].text
+
+    def test_block_taller_than_page_flows(self):
+        """Test that a mission taller than a page is not wrapped in KeepTogether."""
+        from reportlab.platypus import KeepTogether
+
+        generator = CVGenerator(self._consultant_data("Very long mission description " * 1500))
+        elements = generator._build_experience()
+
+        assert not any(isinstance(f, KeepTogether) for f in elements)
+
+    def test_short_section_kept_whole(self, mock_parsed_data):
+        """Test that a section fitting on a page stays in a single block."""
+        generator = CVGenerator(mock_parsed_data)
+        assert len(generator._build_education()) == 1
+
+    def test_measured_height_matches_reportlab(self, mock_parsed_data):
+        """Test that the stacked height matches KeepTogether's own measurement."""
+        from reportlab.platypus import KeepTogether
+
+        generator = CVGenerator(mock_parsed_data)
+        block = generator._build_experience()[0]
+        width, _ = generator._frame_size()
+
+        expected = KeepTogether(block._content)
+        expected.wrapOn(None, width, 10000)
+        assert block._measured[1] == pytest.approx(expected._H)
+
+    def test_long_consultant_cv_renders(self):
+        """Test that a multi-page consultant CV renders."""
+        generator = CVGenerator(self._consultant_data("Long mission description " * 400))
+        buffer = BytesIO()
+        generator.render(buffer)
+        assert buffer.getvalue().startswith(b'%PDF')
+
+
+class TestSkillsGrid:
+    """Test the skills grid flowable."""
+
+    def _former_table(self, labels, style, num_cols):
+        """Build the Table of Paragraphs the grid replaces."""
+        from reportlab.platypus import Paragraph, Table, TableStyle
+        from reportlab.lib.units import mm
+
+        rows = []
+        for i in range(0, len(labels), num_cols):
+            rows.append([Paragraph(labels[i + j], style) if i + j < len(labels) else Paragraph("", style)
+                         for j in range(num_cols)])
+        table = Table(rows, colWidths=[170*mm/num_cols]*num_cols)
+        table.setStyle(TableStyle([
+            ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+            ('LEFTPADDING', (0, 0), (-1, -1), 0),
+            ('RIGHTPADDING', (0, 0), (-1, -1), 5),
+            ('TOPPADDING', (0, 0), (-1, -1), 1),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 1),
+        ]))
+        return table
+
+    def test_size_matches_former_table(self):
+        """Test that the grid has the size of the former table, including wrapped labels."""
+        from flowables import SkillsGrid
+        from reportlab.lib.units import mm
+
+        generator = CVGenerator({"profile": {}})
+        style = generator.styles['SkillItem']
+        labels = [f"- Skill {i}" for i in range(20)] + ["- A very long skill name that has to wrap onto two lines"]
+
+        grid = SkillsGrid(labels, style, 3, 170*mm/3)
+        assert grid.wrap(470, 1000) == pytest.approx(self._former_table(labels, style, 3).wrap(470, 1000))
+
+    def test_splits_between_rows(self):
+        """Test that the grid splits across pages at row boundaries."""
+        from flowables import SkillsGrid
+
+        generator = CVGenerator({"profile": {}})
+        grid = SkillsGrid([f"- Skill {i}" for i in range(30)], generator.styles['SkillItem'], 3, 150)
+        _, height = grid.wrap(450, 1000)
+
+        first, rest = grid.split(450, height / 2)
+        assert len(first.rows) + len(rest.rows) == 10
+        assert first.wrap(450, 1000)[1] <= height / 2
+        assert grid.split(450, 1) == []
+
+    def test_many_skills_render(self):
+        """Test that hundreds of skills render across pages."""
+        data = {"profile": {"first_name": "John"}, "skills": [f"Skill {i}" for i in range(600)]}
+        buffer = BytesIO()
+        CVGenerator(data).render(buffer)
+        assert buffer.getvalue().startswith(b'%PDF')
+
+
+class TestPlainLine:
+    """Test the single-line text fast path."""
+
+    def test_plain_label_uses_fast_path(self):
+        """Test that plain text becomes a PlainLine and markup a Paragraph."""
+        from flowables import text_line, PlainLine
+        from reportlab.platypus import Paragraph
+
+        style = CVGenerator({"profile": {}}).styles['Company']
+        assert isinstance(text_line("Tech Corp", style), PlainLine)
+        assert isinstance(text_line("R&D <i>Labs</i>", style), Paragraph)
+
+    def test_size_matches_paragraph(self):
+        """Test that a PlainLine has the size of the equivalent one-line Paragraph."""
+        from flowables import text_line
+        from reportlab.platypus import Paragraph
+
+        styles = CVGenerator({"profile": {}}).styles
+        for text, style in [("Tech  Corp", 'Company'), ("2020 - 2023 | Paris", 'DateLocation'),
+                            ("→ Mission chez Client", 'MissionClient')]:
+            line = text_line(text, styles[style])
+            assert line.wrap(450, 1000) == Paragraph(text, styles[style]).wrap(450, 1000)
+
+    def test_bold_prefix_matches_paragraph(self):
+        """Test that language lines measure like '<b>name</b> - proficiency'."""
+        from flowables import text_line
+        from reportlab.platypus import Paragraph
+
+        style = CVGenerator({"profile": {}}).styles['SkillItem']
+        line = text_line(" - Native", style, bold_prefix="English")
+        assert line.text == " - Native"
+        assert line.wrap(450, 1000) == Paragraph("<b>English</b> - Native", style).wrap(450, 1000)
+
+    def test_long_text_falls_back_to_paragraph(self):
+        """Test that text wider than the frame wraps like a Paragraph."""
+        from flowables import text_line
+        from reportlab.platypus import Paragraph
+
+        style = CVGenerator({"profile": {}}).styles['JobTitle']
+        text = "Very long job title " * 20
+        line = text_line(text, style)
+
+        assert line.wrap(450, 1000) == Paragraph(text, style).wrap(450, 1000)
+        assert line.height > style.leading
+
+    def test_cv_with_plain_lines_renders(self, mock_parsed_data):
+        """Test that a CV with plain labels renders."""
+        buffer = BytesIO()
+        CVGenerator(mock_parsed_data).render(buffer)
+        assert buffer.getvalue().startswith(b'%PDF')
+
+
+class TestRenderEngines:
+    """Test engine selection and the direct-canvas engine against platypus."""
+
+    def _long_cv(self, photo=None, headline="Consultant"):
+        """CV spanning several pages, with hard line breaks, bullets and splits."""
+        description = " n ".join(
+            f"- Item {i}: " + "delivered features and reviewed code with the team " * (i % 4 + 1)
+            for i in range(12)
+        ) + " nn Closing paragraph. " + "Long running work on the platform. " * 30
+        return {
+            "profile": {"first_name": "John", "last_name": "Doe", "headline": headline,
+                        "email": "john@example.com", "phone": "+33 1 23", "address": "Paris",
+                        "summary": "Summary text. " * 40},
+            "photo": photo,
+            "positions": [{
+                "company": f"Company {p}", "title": "Consultant", "duration": "2018 - 2024",
+                "location": "Paris", "description": description,
+                "missions": [{"client": f"Client {m}", "title": "Developer", "description": description}
+                             for m in range(3)]
+            } for p in range(3)],
+            "education": [{"school": "University", "degree": "MSc", "start_date": "2010", "end_date": "2012"}],
+            "skills": [f"Skill {i}" for i in range(40)],
+            "languages": [{"name": "English", "proficiency": "Native"}],
+            "certifications": [{"name": "Cert", "authority": "Authority", "start_date": "2020"}]
+        }
+
+    def _text_placements(self, pdf):
+        """Absolute position and content of every string drawn, per page."""
+        import re
+
+        token = re.compile(rb'\((?:\\.|[^\\)])*\)|[^\s()]+')
+        pages = []
+        for stream in re.findall(rb'stream\r?\n(.*?)endstream', pdf, re.S):
+            if b' Tj' not in stream:
+                continue
+            placements, stack, operands = [], [], []
+            origin = line = (0, 0)
+            leading = 0
+            for tok in token.findall(stream):
+                if tok[:1] in b'(/' or re.fullmatch(rb'-?[\d.]+', tok):
+                    operands.append(tok)
+                    continue
+                if tok == b'q':
+                    stack.append(origin)
+                elif tok == b'Q':
+                    origin = stack.pop()
+                elif tok == b'cm':
+                    origin = (origin[0] + float(operands[-2]), origin[1] + float(operands[-1]))
+                elif tok == b'Tm':
+                    line = (float(operands[-2]), float(operands[-1]))
+                elif tok == b'Td':
+                    line = (line[0] + float(operands[-2]), line[1] + float(operands[-1]))
+                elif tok == b'TL':
+                    leading = float(operands[-1])
+                elif tok == b'T*':
+                    line = (line[0], line[1] - leading)
+                elif tok == b'Tj':
+                    placements.append((round(origin[0] + line[0], 1), round(origin[1] + line[1], 1), operands[-1]))
+                operands = []
+            pages.append(placements)
+        return pages
+
+    def _render(self, data, config):
+        from reportlab import rl_config
+
+        buffer = BytesIO()
+        with patch.object(rl_config, 'pageCompression', 0):
+            CVGenerator(data, config).render(buffer)
+        return buffer.getvalue()
+
+    def test_default_engine_is_platypus(self, mock_parsed_data):
+        """Test that the platypus engine is used unless another one is configured."""
+        from cv_generator import get_render_engine, PlatypusEngine
+
+        assert CVGenerator(mock_parsed_data).engine == 'platypus'
+        assert isinstance(get_render_engine('unknown'), PlatypusEngine)
+
+    def test_canvas_engine_falls_back_for_other_templates(self, mock_parsed_data):
+        """Test that templates the canvas engine does not draw are rendered by platypus."""
+        from cv_generator import PlatypusEngine
+
+        with patch.object(PlatypusEngine, 'render') as platypus_render:
+            CVGenerator(mock_parsed_data, {'engine': 'canvas', 'template': 'classic'}).render(BytesIO())
+        platypus_render.assert_called_once()
+
+    def test_canvas_engine_renders(self, mock_parsed_data):
+        """Test that the canvas engine produces a PDF without building a story."""
+        generator = CVGenerator(mock_parsed_data, {'engine': 'canvas'})
+        buffer = BytesIO()
+        with patch.object(CVGenerator, '_build_story') as build_story:
+            generator.render(buffer)
+
+        build_story.assert_not_called()
+        assert buffer.getvalue().startswith(b'%PDF')
+
+    @pytest.mark.parametrize('headline', [
+        "Consultant",
+        "Senior Software Engineer and Technical Lead, Cloud Architecture, Data Platforms and DevOps Coaching"
+    ])
+    @pytest.mark.parametrize('with_photo', [False, True])
+    def test_canvas_matches_platypus(self, with_photo, headline, mock_base64_image):
+        """Test that both engines draw the same text at the same place on the same pages."""
+        data = self._long_cv(photo=f"data:image/png;base64,{mock_base64_image}" if with_photo else None,
+                             headline=headline)
+
+        platypus = self._text_placements(self._render(data, {'engine': 'platypus'}))
+        canvas = self._text_placements(self._render(data, {'engine': 'canvas'}))
+
+        assert len(platypus) > 3
+        assert len(canvas) == len(platypus)
+        for expected, actual in zip(platypus, canvas):
+            assert [text for _, _, text in actual] == [text for _, _, text in expected]
+            for (x, y, _), (ex, ey, _) in zip(actual, expected):
+                assert x == pytest.approx(ex, abs=0.5)
+                assert y == pytest.approx(ey, abs=0.5)
+
+    def test_justified_lines_split_across_pages(self):
+        """Test that a text item splits between lines and keeps Paragraph's break continuation."""
+        from canvas_engine import TextItem
+
+        style = CVGenerator({"profile": {}}).styles['Description']
+        item = TextItem("word " * 400 + "<br/>end", style, 450)
+        lines = len(item.lines)
+
+        head, tail = item.split(style.leading * 5)
+        assert len(head.lines) == 5
+        assert len(tail.lines) == lines - 5
+        assert item.split(style.leading) == []
+
+        # Like Paragraph, a continuation after a hard break starts with an empty line
+        _, tail = TextItem("one<br/>two<br/>three", style, 450).split(style.leading * 2)
+        assert [words for words, _ in tail.lines] == [[], ['three']]
+
+
+# Renders a payload read from stdin and prints the PDF bytes as hex
+RENDER_SCRIPT = """
+import json, sys
+from io import BytesIO
+sys.path.insert(0, sys.argv[1])
+from cv_generator import CVGenerator
+payload = json.load(sys.stdin)
+output = BytesIO()
+CVGenerator(payload['data'], payload['config']).render(output)
+print(output.getvalue().hex())
+"""
+
+
+def render_in_subprocess(data, config, hash_seed):
+    """PDF bytes rendered by a fresh interpreter"""
+    result = subprocess.run(
+        [sys.executable, '-c', RENDER_SCRIPT, os.path.abspath(backend_dir)],
+        input=json.dumps({'data': data, 'config': config}),
+        capture_output=True, text=True, check=True,
+        env=dict(os.environ, PYTHONHASHSEED=str(hash_seed)),
+    )
+    return bytes.fromhex(result.stdout.strip())
+
+
+def render_bytes(data, config):
+    output = BytesIO()
+    CVGenerator(data, config).render(output)
+    return output.getvalue()
+
+
+def pdf_ids(pdf):
+    return re.search(rb'/ID\s*\[(.*?)\]', pdf, re.S).group(1)
+
+
+class TestDeterministicOutput:
+    """Test the byte-identical output mode."""
+
+    @pytest.mark.parametrize('config', [
+        {'deterministic': True},
+        {'deterministic': True, 'engine': 'canvas'},
+        {'deterministic': True, 'template': 'classic', 'font': 'Vera'},
+    ])
+    def test_identical_bytes_across_processes(self, mock_parsed_data, mock_base64_image, config):
+        """Test that identical inputs render to identical bytes in separate processes."""
+        data = dict(mock_parsed_data, photo=f"data:image/png;base64,{mock_base64_image}")
+
+        first = render_in_subprocess(data, config, hash_seed=1)
+        second = render_in_subprocess(data, config, hash_seed=2)
+
+        assert first.startswith(b'%PDF')
+        assert first == second
+        assert render_bytes(data, config) == first
+
+    def test_disabled_by_default(self, mock_parsed_data):
+        """Test that renders carry their real creation date unless deterministic is set."""
+        assert CVGenerator(mock_parsed_data).deterministic is False
+        pdf = render_bytes(mock_parsed_data, {})
+        assert b"D:2000" not in pdf
+
+    def test_only_boolean_enables(self, mock_parsed_data):
+        """Test that a non-boolean deterministic value (e.g. the string "false") keeps the default."""
+        assert CVGenerator(mock_parsed_data, {'deterministic': 'false'}).deterministic is False
+        assert CVGenerator(mock_parsed_data, {'deterministic': True}).deterministic is True
+
+    def test_fixed_creation_date(self, mock_parsed_data):
+        """Test that the creation date is fixed, or taken from config.creation_date."""
+        assert b"(D:20000101000000+00'00')" in render_bytes(mock_parsed_data, {'deterministic': True})
+
+        pdf = render_bytes(mock_parsed_data, {'deterministic': True, 'creation_date': '2024-03-15T09:30:00+01:00'})
+        assert b"(D:20240315083000+00'00')" in pdf
+
+    def test_document_id_derived_from_payload(self, mock_parsed_data):
+        """Test that the document ID is stable per payload and differs between CVs."""
+        config = {'deterministic': True}
+        other = dict(mock_parsed_data, profile=dict(mock_parsed_data['profile'], first_name='Jane'))
+
+        assert pdf_ids(render_bytes(mock_parsed_data, config)) == pdf_ids(render_bytes(mock_parsed_data, config))
+        assert pdf_ids(render_bytes(mock_parsed_data, config)) != pdf_ids(render_bytes(other, config))
+
+    def test_prepared_variants_match_direct_render(self, mock_parsed_data, mock_base64_image):
+        """Test that multi-variant renders produce the same bytes as direct renders, photo included."""
+        from variants import render_variants
+
+        data = dict(mock_parsed_data, photo=f"data:image/png;base64,{mock_base64_image}")
+        config = {'deterministic': True, 'template': 'classic'}
+        assert render_variants(data, [config]) == [render_bytes(data, config)]
+
+    def test_document_id_covers_photo(self, mock_parsed_data, mock_base64_image):
+        """Test that CVs differing only by their photo get different document IDs."""
+        config = {'deterministic': True}
+        with_photo = dict(mock_parsed_data, photo=f"data:image/png;base64,{mock_base64_image}")
+        assert pdf_ids(render_bytes(with_photo, config)) != pdf_ids(render_bytes(mock_parsed_data, config))
+
+
 class TestStyling:
     """Test PDF styling."""
 
@@ -18,6 +18,15 @@ sys.path.insert(0, os.path.abspath(backend_dir))
 from app import app as flask_app
 
 
+def pytest_addoption(parser):
+    """Register project-specific ini options."""
+    parser.addini(
+        'import_time_budget_ms',
+        help='Maximum cumulative import time of the backend app module, in milliseconds',
+        default='1500'
+    )
+
+
 @pytest.fixture
 def app():
     """Create Flask app instance for testing."""
@@ -0,0 +1,205 @@
+"""
+Admission Control Tests - HIGH Priority
+
+Tests for bounded parse/render concurrency including:
+- Concurrency limit with a bounded wait queue
+- Rejection when the queue is full or the wait times out
+- Retry-After estimated from recent service times
+- Requests holding several slots (variant renders)
+- 503 responses and queue metrics
+"""
+
+import pytest
+import os
+import sys
+import threading
+import time
+from unittest.mock import patch
+
+# Add backend to path
+backend_dir = os.path.join(os.path.dirname(__file__), '..', '..', 'backend')
+sys.path.insert(0, os.path.abspath(backend_dir))
+
+from admission import AdmissionController, Overloaded, ADMISSION_REJECTIONS, ADMISSION_QUEUE_DEPTH
+
+
+def hold_slot(controller, release):
+    """Occupy a slot from another thread until `release` is set; returns once admitted"""
+    admitted = threading.Event()
+
+    def worker():
+        with controller.admit():
+            admitted.set()
+            release.wait(5)
+
+    thread = threading.Thread(target=worker)
+    thread.start()
+    assert admitted.wait(5)
+    return thread
+
+
+def wait_for_queue(controller, depth):
+    deadline = time.time() + 5
+    while controller._waiting < depth and time.time() < deadline:
+        time.sleep(0.001)
+
+
+class TestAdmissionController:
+    """Test concurrency limiting and queueing."""
+
+    def test_disabled_without_limit(self):
+        """Test that a limit of 0 admits everything."""
+        controller = AdmissionController('test', limit=0)
+        with controller.admit(), controller.admit():
+            pass
+
+    def test_queued_request_admitted_when_slot_frees(self):
+        """Test that a request over the limit waits for a slot instead of failing."""
+        controller = AdmissionController('test', limit=1, queue_size=1, queue_timeout=5)
+        release = threading.Event()
+        holder = hold_slot(controller, release)
+
+        admitted = []
+
+        def wait_for_slot():
+            with controller.admit():
+                admitted.append(True)
+
+        waiter = threading.Thread(target=wait_for_slot)
+        waiter.start()
+        wait_for_queue(controller, 1)
+        assert admitted == []
+
+        release.set()
+        holder.join()
+        waiter.join(5)
+        assert admitted == [True]
+
+    def test_full_queue_rejected(self):
+        """Test that requests beyond the queue are rejected immediately."""
+        controller = AdmissionController('test-full', limit=1, queue_size=0)
+        release = threading.Event()
+        holder = hold_slot(controller, release)
+        try:
+            rejected_before = ADMISSION_REJECTIONS.get('test-full', 'queue_full')
+            start = time.perf_counter()
+            with pytest.raises(Overloaded) as excinfo:
+                with controller.admit():
+                    pass
+            assert time.perf_counter() - start < 1
+            assert excinfo.value.reason == 'queue_full'
+            assert ADMISSION_REJECTIONS.get('test-full', 'queue_full') == rejected_before + 1
+        finally:
+            release.set()
+            holder.join()
+
+    def test_wait_times_out(self):
+        """Test that a queued request gives up after the queue timeout."""
+        controller = AdmissionController('test-timeout', limit=1, queue_size=1, queue_timeout=0.05)
+        release = threading.Event()
+        holder = hold_slot(controller, release)
+        try:
+            with pytest.raises(Overloaded) as excinfo:
+                with controller.admit():
+                    pass
+            assert excinfo.value.reason == 'timeout'
+            assert ADMISSION_QUEUE_DEPTH.get('test-timeout') == 0
+        finally:
+            release.set()
+            holder.join()
+
+    def test_retry_after_from_service_times(self):
+        """Test that Retry-After spreads the backlog's recent service time over the slots."""
+        controller = AdmissionController('test', limit=2, queue_size=0)
+        assert controller.retry_after() == 1
+
+        controller._service_times.extend([3.0, 5.0])
+        assert controller.retry_after() == 2
+
+        controller._service_times.extend([600.0] * 50)
+        assert controller.retry_after() == 60
+
+    def test_slot_released_on_error(self):
+        """Test that a failing request frees its slot."""
+        controller = AdmissionController('test', limit=1, queue_size=0)
+        with pytest.raises(ValueError):
+            with controller.admit():
+                raise ValueError('render failed')
+        with controller.admit():
+            pass
+
+    def test_multi_slot_request(self):
+        """Test that a request holding several slots leaves only the rest of the limit to others."""
+        controller = AdmissionController('test', limit=3, queue_size=0)
+        with controller.admit(slots=2):
+            with controller.admit():
+                with pytest.raises(Overloaded):
+                    with controller.admit():
+                        pass
+        assert controller._active == 0
+
+    def test_slots_capped_at_limit(self):
+        """Test that a request wanting more slots than the limit is still admitted alone."""
+        controller = AdmissionController('test', limit=2, queue_size=0)
+        with controller.admit(slots=5):
+            assert controller._active == 2
+
+
+class TestOverloadResponses:
+    """Test 503 responses from the API."""
+
+    def test_render_overload_returns_503(self, client, mock_parsed_data):
+        """Test that a render beyond the limit and queue gets 503 with Retry-After."""
+        import app as app_module
+
+        controller = app_module.render_admission
+        with patch.object(controller, 'limit', 1), patch.object(controller, 'queue_size', 0):
+            with controller.admit():
+                response = client.post('/api/generate-pdf', json=mock_parsed_data)
+
+        assert response.status_code == 503
+        assert int(response.headers['Retry-After']) >= 1
+        assert 'error' in response.get_json()
+
+    def test_variants_count_against_render_limit(self, client, mock_parsed_data):
+        """Test that variant renders need one render slot per variant rendered at once."""
+        import app as app_module
+
+        controller = app_module.render_admission
+        payload = dict(mock_parsed_data, configs=[{'template': 'modern'}, {'template': 'classic'}])
+        with patch.object(controller, 'limit', 2), patch.object(controller, 'queue_size', 0), \
+                patch.object(app_module, 'VARIANT_WORKERS', 2):
+            with controller.admit():
+                response = client.post('/api/generate-variants', json=payload)
+
+        assert response.status_code == 503
+
+    def test_estimate_counts_against_render_limit(self, client, mock_parsed_data):
+        """Test that page estimates wait for render slots too."""
+        import app as app_module
+
+        controller = app_module.render_admission
+        with patch.object(controller, 'limit', 1), patch.object(controller, 'queue_size', 0):
+            with controller.admit():
+                response = client.post('/api/estimate', json=mock_parsed_data)
+
+        assert response.status_code == 503
+        assert int(response.headers['Retry-After']) >= 1
+
+    def test_parse_and_render_limits_independent(self, client, mock_parsed_data):
+        """Test that busy parse slots do not block renders."""
+        import app as app_module
+
+        controller = app_module.parse_admission
+        with patch.object(controller, 'limit', 1), patch.object(controller, 'queue_size', 0):
+            with controller.admit():
+                response = client.post('/api/generate-pdf', json=mock_parsed_data)
+
+        assert response.status_code == 200
+
+    def test_metrics_exposed(self, client):
+        """Test that queue depth and rejections appear on /api/metrics."""
+        response = client.get('/api/metrics')
+        body = response.data.decode()
+        assert 'cv_admission_queue_depth' in body
+        assert 'cv_admission_rejections_total' in body
@@ -238,6 +238,29 @@ class TestGeneratePDFEndpoint:
         assert response.status_code == 200
         assert 'attachment' in response.headers.get('Content-Disposition', '')
 
+    def test_deterministic_pdf_revalidation(self, client, mock_parsed_data):
+        """Test that deterministic PDFs carry a content ETag honoured by If-None-Match."""
+        payload = dict(mock_parsed_data, config={'deterministic': True})
+
+        first = client.post('/api/generate-pdf', json=payload)
+        second = client.post('/api/generate-pdf', json=payload)
+        assert first.headers['ETag'] == second.headers['ETag']
+        assert first.data == second.data
+
+        revalidated = client.post('/api/generate-pdf', json=payload,
+                                  headers={'If-None-Match': first.headers['ETag']})
+        assert revalidated.status_code == 304
+
+    @pytest.mark.parametrize('config', [
+        {'deterministic': 'false'},
+        {'deterministic': 1},
+        {'deterministic': True, 'creation_date': 'nope'}
+    ])
+    def test_invalid_deterministic_config_rejected(self, client, mock_parsed_data, config):
+        """Test that non-boolean deterministic flags and unparseable creation dates get a 400."""
+        response = client.post('/api/generate-pdf', json=dict(mock_parsed_data, config=config))
+        assert response.status_code == 400
+
     @patch('app.CVGenerator')
     def test_generator_error_returns_500(self, mock_generator, client, mock_parsed_data):
         """Test that generator errors return 500."""
@@ -0,0 +1,224 @@
+"""
+Artifact Store Tests - HIGH Priority
+
+Tests for the generated PDF store (cv/) including:
+- Atomic writes through a temporary file
+- Content-hash deduplication with hardlinks
+- TTL expiry and LRU eviction under size/count caps
+- Background janitor thread
+- Admin-only /api/debug/artifacts endpoint
+"""
+
+import pytest
+import os
+import sys
+import time
+from unittest.mock import patch
+
+# Add backend to path
+backend_dir = os.path.join(os.path.dirname(__file__), '..', '..', 'backend')
+sys.path.insert(0, os.path.abspath(backend_dir))
+
+from artifact_store import ArtifactStore, OBJECTS_DIR
+
+
+def writer(content):
+    """render() stand-in writing fixed bytes"""
+    def render(path):
+        with open(path, 'wb') as f:
+            f.write(content)
+    return render
+
+
+def age(path, seconds):
+    """Mark a stored PDF (and every name sharing its content) as last used `seconds` ago"""
+    used = time.time() - seconds
+    os.utime(path, (used, used))
+
+
+@pytest.fixture
+def store(tmp_path):
+    return ArtifactStore(str(tmp_path))
+
+
+class TestAtomicWrites:
+    """Test that PDFs only appear once fully written."""
+
+    def test_render_targets_temporary_file(self, store, tmp_path):
+        """Test that the renderer writes elsewhere and the PDF is moved into place."""
+        seen = []
+
+        def render(path):
+            seen.append(path)
+            assert not os.path.exists(tmp_path / 'cv.pdf')
+            writer(b'%PDF-1')(path)
+
+        path = store.save('cv.pdf', render)
+
+        assert path == str(tmp_path / 'cv.pdf')
+        assert seen[0] != path
+        assert open(path, 'rb').read() == b'%PDF-1'
+
+    def test_failed_render_leaves_nothing(self, store, tmp_path):
+        """Test that a render error leaves no partial or temporary file."""
+        def render(path):
+            writer(b'%PDF-partial')(path)
+            raise RuntimeError('render failed')
+
+        with pytest.raises(RuntimeError):
+            store.save('cv.pdf', render)
+
+        assert not os.path.exists(tmp_path / 'cv.pdf')
+        assert os.listdir(tmp_path / OBJECTS_DIR) == []
+
+
+class TestDeduplication:
+    """Test content-hash deduplication."""
+
+    def test_identical_content_shares_inode(self, store):
+        """Test that identical PDFs are hardlinks to one stored content."""
+        first = store.save('a.pdf', writer(b'%PDF-same'))
+        second = store.save('b.pdf', writer(b'%PDF-same'))
+        other = store.save('c.pdf', writer(b'%PDF-other'))
+
+        assert os.path.samefile(first, second)
+        assert not os.path.samefile(first, other)
+
+        stats = store.stats()
+        assert stats['files'] == 3
+        assert stats['unique_contents'] == 2
+        assert stats['bytes'] == len(b'%PDF-same') + len(b'%PDF-other')
+        assert stats['dedup_hits'] == 1
+
+    def test_same_name_replaced(self, store):
+        """Test that saving an existing name replaces it atomically."""
+        path = store.save('cv.pdf', writer(b'%PDF-1'))
+        store.save('cv.pdf', writer(b'%PDF-2'))
+        assert open(path, 'rb').read() == b'%PDF-2'
+
+    def test_deterministic_renders_deduplicated(self, mock_parsed_data, tmp_path):
+        """Test that generate() stores identical deterministic renders once."""
+        from cv_generator import CVGenerator
+
+        store = ArtifactStore(str(tmp_path))
+        with patch('cv_generator.get_store', return_value=store):
+            first = CVGenerator(mock_parsed_data, {'deterministic': True}).generate()
+            with patch('cv_generator.datetime') as clock:
+                clock.now.return_value.strftime.return_value = 'later'
+                second = CVGenerator(mock_parsed_data, {'deterministic': True}).generate()
+
+        assert first != second
+        assert os.path.samefile(first, second)
+
+
+class TestEviction:
+    """Test TTL expiry and LRU eviction."""
+
+    def test_expired_content_removed(self, tmp_path):
+        """Test that content unused for longer than the TTL is removed."""
+        store = ArtifactStore(str(tmp_path), ttl=3600)
+        old = store.save('old.pdf', writer(b'%PDF-old'))
+        recent = store.save('recent.pdf', writer(b'%PDF-recent'))
+        age(old, 7200)
+
+        store.sweep()
+
+        assert not os.path.exists(old)
+        assert os.path.exists(recent)
+        assert store.stats()['expired'] == 1
+
+    def test_lru_eviction_by_count(self, tmp_path):
+        """Test that least recently used content goes first when over the file cap."""
+        store = ArtifactStore(str(tmp_path), max_files=2)
+        paths = [store.save(f'{i}.pdf', writer(f'%PDF-{i}'.encode())) for i in range(3)]
+        for seconds, path in zip((30, 10, 20), paths):
+            age(path, seconds)
+
+        store.sweep()
+
+        assert [os.path.exists(path) for path in paths] == [False, True, True]
+
+    def test_lru_eviction_by_size_removes_all_names(self, tmp_path):
+        """Test that evicting content removes every name linked to it."""
+        store = ArtifactStore(str(tmp_path), max_bytes=150)
+        shared = [store.save(name, writer(b'x' * 100)) for name in ('a.pdf', 'b.pdf')]
+        newer = store.save('c.pdf', writer(b'y' * 100))
+        age(shared[0], 60)
+
+        store.sweep()
+
+        assert not any(os.path.exists(path) for path in shared)
+        assert os.path.exists(newer)
+        assert store.stats()['bytes'] == 100
+
+    def test_rewriting_content_marks_it_used(self, tmp_path):
+        """Test that saving content again refreshes its recency."""
+        store = ArtifactStore(str(tmp_path), max_files=2)
+        first = store.save('a.pdf', writer(b'%PDF-a'))
+        second = store.save('b.pdf', writer(b'%PDF-b'))
+        age(first, 60)
+        age(second, 30)
+        again = store.save('a2.pdf', writer(b'%PDF-a'))
+
+        store.sweep()
+
+        assert os.path.exists(first) and os.path.exists(again)
+        assert not os.path.exists(second)
+
+    def test_orphan_content_removed(self, store, tmp_path):
+        """Test that stored content whose PDFs were deleted is cleaned up."""
+        path = store.save('cv.pdf', writer(b'%PDF-1'))
+        age(path, 3600)
+        os.remove(path)
+
+        store.sweep()
+
+        assert os.listdir(tmp_path / OBJECTS_DIR) == []
+
+
+class TestJanitor:
+    """Test the background janitor thread."""
+
+    def test_wakes_when_over_caps(self, tmp_path):
+        """Test that a write over the caps triggers a sweep before the interval elapses."""
+        store = ArtifactStore(str(tmp_path), max_files=1, interval=3600)
+        store.start()
+        try:
+            first = store.save('a.pdf', writer(b'%PDF-a'))
+            age(first, 60)
+            store.save('b.pdf', writer(b'%PDF-b'))
+
+            deadline = time.time() + 5
+            while os.path.exists(first) and time.time() < deadline:
+                time.sleep(0.01)
+
+            assert not os.path.exists(first)
+            assert store.stats()['janitor_running']
+        finally:
+            store.stop()
+
+        assert not store.stats()['janitor_running']
+
+
+class TestArtifactsEndpoint:
+    """Test /api/debug/artifacts."""
+
+    def test_disabled_without_admin_token(self, client):
+        """Test that the endpoint does not exist when no admin token is configured."""
+        with patch('app.ADMIN_TOKEN', ''):
+            response = client.get('/api/debug/artifacts')
+        assert response.status_code == 404
+
+    def test_returns_stats(self, client, tmp_path):
+        """Test that admins get usage, caps and counters."""
+        store = ArtifactStore(str(tmp_path), max_files=10)
+        store.save('cv.pdf', writer(b'%PDF-1'))
+
+        with patch('app.ADMIN_TOKEN', 'secret'), patch('app.get_artifact_store', return_value=store):
+            response = client.get('/api/debug/artifacts', headers={'X-Admin-Token': 'secret'})
+
+        assert response.status_code == 200
+        stats = response.get_json()
+        assert stats['files'] == 1
+        assert stats['max_files'] == 10
+        assert stats['writes'] == 1
@@ -0,0 +1,120 @@
+"""
+Benchmark Tooling Tests - OPTIONAL Priority
+
+Tests for the benchmark support code including:
+- Deterministic synthetic LinkedIn exports (single and multi-person)
+- Baseline regression detection
+- tracemalloc stage measurement
+"""
+
+import os
+import sys
+
+# Add backend and benchmarks to path
+backend_dir = os.path.join(os.path.dirname(__file__), '..', '..', 'backend')
+benchmarks_dir = os.path.join(os.path.dirname(__file__), '..', '..', 'benchmarks')
+sys.path.insert(0, os.path.abspath(backend_dir))
+sys.path.insert(0, os.path.abspath(benchmarks_dir))
+
+from synthetic import build_export, write_export, write_agency_export, build_photo
+from common import compare_to_baseline
+from bench_memory import traced
+from linkedin_parser import LinkedInParser
+
+
+class TestSyntheticExports:
+    """Test synthetic LinkedIn export generation."""
+
+    def test_same_seed_same_export(self):
+        """Test that exports are deterministic for a given seed."""
+        assert build_export(50, seed=7) == build_export(50, seed=7)
+
+    def test_different_seed_different_export(self):
+        """Test that the seed changes the generated content."""
+        assert build_export(50, seed=7) != build_export(50, seed=8)
+
+    def test_position_count(self):
+        """Test that Positions.csv has the requested number of rows."""
+        _, rows = build_export(120)['Positions.csv']
+        assert len(rows) == 120
+
+    def test_export_parses_with_missions(self, temp_upload_dir):
+        """Test that the export is parsed into positions with consultant missions."""
+        data = LinkedInParser(write_export(temp_upload_dir, 100)).parse()
+
+        assert data['profile']['first_name'] == 'Camille'
+        assert data['positions']
+        assert any(position.get('missions') for position in data['positions'])
+        assert len(data['skills']) >= 20
+
+    def test_agency_export_groups_back_per_person(self, temp_upload_dir):
+        """Test that the multi-person export yields every person's own positions."""
+        from bulk_ingest import iter_people
+
+        people = list(iter_people(write_agency_export(temp_upload_dir, 5, positions=10)))
+
+        assert [person_id for person_id, _ in people] == [f'P{i:06d}' for i in range(5)]
+        assert all(data['profile']['first_name'] == 'Camille' and data['positions'] for _, data in people)
+
+    def test_photo_is_deterministic_data_url(self):
+        """Test that synthetic photos are deterministic PNG data URLs."""
+        photo = build_photo(16)
+        assert photo.startswith('data:image/png;base64,')
+        assert photo == build_photo(16)
+
+
+class TestBaselineComparison:
+    """Test regression detection against a baseline."""
+
+    def test_slowdown_over_threshold_reported(self):
+        """Test that a stage slower than the threshold is a regression."""
+        regressions = compare_to_baseline(
+            {'100': {'doc_build': 1.5}},
+            {'100': {'doc_build': 1.0}},
+            threshold_pct=20
+        )
+        assert regressions == [{
+            'case': '100', 'stage': 'doc_build', 'baseline': 1.0, 'current': 1.5, 'change_pct': 50.0
+        }]
+
+    def test_slowdown_within_threshold_ignored(self):
+        """Test that small slowdowns are tolerated."""
+        assert compare_to_baseline({'100': {'parse': 1.1}}, {'100': {'parse': 1.0}}, threshold_pct=20) == []
+
+    def test_min_delta_filters_noise(self):
+        """Test that tiny absolute slowdowns on short stages are ignored."""
+        regressions = compare_to_baseline(
+            {'10': {'parse': 0.002}},
+            {'10': {'parse': 0.001}},
+            threshold_pct=20,
+            min_delta=0.005
+        )
+        assert regressions == []
+
+    def test_missing_baseline_stage_ignored(self):
+        """Test that new stages or cases are not regressions."""
+        assert compare_to_baseline({'10': {'new_stage': 1.0}, '99': {'parse': 1.0}},
+                                   {'10': {}}, threshold_pct=20) == []
+
+
+class TestMemoryTracing:
+    """Test per-stage tracemalloc measurement."""
+
+    def test_peak_and_retained(self):
+        """Test that a temporary buffer counts towards peak but not retained memory."""
+        import tracemalloc
+
+        def allocate():
+            temporary = bytearray(4 * 1024 * 1024)
+            del temporary
+            return bytearray(1024 * 1024)
+
+        tracemalloc.start()
+        try:
+            peak, retained, result = traced(allocate)
+        finally:
+            tracemalloc.stop()
+
+        assert len(result) == 1024 * 1024
+        assert peak >= 4
+        assert 0.9 <= retained < 2
@@ -0,0 +1,163 @@
+"""
+Page Estimate Tests - HIGH Priority
+
+Tests for page-count estimation without rendering including:
+- Estimated page counts matching rendered PDFs
+- Per-section heights and pages
+- Reuse of measured sections between estimates
+- /api/estimate endpoint
+"""
+
+import pytest
+import os
+import sys
+import re
+import copy
+import json
+import random
+import tempfile
+from io import BytesIO
+from unittest.mock import patch
+
+# Add backend and benchmarks to path
+backend_dir = os.path.join(os.path.dirname(__file__), '..', '..', 'backend')
+benchmarks_dir = os.path.join(os.path.dirname(__file__), '..', '..', 'benchmarks')
+sys.path.insert(0, os.path.abspath(backend_dir))
+sys.path.insert(0, os.path.abspath(benchmarks_dir))
+
+from cv_generator import CVGenerator
+from linkedin_parser import LinkedInParser
+from page_estimate import get_section_cache
+from synthetic import write_export
+
+
+@pytest.fixture(autouse=True)
+def clear_section_cache():
+    get_section_cache().clear()
+    yield
+    get_section_cache().clear()
+
+
+def rendered_pages(data, config=None):
+    buffer = BytesIO()
+    CVGenerator(copy.deepcopy(data), config).render(buffer)
+    return len(re.findall(rb'/Type /Page\b', buffer.getvalue()))
+
+
+def synthetic_data(positions, seed=42):
+    with tempfile.TemporaryDirectory() as directory:
+        return LinkedInParser(write_export(directory, positions, seed=seed)).parse()
+
+
+def long_descriptions(positions, seed=7):
+    """CV whose descriptions (of different lengths) are each taller than a page"""
+    rng = random.Random(seed)
+    words = 'pilotage équipe livraison plateforme données architecture cloud migration qualité tests'.split()
+    return {
+        'profile': {'first_name': 'Jean', 'last_name': 'Dupont'},
+        'positions': [{
+            'title': 'Consultant', 'company': f'Client {i}', 'duration': '2020 - 2024',
+            'description': ' '.join(rng.choice(words) for _ in range(rng.randint(600, 1200)))
+        } for i in range(positions)]
+    }
+
+
+class TestEstimate:
+    """Test CVGenerator.estimate()."""
+
+    @pytest.mark.parametrize('positions', [1, 5, 20, 60])
+    @pytest.mark.parametrize('template', ['modern', 'classic', 'creative'])
+    def test_page_count_matches_render(self, positions, template):
+        """Test that the estimate gives the page count of the rendered PDF."""
+        data = synthetic_data(positions)
+        config = {'template': template}
+        assert CVGenerator(copy.deepcopy(data), config).estimate()['pages'] == rendered_pages(data, config)
+
+    @pytest.mark.parametrize('template', ['modern', 'creative'])
+    def test_split_paragraphs_match_render(self, template):
+        """Test that descriptions taller than a page, split across pages, are counted as rendered."""
+        data = long_descriptions(8)
+        config = {'template': template}
+        assert CVGenerator(copy.deepcopy(data), config).estimate()['pages'] == rendered_pages(data, config)
+
+    def test_sections(self, mock_parsed_data):
+        """Test that each enabled section is reported in order with its height and pages."""
+        estimate = CVGenerator(mock_parsed_data, {'sections': {'languages': False}}).estimate()
+
+        names = [section['name'] for section in estimate['sections']]
+        assert names == ['header', 'summary', 'experience', 'education', 'skills', 'certifications']
+        assert all(section['height'] > 0 for section in estimate['sections'])
+        assert all(section['first_page'] <= section['last_page'] <= estimate['pages']
+                   for section in estimate['sections'])
+        assert 0 < estimate['last_page_height'] <= estimate['frame_height']
+
+    def test_long_section_spans_pages(self):
+        """Test that a section taller than a page is reported across pages."""
+        estimate = CVGenerator(synthetic_data(60)).estimate()
+        experience = next(s for s in estimate['sections'] if s['name'] == 'experience')
+
+        assert experience['height'] > estimate['frame_height']
+        assert experience['last_page'] > experience['first_page']
+
+    def test_no_pdf_produced(self, mock_parsed_data):
+        """Test that estimating never builds a document."""
+        with patch('cv_generator.SimpleDocTemplate') as document, patch('cv_generator.get_store') as store:
+            CVGenerator(mock_parsed_data).estimate()
+        document.assert_not_called()
+        store.assert_not_called()
+
+
+class TestSectionCache:
+    """Test reuse of measured sections between estimates."""
+
+    def test_unchanged_sections_reused(self):
+        """Test that editing one position only rebuilds the experience section."""
+        data = synthetic_data(20)
+        CVGenerator(copy.deepcopy(data)).estimate()
+
+        data['positions'][0]['description'] += ' Ajout.'
+        built = []
+        original = CVGenerator._build_experience
+
+        def build_experience(generator):
+            built.append('experience')
+            return original(generator)
+
+        with patch.object(CVGenerator, '_build_summary', side_effect=AssertionError('not cached')), \
+                patch.object(CVGenerator, '_build_experience', build_experience):
+            estimate = CVGenerator(copy.deepcopy(data)).estimate()
+
+        assert built == ['experience']
+        assert estimate['pages'] == rendered_pages(data)
+
+    def test_layout_config_not_shared(self, mock_parsed_data):
+        """Test that a different template is measured again."""
+        modern = CVGenerator(copy.deepcopy(mock_parsed_data)).estimate()
+        classic = CVGenerator(copy.deepcopy(mock_parsed_data), {'template': 'classic'}).estimate()
+        assert modern['sections'][0]['height'] != classic['sections'][0]['height']
+
+
+class TestEstimateEndpoint:
+    """Test /api/estimate."""
+
+    def test_estimate(self, client, mock_parsed_data):
+        """Test that the endpoint returns pages and sections with stage timings."""
+        payload = dict(mock_parsed_data, config={'template': 'classic'})
+        response = client.post('/api/estimate', data=json.dumps(payload), content_type='application/json')
+
+        assert response.status_code == 200
+        body = response.get_json()
+        assert body['pages'] == rendered_pages(mock_parsed_data, {'template': 'classic'})
+        assert body['sections'][0]['name'] == 'header'
+        assert 'estimate' in response.headers['Server-Timing']
+
+    def test_invalid_payload(self, client):
+        """Test that non-object payloads are rejected."""
+        response = client.post('/api/estimate', data=json.dumps([1, 2]), content_type='application/json')
+        assert response.status_code == 400
+
+    def test_oversized_payload(self, client, mock_parsed_data):
+        """Test that payload limits apply as for renders."""
+        mock_parsed_data['skills'] = ['Python'] * 1000
+        response = client.post('/api/estimate', data=json.dumps(mock_parsed_data), content_type='application/json')
+        assert response.status_code == 413
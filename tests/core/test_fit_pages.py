@@ -0,0 +1,198 @@
+"""
+Auto-Fit Tests - HIGH Priority
+
+Tests for the fit_pages config option including:
+- Rendered CVs fitting the requested page count, including split descriptions
+- Least compact layout kept when it already fits, most compact when nothing fits
+- Only the chosen layout rendered
+- Layout scale and description truncation
+- Validation of the fit options by the API
+"""
+
+import pytest
+import os
+import sys
+import re
+import copy
+import json
+import math
+import random
+import tempfile
+from io import BytesIO
+from unittest.mock import patch
+
+# Add backend and benchmarks to path
+backend_dir = os.path.join(os.path.dirname(__file__), '..', '..', 'backend')
+benchmarks_dir = os.path.join(os.path.dirname(__file__), '..', '..', 'benchmarks')
+sys.path.insert(0, os.path.abspath(backend_dir))
+sys.path.insert(0, os.path.abspath(benchmarks_dir))
+
+from cv_generator import CVGenerator, PlatypusEngine
+from linkedin_parser import LinkedInParser
+from page_estimate import FIT_STEPS, get_section_cache
+from synthetic import write_export
+
+
+@pytest.fixture(autouse=True)
+def clear_section_cache():
+    get_section_cache().clear()
+    yield
+    get_section_cache().clear()
+
+
+@pytest.fixture(scope='module')
+def long_cv():
+    with tempfile.TemporaryDirectory() as directory:
+        return LinkedInParser(write_export(directory, 6, seed=42)).parse()
+
+
+@pytest.fixture(scope='module')
+def splitting_cv():
+    """CV whose descriptions (of different lengths) are each taller than a page"""
+    rng = random.Random(7)
+    words = 'pilotage équipe livraison plateforme données architecture cloud migration qualité tests'.split()
+    return {
+        'profile': {'first_name': 'Jean', 'last_name': 'Dupont'},
+        'positions': [{
+            'title': 'Consultant', 'company': f'Client {i}', 'duration': '2020 - 2024',
+            'description': ' '.join(rng.choice(words) for _ in range(rng.randint(600, 1200)))
+        } for i in range(8)]
+    }
+
+
+def render(generator):
+    buffer = BytesIO()
+    generator.render(buffer)
+    return len(re.findall(rb'/Type /Page\b', buffer.getvalue()))
+
+
+class TestFitPages:
+    """Test rendering with config.fit_pages."""
+
+    def test_fits_target(self, long_cv):
+        """Test that a CV too long by a page is rendered within the target."""
+        unfitted = render(CVGenerator(copy.deepcopy(long_cv)))
+        generator = CVGenerator(copy.deepcopy(long_cv), {'fit_pages': unfitted - 1})
+        pages = render(generator)
+
+        assert pages == generator.fit['pages'] <= unfitted - 1
+        assert generator.fit['fits']
+        assert (generator.fit['layout_scale'], generator.fit['description_limit']) != FIT_STEPS[0]
+
+    @pytest.mark.parametrize('template', ['modern', 'creative'])
+    def test_split_descriptions_fit_rendered(self, splitting_cv, template):
+        """Test that the rendered PDF fits when descriptions split across pages."""
+        unfitted = render(CVGenerator(copy.deepcopy(splitting_cv), {'template': template}))
+        generator = CVGenerator(copy.deepcopy(splitting_cv), {'template': template, 'fit_pages': unfitted - 1})
+
+        assert render(generator) == generator.fit['pages'] <= unfitted - 1
+        assert generator.fit['fits']
+
+    def test_fitting_layout_unchanged(self, mock_parsed_data):
+        """Test that a CV that already fits keeps its layout, after a single estimate."""
+        generator = CVGenerator(copy.deepcopy(mock_parsed_data), {'fit_pages': 5})
+        pages = render(generator)
+
+        assert pages == render(CVGenerator(copy.deepcopy(mock_parsed_data)))
+        assert generator.fit['layout_scale'] == 1
+        assert generator.fit['description_limit'] is None
+        assert generator.fit['candidates'] == 1
+
+    def test_best_effort(self, long_cv):
+        """Test that the most compact layout is used when no layout fits."""
+        generator = CVGenerator(copy.deepcopy(long_cv), {'fit_pages': 1})
+        pages = render(generator)
+
+        assert not generator.fit['fits']
+        assert (generator.fit['layout_scale'], generator.fit['description_limit']) == FIT_STEPS[-1]
+        assert pages == generator.fit['pages'] > 1
+
+    def test_binary_search(self, long_cv):
+        """Test that candidates are estimated a logarithmic number of times and rendered once."""
+        unfitted = render(CVGenerator(copy.deepcopy(long_cv)))
+        generator = CVGenerator(copy.deepcopy(long_cv), {'fit_pages': unfitted - 1})
+        original = PlatypusEngine.render
+
+        with patch.object(PlatypusEngine, 'render', autospec=True, side_effect=original) as engine_render:
+            render(generator)
+
+        assert engine_render.call_count == 1
+        assert generator.fit['candidates'] <= 2 + math.ceil(math.log2(len(FIT_STEPS)))
+
+    def test_estimate(self, long_cv):
+        """Test that estimates with fit_pages describe the fitted layout."""
+        unfitted = render(CVGenerator(copy.deepcopy(long_cv)))
+        config = {'fit_pages': unfitted - 1}
+        estimate = CVGenerator(copy.deepcopy(long_cv), config).estimate()
+
+        assert estimate['fit']['fits']
+        assert estimate['pages'] == render(CVGenerator(copy.deepcopy(long_cv), config))
+
+    def test_invalid_target(self, mock_parsed_data):
+        """Test that a page count below 1 is rejected."""
+        with pytest.raises(ValueError, match='fit_pages'):
+            CVGenerator(mock_parsed_data, {'fit_pages': -1}).render(BytesIO())
+
+
+class TestFitParameters:
+    """Test the layout parameters candidates are built with."""
+
+    def test_layout_scale(self, mock_parsed_data):
+        """Test that font sizes, leading and spacing are scaled."""
+        plain = CVGenerator(copy.deepcopy(mock_parsed_data)).styles['Description']
+        scaled = CVGenerator(copy.deepcopy(mock_parsed_data), {'layout_scale': 0.9}).styles['Description']
+
+        for attribute in ('fontSize', 'leading', 'spaceAfter'):
+            assert getattr(scaled, attribute) == pytest.approx(getattr(plain, attribute) * 0.9)
+
+    def test_description_limit(self, mock_parsed_data):
+        """Test that long descriptions end at a whole word with an ellipsis."""
+        generator = CVGenerator(mock_parsed_data, {'description_limit': 20})
+
+        assert generator._experience_description('Pilotage de la refonte du SI') == 'Pilotage de la…'
+        assert generator._experience_description('Court') == 'Court'
+
+    def test_description_limit_zero(self, mock_parsed_data):
+        """Test that a limit of 0 leaves descriptions out of the experience section."""
+        generator = CVGenerator(copy.deepcopy(mock_parsed_data), {'description_limit': 0})
+        styles = [flowable.style.name for flowable in generator._build_experience()
+                  for flowable in getattr(flowable, '_content', [flowable]) if hasattr(flowable, 'style')]
+
+        assert 'JobTitle' in styles
+        assert 'Description' not in styles
+
+
+class TestFitConfigValidation:
+    """Test that the API rejects invalid fit options."""
+
+    @pytest.mark.parametrize('endpoint', ['/api/generate-pdf', '/api/estimate'])
+    @pytest.mark.parametrize('config', [
+        {'fit_pages': 'abc'},
+        {'fit_pages': 0},
+        {'fit_pages': -1},
+        {'fit_pages': True},
+        {'layout_scale': 'x'},
+        {'layout_scale': 0.1},
+        {'description_limit': '5'},
+        {'description_limit': -1},
+        'modern'
+    ])
+    def test_invalid_config_rejected(self, client, mock_parsed_data, endpoint, config):
+        """Test that invalid options get a 400 instead of failing mid-render."""
+        payload = dict(mock_parsed_data, config=config)
+        response = client.post(endpoint, data=json.dumps(payload), content_type='application/json')
+        assert response.status_code == 400
+
+    def test_invalid_variant_config_rejected(self, client, mock_parsed_data):
+        """Test that each variant config is validated."""
+        payload = dict(mock_parsed_data, configs=[{'template': 'modern'}, {'fit_pages': 'abc'}])
+        response = client.post('/api/generate-variants', data=json.dumps(payload), content_type='application/json')
+        assert response.status_code == 400
+        assert 'fit_pages' in response.get_json()['error']
+
+    def test_valid_config_accepted(self, client, mock_parsed_data):
+        """Test that valid fit options are estimated."""
+        payload = dict(mock_parsed_data, config={'fit_pages': 2, 'layout_scale': 0.9, 'description_limit': 300})
+        response = client.post('/api/estimate', data=json.dumps(payload), content_type='application/json')
+        assert response.status_code == 200
+        assert response.get_json()['fit']['target'] == 2
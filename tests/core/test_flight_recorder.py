@@ -0,0 +1,125 @@
+"""
+Flight Recorder Tests - MEDIUM Priority
+
+Tests for the slow-request flight recorder including:
+- Bounded retention of the N slowest requests
+- Expiry of old entries
+- Payload shape without personal data
+- Admin-only /api/debug/slow endpoint
+"""
+
+import os
+import sys
+import json
+from unittest.mock import patch
+
+# Add backend to path
+backend_dir = os.path.join(os.path.dirname(__file__), '..', '..', 'backend')
+sys.path.insert(0, os.path.abspath(backend_dir))
+
+from flight_recorder import SlowRequestRecorder, describe_cv_payload
+
+
+class TestSlowRequestRecorder:
+    """Test ring buffer retention."""
+
+    def test_keeps_only_slowest(self):
+        """Test that only the N slowest requests are kept, slowest first."""
+        recorder = SlowRequestRecorder(capacity=2)
+        for duration in (0.1, 0.5, 0.2, 0.05):
+            recorder.record('/api/generate-pdf', duration, {}, {}, {'status': 200})
+
+        durations = [entry['duration_ms'] for entry in recorder.snapshot()]
+        assert durations == [500.0, 200.0]
+
+    def test_faster_request_rejected_when_full(self):
+        """Test that a request faster than all kept ones is not recorded."""
+        recorder = SlowRequestRecorder(capacity=1)
+        assert recorder.record('/api/generate-pdf', 1.0, {}, {}, {'status': 200})
+        assert not recorder.record('/api/generate-pdf', 0.5, {}, {}, {'status': 200})
+
+    def test_old_entries_expire(self):
+        """Test that entries older than max_age are dropped."""
+        recorder = SlowRequestRecorder(capacity=5, max_age=60)
+        with patch('flight_recorder.time.time', return_value=1000):
+            recorder.record('/api/generate-pdf', 5.0, {}, {}, {'status': 200})
+        with patch('flight_recorder.time.time', return_value=1100):
+            recorder.record('/api/generate-pdf', 0.1, {}, {}, {'status': 200})
+            entries = recorder.snapshot()
+
+        assert [entry['duration_ms'] for entry in entries] == [100.0]
+
+    def test_stages_converted_to_ms(self):
+        """Test that stage timings are stored in milliseconds."""
+        recorder = SlowRequestRecorder(capacity=1)
+        recorder.record('/api/generate-pdf', 0.3, {'doc_build': 0.25}, {'skills': 3}, {'status': 200})
+
+        entry = recorder.snapshot()[0]
+        assert entry['stages_ms'] == {'doc_build': 250.0}
+        assert entry['payload'] == {'skills': 3}
+
+
+class TestPayloadShape:
+    """Test payload summaries."""
+
+    def test_counts_sections(self, mock_parsed_data):
+        """Test that payload shape counts entries per section."""
+        mock_parsed_data['positions'][0]['missions'] = [{'client': 'A', 'description': 'abc'}]
+        shape = describe_cv_payload(mock_parsed_data, {'template': 'classic'})
+
+        assert shape['positions'] == 1
+        assert shape['missions'] == 1
+        assert shape['skills'] == 3
+        assert shape['template'] == 'classic'
+        assert shape['description_chars'] == (
+            len('Developed web applications') + len('abc') + len('Software Engineer with 5 years experience')
+        )
+
+    def test_shape_contains_no_personal_data(self, mock_parsed_data):
+        """Test that no payload text ends up in the summary."""
+        shape = json.dumps(describe_cv_payload(mock_parsed_data))
+        assert 'John' not in shape
+        assert 'john.doe@example.com' not in shape
+        assert 'Tech Corp' not in shape
+
+    def test_malformed_payload_tolerated(self):
+        """Test that unexpected types do not raise."""
+        shape = describe_cv_payload({'positions': 'oops', 'profile': [], 'photo': 42})
+        assert shape['positions'] == 0
+        assert shape['photo_bytes'] == 0
+
+
+class TestDebugSlowEndpoint:
+    """Test /api/debug/slow endpoint."""
+
+    def test_disabled_without_admin_token(self, client):
+        """Test that the endpoint does not exist when no admin token is configured."""
+        with patch('app.ADMIN_TOKEN', ''):
+            response = client.get('/api/debug/slow')
+        assert response.status_code == 404
+
+    def test_wrong_token_forbidden(self, client):
+        """Test that a wrong admin token is rejected."""
+        with patch('app.ADMIN_TOKEN', 'secret'):
+            response = client.get('/api/debug/slow', headers={'X-Admin-Token': 'wrong'})
+        assert response.status_code == 403
+
+    def test_lists_slow_render(self, client, mock_parsed_data):
+        """Test that a render shows up with stage breakdown and payload shape."""
+        import app as app_module
+
+        app_module.slow_requests.clear()
+        client.post('/api/generate-pdf',
+                    data=json.dumps(mock_parsed_data),
+                    content_type='application/json')
+
+        with patch('app.ADMIN_TOKEN', 'secret'):
+            response = client.get('/api/debug/slow', headers={'X-Admin-Token': 'secret'})
+
+        assert response.status_code == 200
+        entries = json.loads(response.data)['requests']
+        assert len(entries) == 1
+        assert entries[0]['endpoint'] == '/api/generate-pdf'
+        assert entries[0]['outcome'] == {'status': 200, 'ok': True}
+        assert entries[0]['payload']['positions'] == 1
+        assert 'doc_build' in entries[0]['stages_ms']
@@ -0,0 +1,163 @@
+"""
+Font Registry Tests - MEDIUM Priority
+
+Tests for the process-wide font registry including:
+- One registration per process for TTF families
+- Glyph coverage sets and coverage-based sanitization
+- Font family selection per render
+"""
+
+import pytest
+import os
+import sys
+import re
+import json
+import zlib
+import base64
+from io import BytesIO
+from unittest.mock import patch
+
+# Add backend to path
+backend_dir = os.path.join(os.path.dirname(__file__), '..', '..', 'backend')
+sys.path.insert(0, os.path.abspath(backend_dir))
+
+import fonts
+from fonts import FontRegistry, BUNDLED_FAMILIES, get_family
+from cv_generator import CVGenerator
+
+
+def vera_paths():
+    paths = BUNDLED_FAMILIES['Vera']
+    return paths['normal'], paths['bold'], paths['italic'], paths['boldItalic']
+
+
+class TestFontRegistry:
+    """Test font family registration."""
+
+    def test_ttf_registered_once(self):
+        """Test that TTF files are loaded and registered on first use only."""
+        registry = FontRegistry()
+        registry.add('VeraOnce', *vera_paths())
+
+        with patch('fonts.pdfmetrics.registerFont', wraps=fonts.pdfmetrics.registerFont) as register:
+            family = registry.get('VeraOnce')
+            assert registry.get('VeraOnce') is family
+
+        assert register.call_count == 4
+        assert family.faces['bold'] == 'VeraOnce-Bold'
+
+    def test_missing_faces_fall_back_to_regular(self):
+        """Test that a family with a single file registers it once for every face."""
+        registry = FontRegistry()
+        registry.add('VeraRegular', vera_paths()[0])
+
+        with patch('fonts.pdfmetrics.registerFont', wraps=fonts.pdfmetrics.registerFont) as register:
+            family = registry.get('VeraRegular')
+
+        assert register.call_count == 1
+        assert set(family.faces.values()) == {'VeraRegular'}
+
+    def test_coverage_from_cmap(self):
+        """Test that coverage lists the characters the font has glyphs for."""
+        vera = get_family('Vera')
+        helvetica = get_family('Helvetica')
+
+        assert vera.can_draw('Résumé – Ω ≥')
+        assert not vera.can_draw('中')
+        assert helvetica.can_draw('Résumé – “quotes” … €')
+        assert not helvetica.can_draw('≥')
+
+    def test_unknown_family_uses_default(self):
+        """Test that unknown family names fall back to the default family."""
+        assert get_family('NoSuchFont').name == fonts.DEFAULT_FAMILY
+        assert FontRegistry().get('NoSuchFont') is None
+
+    def test_configured_families(self, monkeypatch):
+        """Test that CV_FONT_FAMILIES declares extra families, ignoring invalid values."""
+        normal, bold, _, _ = vera_paths()
+        monkeypatch.setenv('CV_FONT_FAMILIES', json.dumps({'Custom': {'normal': normal, 'bold': bold}}))
+        registry = FontRegistry()
+        fonts._load_configured_families(registry)
+        assert 'Custom' in registry.names()
+
+        monkeypatch.setenv('CV_FONT_FAMILIES', '{not json')
+        registry = FontRegistry()
+        fonts._load_configured_families(registry)
+        assert 'Custom' not in registry.names()
+
+
+class TestCoverageSanitization:
+    """Test that sanitization only removes what the font cannot draw."""
+
+    def _summary(self, text, font=None):
+        return CVGenerator({'profile': {'summary': text}}, {'font': font}).data['profile']['summary']
+
+    def test_drawable_characters_kept(self):
+        """Test that accents, dashes, quotes and currency survive with Helvetica."""
+        assert self._summary('Résumé – “Café” … 50 €') == 'Résumé – “Café” … 50 €'
+
+    def test_default_font_draws_punctuation_inline(self):
+        """Test that a default (Helvetica) CV draws dashes, ellipses and euros on one line (not as line breaks)."""
+        data = {'profile': {'first_name': 'Jean', 'last_name': 'Dupont', 'summary': 'Budget – 50 € … livré'}}
+        buffer = BytesIO()
+        CVGenerator(data).render(buffer)
+
+        streams = [zlib.decompress(base64.a85decode(b'<~' + stream.strip(), adobe=True))
+                   for stream in re.findall(rb'stream\r?\n(.*?)endstream', buffer.getvalue(), re.S)]
+        # WinAnsi codes: \226 en dash, \200 euro, \205 ellipsis, \351 é
+        assert any(rb'(Budget \226 50 \200 \205 livr\351) Tj' in stream for stream in streams)
+
+    def test_undrawable_characters_removed(self):
+        """Test that characters outside the font are dropped, and kept by a font that has them."""
+        assert self._summary('x ≥ 3') == 'x 3'
+        assert self._summary('x ≥ 3', font='Vera') == 'x ≥ 3'
+
+    def test_emojis_still_separate_items(self):
+        """Test that emojis and bullets become line breaks whatever the font."""
+        summary = self._summary('🚀 Item 1 ✅ Item 2 • Item 3', font='Vera')
+        assert [line.strip() for line in summary.split('\n')] == ['Item 1', 'Item 2', 'Item 3']
+
+    def test_apostrophes_normalized(self):
+        """Test that typographic apostrophes become ASCII ones."""
+        assert self._summary('l’API') == "l'API"
+
+
+class TestFontFamilySelection:
+    """Test rendering with a configured font family."""
+
+    def test_styles_use_family_faces(self):
+        """Test that Helvetica faces in styles are replaced by the family's faces."""
+        generator = CVGenerator({'profile': {}}, {'font': 'Vera'})
+        vera = get_family('Vera')
+
+        assert generator.styles['Name'].fontName == vera.faces['bold']
+        assert generator.styles['Summary'].fontName == vera.faces['normal']
+
+    def test_pdf_embeds_font_subset(self, mock_parsed_data):
+        """Test that a TTF family is embedded as a subset."""
+        buffer = BytesIO()
+        CVGenerator(mock_parsed_data, {'font': 'Vera'}).render(buffer)
+        assert b'+BitstreamVeraSans' in buffer.getvalue()
+
+    def test_bold_prefix_uses_family_bold(self):
+        """Test that bold label prefixes resolve to the family's bold face."""
+        from flowables import bold_font
+
+        assert bold_font(get_family('Vera').faces['normal']) == get_family('Vera').faces['bold']
+
+    def test_prepared_data_bound_to_font(self, mock_parsed_data):
+        """Test that data sanitized for one font is not rendered with another."""
+        prepared = CVGenerator(mock_parsed_data).prepare()
+        with pytest.raises(ValueError):
+            CVGenerator(prepared, {'font': 'Vera'})
+
+    def test_variants_prepared_per_font(self, mock_parsed_data):
+        """Test that multi-variant renders prepare the data once per font family."""
+        from variants import render_variants
+
+        configs = [{'template': 'modern'}, {'template': 'classic'}, {'font': 'Vera'}]
+        with patch.object(CVGenerator, 'prepare', autospec=True, side_effect=CVGenerator.prepare) as prepare:
+            pdfs = render_variants(mock_parsed_data, configs)
+
+        assert prepare.call_count == 2
+        assert len(pdfs) == 3
@@ -0,0 +1,121 @@
+"""
+JSON Response Tests - MEDIUM Priority
+
+Tests for compact, compressed JSON responses including:
+- Omitting empty fields
+- Content-negotiated gzip / deflate encoding
+- /api/parse-linkedin with ?omit_empty=true
+"""
+
+import pytest
+import os
+import sys
+import glob
+import gzip
+import json
+import zlib
+from unittest.mock import patch
+
+# Add backend to path
+backend_dir = os.path.join(os.path.dirname(__file__), '..', '..', 'backend')
+sys.path.insert(0, os.path.abspath(backend_dir))
+
+from json_responses import omit_empty, compress
+
+MOCK_EXPORT = sorted(glob.glob(os.path.join(os.path.dirname(__file__), '..', '..', 'mock', '*.csv')))
+
+
+def upload_mock_export(client, query='', headers=None):
+    files = [(open(path, 'rb'), os.path.basename(path)) for path in MOCK_EXPORT]
+    try:
+        return client.post('/api/parse-linkedin' + query, data={'files': files},
+                           content_type='multipart/form-data', headers=headers or {})
+    finally:
+        for f, _ in files:
+            f.close()
+
+
+class TestOmitEmpty:
+    """Test removal of empty fields."""
+
+    def test_nested_empty_values_removed(self):
+        """Test that empty strings, None, lists and objects are dropped at every level."""
+        data = {
+            'profile': {'first_name': 'John', 'maiden_name': '', 'birth_date': None},
+            'positions': [{'title': 'Dev', 'missions': []}, {'description': ''}],
+            'skills': [],
+        }
+        assert omit_empty(data) == {'profile': {'first_name': 'John'}, 'positions': [{'title': 'Dev'}]}
+
+    def test_falsy_values_kept(self):
+        """Test that 0 and False are data, not empty fields."""
+        assert omit_empty({'count': 0, 'current': False}) == {'count': 0, 'current': False}
+
+
+class TestCompression:
+    """Test content-encoding of JSON responses."""
+
+    @pytest.mark.parametrize('encoding, decompress', [('gzip', gzip.decompress), ('deflate', zlib.decompress)])
+    def test_round_trip(self, encoding, decompress):
+        """Test that encoded bodies decode to the original bytes."""
+        body = json.dumps({'summary': 'word ' * 500}).encode()
+        encoded = compress(body, encoding)
+        assert len(encoded) < len(body)
+        assert decompress(encoded) == body
+
+    def test_gzip_is_deterministic(self):
+        """Test that identical bodies give identical gzip bytes (no timestamp)."""
+        assert compress(b'{"a": 1}' * 200, 'gzip') == compress(b'{"a": 1}' * 200, 'gzip')
+
+    @pytest.mark.parametrize('encoding, decompress', [('gzip', gzip.decompress), ('deflate', zlib.decompress)])
+    def test_parse_response_encoded(self, client, encoding, decompress):
+        """Test that parse results are encoded when the client accepts it."""
+        plain = upload_mock_export(client)
+        encoded = upload_mock_export(client, headers={'Accept-Encoding': f'{encoding}, br;q=0.5'})
+
+        assert encoded.status_code == 200
+        assert encoded.headers['Content-Encoding'] == encoding
+        assert 'Accept-Encoding' in encoded.headers['Vary']
+        assert int(encoded.headers['Content-Length']) == len(encoded.data) < len(plain.data)
+        assert json.loads(decompress(encoded.data)) == plain.get_json()
+
+    def test_identity_without_accept_encoding(self, client):
+        """Test that clients not accepting an encoding get plain JSON."""
+        response = upload_mock_export(client)
+        assert 'Content-Encoding' not in response.headers
+
+        refused = upload_mock_export(client, headers={'Accept-Encoding': 'gzip;q=0, deflate;q=0'})
+        assert 'Content-Encoding' not in refused.headers
+
+    def test_small_responses_left_plain(self, client):
+        """Test that bodies under the minimum size are not worth encoding."""
+        response = client.get('/', headers={'Accept-Encoding': 'gzip'})
+        assert 'Content-Encoding' not in response.headers
+        assert response.get_json()['status'] == 'running'
+
+    def test_disabled_by_setting(self, client):
+        """Test that CV_JSON_COMPRESSION=false turns encoding off."""
+        with patch('app.JSON_COMPRESSION', False):
+            response = upload_mock_export(client, headers={'Accept-Encoding': 'gzip'})
+        assert 'Content-Encoding' not in response.headers
+
+    def test_pdf_not_encoded(self, client, mock_parsed_data):
+        """Test that PDF downloads are never content-encoded."""
+        response = client.post('/api/generate-pdf', json=mock_parsed_data, headers={'Accept-Encoding': 'gzip'})
+        assert response.status_code == 200
+        assert 'Content-Encoding' not in response.headers
+
+
+class TestParseOmitEmpty:
+    """Test ?omit_empty=true on /api/parse-linkedin."""
+
+    def test_empty_fields_omitted(self, client):
+        """Test that empty profile fields are left out and the response shrinks."""
+        full_response = upload_mock_export(client)
+        compact_response = upload_mock_export(client, query='?omit_empty=true')
+        full, compact = full_response.get_json(), compact_response.get_json()
+
+        assert full['profile']['maiden_name'] == ''
+        assert 'maiden_name' not in compact['profile']
+        assert compact['profile']['first_name'] == full['profile']['first_name']
+        assert len(compact_response.data) < len(full_response.data)
@@ -0,0 +1,98 @@
+"""
+Load-Test Harness Tests - OPTIONAL Priority
+
+Tests for backend/loadtest.py including:
+- Percentile and mix parsing helpers
+- Scenario payloads
+- Short runs against a local server process, or an in-process one (flagged in the report)
+"""
+
+import pytest
+import os
+import sys
+import json
+
+# Add backend directory to path
+backend_dir = os.path.join(os.path.dirname(__file__), '..', '..', 'backend')
+sys.path.insert(0, os.path.abspath(backend_dir))
+
+from loadtest import (percentile, parse_mix, build_scenarios, main, LoadTest, IN_PROCESS_WARNING,
+                      start_server_process, stop_server_process)
+
+MOCK_DIR = os.path.join(os.path.dirname(__file__), '..', '..', 'mock')
+
+
+class TestHelpers:
+    """Test percentile and mix parsing."""
+
+    def test_percentiles_nearest_rank(self):
+        """Test nearest-rank percentiles on 1..100."""
+        values = list(range(1, 101))
+        assert percentile(values, 50) == 50
+        assert percentile(values, 95) == 95
+        assert percentile(values, 99) == 99
+        assert percentile([], 50) is None
+
+    def test_parse_mix(self):
+        """Test that weights are parsed and zero weights dropped."""
+        assert parse_mix('parse=1, preview=4,render=0') == {'parse': 1.0, 'preview': 4.0}
+
+    def test_unknown_scenario_rejected(self):
+        """Test that an unknown scenario name raises ValueError."""
+        with pytest.raises(ValueError):
+            LoadTest('http://localhost', build_scenarios(MOCK_DIR), {'upload': 1})
+
+
+class TestScenarios:
+    """Test scenario payloads."""
+
+    def test_preview_has_no_photo_render_has_photo(self):
+        """Test that preview requests omit the photo and final renders include one."""
+        scenarios = build_scenarios(MOCK_DIR)
+
+        assert scenarios['parse'][0] == '/api/parse-linkedin'
+        assert b'Positions.csv' in scenarios['parse'][1]
+        assert 'photo' not in json.loads(scenarios['preview'][1](0))
+        assert json.loads(scenarios['render'][1](0))['photo']
+
+    def test_render_payloads_unique(self):
+        """Test that each request gets a distinct CV, so the server cannot coalesce them."""
+        bodies = build_scenarios(MOCK_DIR)['preview'][1]
+        first, second = json.loads(bodies(1)), json.loads(bodies(2))
+
+        assert first != second
+        assert first['profile']['summary'].endswith('1')
+        assert {key: value for key, value in first.items() if key != 'profile'} == \
+            {key: value for key, value in second.items() if key != 'profile'}
+
+
+class TestLocalRun:
+    """Test short runs against a local server."""
+
+    def test_closed_loop_report(self):
+        """Test that every request is counted with latency percentiles and no errors."""
+        base_url, process = start_server_process()
+        try:
+            test = LoadTest(base_url, build_scenarios(MOCK_DIR), parse_mix('parse=1,preview=1'))
+            elapsed = test.run_closed_loop(concurrency=2, requests=6)
+        finally:
+            stop_server_process(process)
+
+        report = test.report(elapsed)
+        assert report['requests'] == 6
+        assert process.returncode is not None
+        for scenario in report['scenarios'].values():
+            assert scenario['error_rate'] == 0
+            if scenario['requests']:
+                assert scenario['p50_ms'] <= scenario['p99_ms']
+
+    @pytest.mark.parametrize('args, warned', [([], False), (['--in-process'], True)])
+    def test_in_process_server_flagged(self, tmp_path, args, warned):
+        """Test that only reports measured against an in-process server carry the GIL warning."""
+        report_path = tmp_path / 'report.json'
+        assert main(args + ['--mix', 'parse=1', '--requests', '2', '--concurrency', '1',
+                            '--export-dir', MOCK_DIR, '--json', str(report_path)]) == 0
+
+        report = json.loads(report_path.read_text())
+        assert report['requests'] == 2
+        assert (IN_PROCESS_WARNING in report.get('warnings', [])) == warned
@@ -0,0 +1,223 @@
+"""
+Metrics Tests - MEDIUM Priority
+
+Tests for the in-process metrics registry including:
+- Counter, gauge and histogram semantics
+- Prometheus text format rendering
+- Stage timing helpers
+- /api/metrics endpoint
+- Server-Timing response headers
+"""
+
+import pytest
+import os
+import sys
+import io
+import json
+from unittest.mock import patch
+
+# Add backend to path
+backend_dir = os.path.join(os.path.dirname(__file__), '..', '..', 'backend')
+sys.path.insert(0, os.path.abspath(backend_dir))
+
+from metrics import MetricsRegistry, STAGE_SECONDS, stage, timed, record_cache, REGISTRY, RequestTimings
+
+
+class TestRegistry:
+    """Test metric types and text rendering."""
+
+    def test_counter_renders_with_labels(self):
+        """Test that counters render one sample per label set."""
+        registry = MetricsRegistry()
+        counter = registry.counter('test_total', 'Test counter', ('endpoint',))
+        counter.inc('/a')
+        counter.inc('/a')
+        counter.inc('/b', amount=3)
+
+        text = registry.render()
+        assert '# TYPE test_total counter' in text
+        assert 'test_total{endpoint="/a"} 2' in text
+        assert 'test_total{endpoint="/b"} 3' in text
+
+    def test_gauge_inc_dec(self):
+        """Test that gauges go up and down."""
+        registry = MetricsRegistry()
+        gauge = registry.gauge('test_in_flight', 'Test gauge')
+        gauge.inc()
+        gauge.inc()
+        gauge.dec()
+        assert gauge.get() == 1
+
+    def test_histogram_buckets_are_cumulative(self):
+        """Test that histogram buckets are rendered cumulatively."""
+        registry = MetricsRegistry()
+        histogram = registry.histogram('test_seconds', 'Test histogram', buckets=(0.1, 1.0))
+        histogram.observe(0.05)
+        histogram.observe(0.5)
+        histogram.observe(5)
+
+        text = registry.render()
+        assert 'test_seconds_bucket{le="0.1"} 1' in text
+        assert 'test_seconds_bucket{le="1"} 2' in text
+        assert 'test_seconds_bucket{le="+Inf"} 3' in text
+        assert 'test_seconds_count 3' in text
+
+    def test_label_values_escaped(self):
+        """Test that quotes in label values are escaped."""
+        registry = MetricsRegistry()
+        registry.counter('test_total', 'Test counter', ('name',)).inc('a"b')
+        assert 'test_total{name="a\\"b"} 1' in registry.render()
+
+    def test_wrong_label_count_rejected(self):
+        """Test that label arity is enforced."""
+        registry = MetricsRegistry()
+        counter = registry.counter('test_total', 'Test counter', ('endpoint',))
+        with pytest.raises(ValueError):
+            counter.inc()
+
+    def test_conflicting_registration_rejected(self):
+        """Test that a name cannot be reused for a different metric type."""
+        registry = MetricsRegistry()
+        registry.counter('test_metric', 'Test counter')
+        with pytest.raises(ValueError):
+            registry.gauge('test_metric', 'Test gauge')
+
+
+class TestStageTiming:
+    """Test stage timing helpers."""
+
+    def test_stage_context_manager_observes(self):
+        """Test that stage() records one observation per block."""
+        before, _ = STAGE_SECONDS.get('unit_test_stage')
+        with stage('unit_test_stage'):
+            pass
+        after, _ = STAGE_SECONDS.get('unit_test_stage')
+        assert after == before + 1
+
+    def test_timed_decorator_observes_on_error(self):
+        """Test that timed() still records when the function raises."""
+        @timed('unit_test_failing_stage')
+        def failing():
+            raise RuntimeError("boom")
+
+        before, _ = STAGE_SECONDS.get('unit_test_failing_stage')
+        with pytest.raises(RuntimeError):
+            failing()
+        after, _ = STAGE_SECONDS.get('unit_test_failing_stage')
+        assert after == before + 1
+
+    def test_cache_hit_ratio_derived_on_render(self):
+        """Test that cache hit ratios are computed from hit/miss counters."""
+        record_cache('unit_test_cache', True)
+        record_cache('unit_test_cache', True)
+        record_cache('unit_test_cache', False)
+        record_cache('unit_test_cache', True)
+
+        text = REGISTRY.render()
+        assert 'cv_cache_hit_ratio{cache="unit_test_cache"} 0.75' in text
+
+
+class TestMetricsEndpoint:
+    """Test /api/metrics endpoint."""
+
+    def test_metrics_endpoint_prometheus_format(self, client):
+        """Test that /api/metrics returns Prometheus text format."""
+        response = client.get('/api/metrics')
+        assert response.status_code == 200
+        assert response.content_type.startswith('text/plain')
+        assert b'# TYPE cv_http_requests_total counter' in response.data
+        assert b'cv_http_requests_in_flight' in response.data
+
+    def test_request_counted_per_endpoint(self, client):
+        """Test that requests are counted by endpoint and status."""
+        client.get('/')
+        text = client.get('/api/metrics').data.decode()
+        assert 'cv_http_requests_total{endpoint="/",method="GET",status="200"}' in text
+        assert 'cv_http_request_duration_seconds_count{endpoint="/"}' in text
+
+    def test_in_flight_returns_to_zero(self, client):
+        """Test that the in-flight gauge is decremented after each request."""
+        client.get('/')
+        client.post('/api/generate-pdf', data='not json', content_type='application/json')
+        text = client.get('/api/metrics').data.decode()
+        # The metrics request itself is the only one in flight
+        assert 'cv_http_requests_in_flight 1' in text
+
+    def test_render_stages_recorded(self, client, mock_parsed_data):
+        """Test that a real render records generator stages."""
+        response = client.post('/api/generate-pdf',
+                               data=json.dumps(mock_parsed_data),
+                               content_type='application/json')
+        assert response.status_code == 200
+
+        text = client.get('/api/metrics').data.decode()
+        for stage_name in ('emoji_clean', 'style_setup', 'build_header', 'build_experience', 'doc_build'):
+            assert f'cv_stage_duration_seconds_count{{stage="{stage_name}"}}' in text
+        assert 'cv_http_response_bytes_count{endpoint="/api/generate-pdf"}' in text
+
+    @patch('app.LinkedInParser')
+    def test_file_save_stage_recorded(self, mock_parser, client):
+        """Test that saving uploads is recorded as a stage."""
+        mock_parser.return_value.parse.return_value = {"profile": {}}
+        client.post('/api/parse-linkedin',
+                    data={'files': (io.BytesIO(b"Name\nPython\n"), 'Skills.csv')},
+                    content_type='multipart/form-data')
+
+        text = client.get('/api/metrics').data.decode()
+        assert 'cv_stage_duration_seconds_count{stage="file_save"}' in text
+
+
+def _server_timing_stages(header):
+    """Return the stage names of a Server-Timing header."""
+    return [entry.strip().split(';')[0] for entry in header.split(',')]
+
+
+class TestServerTiming:
+    """Test Server-Timing response headers."""
+
+    def test_request_timings_sum_repeated_stages(self):
+        """Test that repeated stages are summed into one entry."""
+        timings = RequestTimings()
+        timings.add('parse_positions', 0.001)
+        timings.add('parse_positions', 0.002)
+
+        header = timings.server_timing()
+        assert header.startswith('parse_positions;dur=3.0')
+        assert _server_timing_stages(header) == ['parse_positions', 'total']
+
+    def test_generate_pdf_has_server_timing(self, client, mock_parsed_data):
+        """Test that /api/generate-pdf breaks the request into stages."""
+        response = client.post('/api/generate-pdf',
+                               data=json.dumps(mock_parsed_data),
+                               content_type='application/json')
+        assert response.status_code == 200
+
+        stages = _server_timing_stages(response.headers['Server-Timing'])
+        for stage_name in ('upload', 'validation', 'emoji_clean', 'style_setup',
+                           'story_build', 'doc_build', 'send', 'total'):
+            assert stage_name in stages
+
+    def test_parse_linkedin_has_server_timing(self, client, mock_skills_csv):
+        """Test that /api/parse-linkedin reports upload, per-file parse and merge stages."""
+        with open(mock_skills_csv, 'rb') as f:
+            response = client.post('/api/parse-linkedin',
+                                   data={'files': (io.BytesIO(f.read()), 'Skills.csv')},
+                                   content_type='multipart/form-data')
+        assert response.status_code == 200
+
+        stages = _server_timing_stages(response.headers['Server-Timing'])
+        for stage_name in ('upload', 'validation', 'file_save', 'parse_skills', 'consultant_merge', 'send'):
+            assert stage_name in stages
+
+    def test_other_endpoints_have_no_server_timing(self, client):
+        """Test that Server-Timing is limited to parse and render endpoints."""
+        response = client.get('/')
+        assert 'Server-Timing' not in response.headers
+
+    def test_server_timing_exposed_to_cors(self, client, mock_parsed_data):
+        """Test that browsers are allowed to read the Server-Timing header."""
+        response = client.post('/api/generate-pdf',
+                               data=json.dumps(mock_parsed_data),
+                               content_type='application/json',
+                               headers={'Origin': 'http://localhost:8080'})
+        assert 'Server-Timing' in response.headers.get('Access-Control-Expose-Headers', '')
@@ -0,0 +1,130 @@
+"""
+Payload Limits Tests - HIGH Priority
+
+Tests for /api/generate-pdf resource limits including:
+- Pre-flight validation of text size, list lengths, total entries and nesting
+- 413 responses before any rendering
+- Optional render memory budget
+"""
+
+import pytest
+import os
+import sys
+import tracemalloc
+from unittest.mock import patch
+
+# Add backend to path
+backend_dir = os.path.join(os.path.dirname(__file__), '..', '..', 'backend')
+sys.path.insert(0, os.path.abspath(backend_dir))
+
+import app as app_module
+from app import validate_payload_limits, MAX_PAYLOAD_LIST_LENGTH, MAX_PAYLOAD_STRING_BYTES, MAX_PAYLOAD_DEPTH
+from memory_guard import MemoryGuard, MemoryBudgetExceeded, check_memory_budget
+
+
+@pytest.fixture
+def stop_tracemalloc():
+    """Stop tracemalloc after tests that let the memory guard start it."""
+    was_tracing = tracemalloc.is_tracing()
+    yield
+    if not was_tracing and tracemalloc.is_tracing():
+        tracemalloc.stop()
+
+
+class TestPayloadValidation:
+    """Test the pre-flight payload validator."""
+
+    def test_regular_cv_accepted(self, mock_parsed_data):
+        """Test that a realistic CV passes."""
+        assert validate_payload_limits(mock_parsed_data) is None
+
+    def test_too_many_skills_rejected(self, mock_parsed_data):
+        """Test that an overlong list is rejected with its key in the message."""
+        data = dict(mock_parsed_data, skills=['Python'] * (MAX_PAYLOAD_LIST_LENGTH + 1))
+        assert "'skills'" in validate_payload_limits(data)
+
+    def test_huge_summary_rejected(self, mock_parsed_data):
+        """Test that the total text size is limited."""
+        data = dict(mock_parsed_data, profile={'summary': 'a' * (MAX_PAYLOAD_STRING_BYTES + 1)})
+        assert 'too large' in validate_payload_limits(data)
+
+    def test_non_ascii_counted_in_bytes(self, mock_parsed_data):
+        """Test that multi-byte characters count by their UTF-8 size."""
+        data = dict(mock_parsed_data, profile={'summary': 'é' * (MAX_PAYLOAD_STRING_BYTES // 2 + 1)})
+        assert 'too large' in validate_payload_limits(data)
+
+    def test_missions_spread_across_positions_rejected(self, mock_parsed_data):
+        """Test that the total number of entries is limited, not only each list."""
+        position = {'company': 'ESN', 'missions': [{'title': 'Mission'}] * 400}
+        data = dict(mock_parsed_data, positions=[position] * 20)
+        assert 'too complex' in validate_payload_limits(data)
+
+    def test_deep_nesting_rejected(self):
+        """Test that nesting deeper than the limit is rejected."""
+        nested = 'leaf'
+        for _ in range(MAX_PAYLOAD_DEPTH + 1):
+            nested = [nested]
+        assert 'nested' in validate_payload_limits({'positions': nested})
+
+    def test_photo_excluded_from_text_budget(self, mock_parsed_data):
+        """Test that the photo is left to validate_photo."""
+        data = dict(mock_parsed_data, photo='a' * (MAX_PAYLOAD_STRING_BYTES + 1))
+        assert validate_payload_limits(data) is None
+
+
+class TestPayloadLimitEndpoint:
+    """Test 413 responses from /api/generate-pdf."""
+
+    @patch('app.CVGenerator')
+    def test_oversized_payload_rejected_before_render(self, mock_generator, client, mock_parsed_data):
+        """Test that an oversized payload returns 413 without building the CV."""
+        data = dict(mock_parsed_data, skills=['Python'] * 50000)
+
+        response = client.post('/api/generate-pdf', json=data)
+
+        assert response.status_code == 413
+        assert 'skills' in response.get_json()['error']
+        mock_generator.assert_not_called()
+
+
+class TestMemoryGuard:
+    """Test the optional render memory budget."""
+
+    def test_check_outside_watch_is_noop(self):
+        """Test that renderers can call check_memory_budget without a guard."""
+        check_memory_budget()
+
+    def test_disabled_guard_never_raises(self):
+        """Test that a zero limit disables the guard."""
+        with MemoryGuard(0).watch():
+            ballast = bytearray(8 * 1024 * 1024)
+            check_memory_budget()
+        del ballast
+
+    def test_budget_exceeded_raises(self, stop_tracemalloc):
+        """Test that growth past the budget raises MemoryBudgetExceeded."""
+        with pytest.raises(MemoryBudgetExceeded):
+            with MemoryGuard(1024 * 1024, mode='tracemalloc').watch():
+                ballast = bytearray(4 * 1024 * 1024)
+                check_memory_budget()
+
+    def test_invalid_mode_rejected(self):
+        """Test that unknown modes raise ValueError."""
+        with pytest.raises(ValueError):
+            MemoryGuard(1, mode='heap')
+
+    @patch('app.CVGenerator')
+    def test_render_over_budget_returns_413(self, mock_generator, client, mock_parsed_data, stop_tracemalloc):
+        """Test that a render aborted by the guard returns 413."""
+        def generate():
+            ballast = bytearray(4 * 1024 * 1024)
+            check_memory_budget()
+            return ballast
+
+        mock_generator.return_value.generate.side_effect = generate
+
+        with patch.object(app_module, 'render_memory_guard', MemoryGuard(1024 * 1024, mode='tracemalloc')):
+            response = client.post('/api/generate-pdf', json=mock_parsed_data)
+
+        assert response.status_code == 413
+        assert response.get_json()['error'] == 'CV too large to render'
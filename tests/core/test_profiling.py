@@ -0,0 +1,115 @@
+"""
+Profiling Tests - MEDIUM Priority
+
+Tests for the sampled request profiling hook including:
+- cProfile and tracemalloc dumps
+- Capped, rotating dump directory
+- Sampling decisions
+- Admin header activation on parse/render endpoints
+"""
+
+import os
+import sys
+import json
+import pstats
+import tracemalloc
+from unittest.mock import patch
+
+# Add backend to path
+backend_dir = os.path.join(os.path.dirname(__file__), '..', '..', 'backend')
+sys.path.insert(0, os.path.abspath(backend_dir))
+
+from profiling import RequestProfiler
+
+
+class TestRequestProfiler:
+    """Test profile capture and rotation."""
+
+    def test_profile_writes_prof_file(self, temp_upload_dir):
+        """Test that a cProfile dump readable by pstats is written."""
+        profiler = RequestProfiler(temp_upload_dir)
+        with profiler.profile('unit') as profile_id:
+            sorted(range(1000))
+
+        path = os.path.join(temp_upload_dir, f"{profile_id}.prof")
+        assert os.path.exists(path)
+        assert pstats.Stats(path).total_calls > 0
+
+    def test_memory_profile_writes_snapshot(self, temp_upload_dir):
+        """Test that a tracemalloc snapshot is written when memory profiling is on."""
+        profiler = RequestProfiler(temp_upload_dir)
+        with profiler.profile('unit', memory=True) as profile_id:
+            _ = [str(i) for i in range(1000)]
+
+        path = os.path.join(temp_upload_dir, f"{profile_id}.tracemalloc")
+        assert os.path.exists(path)
+        assert tracemalloc.Snapshot.load(path).traces is not None
+        assert not tracemalloc.is_tracing()
+
+    def test_rotation_caps_file_count(self, temp_upload_dir):
+        """Test that the oldest dumps are removed beyond max_files."""
+        profiler = RequestProfiler(temp_upload_dir, max_files=2)
+        for i in range(4):
+            path = os.path.join(temp_upload_dir, f"old_{i}.prof")
+            with open(path, 'w') as f:
+                f.write('x')
+            os.utime(path, (i, i))
+
+        profiler.rotate()
+
+        assert sorted(os.listdir(temp_upload_dir)) == ['old_2.prof', 'old_3.prof']
+
+    def test_rotation_caps_total_size(self, temp_upload_dir):
+        """Test that the oldest dumps are removed beyond max_bytes."""
+        profiler = RequestProfiler(temp_upload_dir, max_bytes=150)
+        for i in range(3):
+            path = os.path.join(temp_upload_dir, f"old_{i}.prof")
+            with open(path, 'w') as f:
+                f.write('x' * 100)
+            os.utime(path, (i, i))
+
+        profiler.rotate()
+
+        assert os.listdir(temp_upload_dir) == ['old_2.prof']
+
+    def test_sampling_rate_bounds(self, temp_upload_dir):
+        """Test that rate 0 never samples and rate 1 always does."""
+        profiler = RequestProfiler(temp_upload_dir, sample_rate=0)
+        assert not profiler.should_sample()
+        assert profiler.should_sample(1.0)
+
+
+class TestProfiledEndpoints:
+    """Test profiling activation on endpoints."""
+
+    def test_admin_header_profiles_render(self, client, mock_parsed_data, temp_upload_dir):
+        """Test that an admin X-Profile-Rate header profiles the request."""
+        profiler = RequestProfiler(temp_upload_dir)
+        with patch('app.ADMIN_TOKEN', 'secret'), patch('app.request_profiler', profiler):
+            response = client.post('/api/generate-pdf',
+                                   data=json.dumps(mock_parsed_data),
+                                   content_type='application/json',
+                                   headers={'X-Admin-Token': 'secret', 'X-Profile-Rate': '1'})
+
+        assert response.status_code == 200
+        profile_id = response.headers['X-Profile-Id']
+        assert 'generate_pdf' in profile_id
+        assert os.path.exists(os.path.join(temp_upload_dir, f"{profile_id}.prof"))
+
+    def test_profile_header_ignored_without_admin(self, client, mock_parsed_data, temp_upload_dir):
+        """Test that non-admin clients cannot trigger profiling."""
+        profiler = RequestProfiler(temp_upload_dir)
+        with patch('app.ADMIN_TOKEN', 'secret'), patch('app.request_profiler', profiler):
+            response = client.post('/api/generate-pdf',
+                                   data=json.dumps(mock_parsed_data),
+                                   content_type='application/json',
+                                   headers={'X-Profile-Rate': '1'})
+
+        assert response.status_code == 200
+        assert 'X-Profile-Id' not in response.headers
+        assert os.listdir(temp_upload_dir) == []
+
+    def test_default_rate_does_not_profile(self, client):
+        """Test that profiling is off by default."""
+        response = client.get('/')
+        assert 'X-Profile-Id' not in response.headers
@@ -0,0 +1,196 @@
+"""
+Single-Flight Coalescing Tests - HIGH Priority
+
+Tests for coalescing identical concurrent renders including:
+- One computation per key for concurrent callers
+- Errors shared with waiting callers
+- Coalescing across workers through a lock directory
+- Stale lock recovery
+- /api/generate-pdf duplicates served by one render
+"""
+
+import os
+import sys
+import threading
+import time
+from unittest.mock import patch
+
+# Add backend to path
+backend_dir = os.path.join(os.path.dirname(__file__), '..', '..', 'backend')
+sys.path.insert(0, os.path.abspath(backend_dir))
+
+from single_flight import SingleFlight
+
+
+class BlockingCompute:
+    """compute() stand-in that blocks until released and counts its calls"""
+
+    def __init__(self, result='result', error=None):
+        self.result = result
+        self.error = error
+        self.calls = 0
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def __call__(self):
+        self.calls += 1
+        self.started.set()
+        assert self.release.wait(5)
+        if self.error:
+            raise self.error
+        return self.result
+
+
+def run_concurrently(flight, key, compute, count):
+    """Start `count` callers once the first one is computing; returns (results, errors, threads)"""
+    results, errors = [], []
+
+    def call():
+        try:
+            results.append(flight.do(key, compute))
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=call)]
+    threads[0].start()
+    assert compute.started.wait(5)
+    for _ in range(count - 1):
+        thread = threading.Thread(target=call)
+        thread.start()
+        threads.append(thread)
+    return results, errors, threads
+
+
+def finish(compute, threads):
+    time.sleep(0.05)  # let the duplicates reach the wait
+    compute.release.set()
+    for thread in threads:
+        thread.join(5)
+
+
+class TestInProcessCoalescing:
+    """Test coalescing between threads of one process."""
+
+    def test_concurrent_duplicates_share_result(self):
+        """Test that concurrent callers with the same key get one computation's result."""
+        flight = SingleFlight()
+        compute = BlockingCompute()
+
+        results, errors, threads = run_concurrently(flight, 'key', compute, 4)
+        finish(compute, threads)
+
+        assert errors == []
+        assert compute.calls == 1
+        assert sorted(results) == [('result', False)] + [('result', True)] * 3
+
+    def test_different_keys_not_coalesced(self):
+        """Test that different payloads are computed separately."""
+        flight = SingleFlight()
+        assert flight.do('a', lambda: 'A') == ('A', False)
+        assert flight.do('b', lambda: 'B') == ('B', False)
+
+    def test_finished_work_not_reused(self):
+        """Test that only in-flight work is shared, not past results."""
+        flight = SingleFlight()
+        calls = []
+        for _ in range(2):
+            flight.do('key', lambda: calls.append(1) or 'result')
+        assert len(calls) == 2
+
+    def test_errors_shared(self):
+        """Test that waiting callers get the leader's exception."""
+        flight = SingleFlight()
+        compute = BlockingCompute(error=ValueError('render failed'))
+
+        results, errors, threads = run_concurrently(flight, 'key', compute, 3)
+        finish(compute, threads)
+
+        assert compute.calls == 1
+        assert results == []
+        assert len(errors) == 3 and all(isinstance(e, ValueError) for e in errors)
+
+        # The failed flight is forgotten
+        assert flight.do('key', lambda: 'retry') == ('retry', False)
+
+
+class TestLockDirCoalescing:
+    """Test coalescing between workers sharing a lock directory."""
+
+    def test_other_worker_waits_for_result(self, tmp_path):
+        """Test that a second worker reuses the result published by the first."""
+        first, second = SingleFlight(str(tmp_path)), SingleFlight(str(tmp_path), poll_interval=0.01)
+        compute = BlockingCompute(result='/cv/CV_DOE_John.pdf')
+
+        results, _, threads = run_concurrently(first, 'key', compute, 1)
+        other_compute = []
+        other = threading.Thread(target=lambda: results.append(second.do('key', lambda: other_compute.append(1))))
+        other.start()
+        finish(compute, threads + [other])
+
+        assert other_compute == []
+        assert sorted(results) == [('/cv/CV_DOE_John.pdf', False), ('/cv/CV_DOE_John.pdf', True)]
+        assert not os.path.exists(tmp_path / 'key.lock')
+
+    def test_stale_lock_ignored(self, tmp_path):
+        """Test that a lock left by a crashed worker does not block renders."""
+        lock = tmp_path / 'key.lock'
+        lock.touch()
+        os.utime(lock, (time.time() - 120, time.time() - 120))
+
+        flight = SingleFlight(str(tmp_path), timeout=60)
+        assert flight.do('key', lambda: 'result') == ('result', False)
+
+    def test_failed_worker_recomputed(self, tmp_path):
+        """Test that a worker computes itself when the other worker failed."""
+        first, second = SingleFlight(str(tmp_path)), SingleFlight(str(tmp_path), poll_interval=0.01)
+        compute = BlockingCompute(error=RuntimeError('worker failed'))
+
+        _, errors, threads = run_concurrently(first, 'key', compute, 1)
+        results = []
+        other = threading.Thread(target=lambda: results.append(second.do('key', lambda: 'fallback')))
+        other.start()
+        finish(compute, threads + [other])
+
+        assert len(errors) == 1
+        assert results == [('fallback', False)]
+
+
+class TestGeneratePDFCoalescing:
+    """Test coalescing of /api/generate-pdf requests."""
+
+    def test_identical_requests_rendered_once(self, client, mock_parsed_data, temp_upload_dir):
+        """Test that concurrent identical payloads share one generator and render and get the same bytes."""
+        import app as app_module
+
+        pdf_path = os.path.join(temp_upload_dir, 'cv.pdf')
+        with open(pdf_path, 'wb') as f:
+            f.write(b'%PDF-1.4 coalesced')
+        compute = BlockingCompute(result=pdf_path)
+
+        responses = []
+
+        def post():
+            with app_module.app.test_client() as thread_client:
+                responses.append(thread_client.post('/api/generate-pdf', json=mock_parsed_data))
+
+        with patch('app.CVGenerator') as generator:
+            generator.return_value.generate.side_effect = compute
+            threads = [threading.Thread(target=post)]
+            threads[0].start()
+            assert compute.started.wait(5)
+            threads.append(threading.Thread(target=post))
+            threads[1].start()
+            finish(compute, threads)
+
+        assert compute.calls == 1
+        assert generator.call_count == 1
+        assert [response.status_code for response in responses] == [200, 200]
+        assert responses[0].data == responses[1].data == b'%PDF-1.4 coalesced'
+
+    def test_different_configs_not_coalesced(self):
+        """Test that the coalescing key covers the config."""
+        from cv_generator import payload_digest
+
+        data = {'profile': {'first_name': 'John'}}
+        assert payload_digest(data, {'template': 'modern'}) != payload_digest(data, {'template': 'classic'})
+        assert payload_digest({'a': 1, 'b': 2}) == payload_digest({'b': 2, 'a': 1})
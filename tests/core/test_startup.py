@@ -0,0 +1,165 @@
+"""
+Startup Tests - HIGH Priority
+
+Tests for backend cold-start cost including:
+- Heavy rendering dependencies are deferred to first use
+- Import time of the app module stays within the configured budget
+- Opt-in warm-up phase and /api/ready readiness endpoint
+- No start-up work in worker processes re-importing the app script
+"""
+
+import pytest
+import os
+import re
+import subprocess
+import sys
+import json
+from unittest.mock import patch
+
+# Add backend to path
+backend_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'backend'))
+sys.path.insert(0, backend_dir)
+
+HEAVY_MODULES = ('cv_generator', 'reportlab', 'reportlab.platypus', 'PIL')
+
+
+def _run_python(args):
+    """Run a fresh interpreter inside the backend directory."""
+    return subprocess.run(
+        [sys.executable] + args,
+        cwd=backend_dir,
+        capture_output=True,
+        text=True,
+        timeout=60
+    )
+
+
+def _import_time_ms(output, module):
+    """Extract the cumulative import time of a top-level module from -X importtime output."""
+    pattern = re.compile(r'^import time:\s+\d+\s+\|\s+(\d+)\s+\|\s(\S+)\s*$')
+    for line in output.splitlines():
+        match = pattern.match(line)
+        if match and match.group(2) == module:
+            return int(match.group(1)) / 1000
+    return None
+
+
+class TestLazyImports:
+    """Test that rendering dependencies are only loaded on demand."""
+
+    def test_import_app_does_not_load_renderer(self):
+        """Test that importing app leaves ReportLab and PIL unloaded."""
+        result = _run_python([
+            '-c',
+            'import sys, app; '
+            f'print(",".join(m for m in {HEAVY_MODULES!r} if m in sys.modules))'
+        ])
+        assert result.returncode == 0, result.stderr
+        assert result.stdout.strip() == ''
+
+    def test_cv_generator_resolved_on_first_use(self):
+        """Test that CVGenerator is importable through the app module."""
+        import app as app_module
+        from cv_generator import CVGenerator
+
+        assert app_module.lazy('CVGenerator') is CVGenerator
+
+    def test_unknown_attribute_raises(self):
+        """Test that unknown module attributes still raise AttributeError."""
+        import app as app_module
+
+        with pytest.raises(AttributeError):
+            app_module.does_not_exist
+
+
+@pytest.mark.slow
+class TestImportTimeBudget:
+    """Test cold-start import time against the configured budget."""
+
+    def test_import_app_within_budget(self, pytestconfig):
+        """Test that `import app` stays within the import time budget."""
+        budget_ms = float(os.getenv('CV_IMPORT_BUDGET_MS') or pytestconfig.getini('import_time_budget_ms'))
+
+        # Take the best of a few runs to smooth out filesystem cache noise
+        timings = []
+        for _ in range(3):
+            result = _run_python(['-X', 'importtime', '-c', 'import app'])
+            assert result.returncode == 0, result.stderr
+            elapsed = _import_time_ms(result.stderr, 'app')
+            assert elapsed is not None, "app module missing from -X importtime output"
+            timings.append(elapsed)
+
+        best = min(timings)
+        assert best <= budget_ms, f"import app took {best:.0f}ms (budget {budget_ms:.0f}ms)"
+
+
+class TestWarmup:
+    """Test the startup warm-up phase."""
+
+    def test_warm_up_renders_all_templates_in_memory(self):
+        """Test that warm-up renders every template without writing to cv/."""
+        from warmup import warm_up, WARMUP_TEMPLATES
+
+        with patch('cv_generator.CVGenerator.generate') as mock_generate:
+            duration = warm_up()
+
+        assert duration > 0
+        assert len(WARMUP_TEMPLATES) == 3
+        mock_generate.assert_not_called()
+
+    def test_run_warmup_marks_ready(self):
+        """Test that a successful warm-up marks the state ready with a duration."""
+        from warmup import WarmupState, run_warmup
+
+        state = WarmupState()
+        run_warmup(state, templates=('modern',))
+
+        assert state.ready
+        assert state.duration > 0
+        assert state.error is None
+
+    def test_failed_warmup_still_marks_ready(self):
+        """Test that a failing warm-up does not keep the worker unready."""
+        from warmup import WarmupState, run_warmup
+
+        state = WarmupState()
+        with patch('warmup.warm_up', side_effect=RuntimeError("boom")):
+            run_warmup(state)
+
+        assert state.ready
+        assert state.error == "boom"
+
+    @pytest.mark.parametrize('run_name, started', [('app', True), ('__mp_main__', False)])
+    def test_worker_reimport_skips_startup(self, run_name, started):
+        """Test that worker processes importing the app script again skip warm-up and directory setup."""
+        result = _run_python([
+            '-c',
+            'import os, runpy; from unittest import mock; '
+            'os.environ["CV_WARMUP"] = "true"; '
+            'start = mock.patch("warmup.start_warmup").start(); '
+            'makedirs = mock.patch("os.makedirs").start(); '
+            f'runpy.run_path("app.py", run_name={run_name!r}); '
+            'print(start.called, any(c.args[0] == "/tmp/cv_uploads" for c in makedirs.call_args_list))'
+        ])
+        assert result.returncode == 0, result.stderr
+        assert result.stdout.split()[-2:] == [str(started)] * 2
+
+
+class TestReadyEndpoint:
+    """Test /api/ready endpoint."""
+
+    def test_ready_returns_200_when_ready(self, client):
+        """Test that /api/ready returns 200 once warm-up is done."""
+        response = client.get('/api/ready')
+        assert response.status_code == 200
+        assert json.loads(response.data)['ready'] is True
+
+    def test_ready_returns_503_during_warmup(self, client):
+        """Test that /api/ready returns 503 while warm-up is running."""
+        from warmup import WarmupState
+
+        with patch('app.warmup_state', WarmupState()):
+            response = client.get('/api/ready')
+
+        assert response.status_code == 503
+        assert json.loads(response.data)['ready'] is False
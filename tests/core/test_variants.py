@@ -0,0 +1,170 @@
+"""
+Multi-Variant Rendering Tests - HIGH Priority
+
+Tests for /api/generate-variants including:
+- Shared preparation (emoji cleaning, descriptions, photo) done once
+- Variant renders in worker processes
+- ZIP and multipart/mixed responses
+- Request validation
+"""
+
+import pytest
+import os
+import sys
+import io
+import pickle
+import zipfile
+from email.parser import BytesParser
+from email.policy import default as default_policy
+from unittest.mock import patch
+
+# Add backend to path
+backend_dir = os.path.join(os.path.dirname(__file__), '..', '..', 'backend')
+sys.path.insert(0, os.path.abspath(backend_dir))
+
+import app as app_module
+from cv_generator import CVGenerator, PreparedCV
+from variants import render_variants, build_zip, build_multipart, get_pool, shutdown_pool
+
+CONFIGS = [{'template': 'modern'}, {'template': 'classic'}, {'template': 'creative'}]
+
+
+@pytest.fixture
+def photo_data(mock_parsed_data, mock_base64_image):
+    return dict(mock_parsed_data, photo=f"data:image/png;base64,{mock_base64_image}")
+
+
+class TestPreparedCV:
+    """Test the shared, config-independent preparation."""
+
+    def test_prepare_formats_descriptions_and_photo(self, photo_data):
+        """Test that descriptions and the photo are processed up front."""
+        prepared = CVGenerator(photo_data).prepare()
+
+        assert 'Developed web applications' in prepared.descriptions
+        assert prepared.photo.startswith(b'\xff\xd8')  # JPEG
+        assert prepared.data['photo'] == ''
+
+    def test_prepared_generator_skips_shared_work(self, photo_data):
+        """Test that generators built from prepared data do not clean, format or process again."""
+        prepared = CVGenerator(photo_data).prepare()
+
+        with patch.object(CVGenerator, '_clean_emoji_from_data') as clean, \
+                patch.object(CVGenerator, '_process_photo') as process_photo:
+            generator = CVGenerator(prepared, {'template': 'classic'})
+            generator.render(io.BytesIO())
+
+        clean.assert_not_called()
+        process_photo.assert_not_called()
+
+    def test_rewritten_descriptions_formatted_once(self, mock_parsed_data):
+        """Test that descriptions with line break markers and bullets are cached under their raw text."""
+        description = "Pilotage du projet. n - Développement n - Tests nn Recette"
+        mock_parsed_data['positions'][0]['description'] = description
+        prepared = CVGenerator(mock_parsed_data).prepare()
+        assert description in prepared.descriptions
+
+        generator = CVGenerator(prepared)
+        with patch('cv_generator.re.sub', side_effect=AssertionError('formatted again')):
+            assert generator._format_description(description) == prepared.descriptions[description]
+
+    def test_prepared_cv_is_picklable(self, photo_data):
+        """Test that prepared data can be sent to worker processes."""
+        prepared = pickle.loads(pickle.dumps(CVGenerator(photo_data).prepare()))
+        assert isinstance(prepared, PreparedCV)
+        assert prepared.photo
+
+
+class TestRenderVariants:
+    """Test rendering several configs from one dataset."""
+
+    def test_renders_in_config_order(self, mock_parsed_data):
+        """Test that one PDF is returned per config, in order."""
+        with patch.object(CVGenerator, '_clean_emoji_from_data', side_effect=lambda data: data) as clean:
+            pdfs = render_variants(mock_parsed_data, CONFIGS)
+
+        assert clean.call_count == 1
+        assert len(pdfs) == 3
+        assert all(pdf.startswith(b'%PDF') for pdf in pdfs)
+
+    def test_renders_in_worker_processes(self, mock_parsed_data):
+        """Test that variants rendered by the process pool match in-process renders."""
+        try:
+            in_process = render_variants(mock_parsed_data, CONFIGS, workers=1)
+            pooled = render_variants(mock_parsed_data, CONFIGS, workers=2)
+        finally:
+            shutdown_pool()
+
+        assert [len(pdf) for pdf in pooled] == [len(pdf) for pdf in in_process]
+
+    def test_workers_not_forked(self):
+        """Test that worker processes are not forked from the threaded server process."""
+        try:
+            assert get_pool(1)._mp_context.get_start_method() in ('forkserver', 'spawn')
+        finally:
+            shutdown_pool()
+
+
+class TestVariantResponses:
+    """Test the ZIP and multipart encodings."""
+
+    def test_zip_entries(self):
+        """Test that the archive holds one named PDF per variant."""
+        archive = zipfile.ZipFile(io.BytesIO(build_zip([b'%PDF-a', b'%PDF-b'], CONFIGS[:2])))
+        assert archive.namelist() == ['cv_1_modern.pdf', 'cv_2_classic.pdf']
+        assert archive.read('cv_2_classic.pdf') == b'%PDF-b'
+
+    def test_multipart_parts(self):
+        """Test that the multipart body parses into one PDF part per variant."""
+        body, boundary = build_multipart([b'%PDF-a', b'%PDF-b'], CONFIGS[:2])
+        message = BytesParser(policy=default_policy).parsebytes(
+            f'Content-Type: multipart/mixed; boundary="{boundary}"\r\n\r\n'.encode() + body
+        )
+
+        parts = list(message.iter_parts())
+        assert [part.get_filename() for part in parts] == ['cv_1_modern.pdf', 'cv_2_classic.pdf']
+        assert parts[0].get_content_type() == 'application/pdf'
+        assert parts[1].get_payload(decode=True) == b'%PDF-b'
+
+
+class TestGenerateVariantsEndpoint:
+    """Test /api/generate-variants."""
+
+    def test_zip_response(self, client, mock_parsed_data):
+        """Test that variants are returned as a ZIP by default."""
+        response = client.post('/api/generate-variants', json=dict(mock_parsed_data, configs=CONFIGS))
+
+        assert response.status_code == 200
+        assert response.mimetype == 'application/zip'
+        archive = zipfile.ZipFile(io.BytesIO(response.data))
+        assert len(archive.namelist()) == 3
+        assert 'Server-Timing' in response.headers
+
+    def test_multipart_response(self, client, mock_parsed_data):
+        """Test that ?format=multipart returns a multipart/mixed body."""
+        response = client.post('/api/generate-variants?format=multipart',
+                               json=dict(mock_parsed_data, configs=CONFIGS[:2]))
+
+        assert response.status_code == 200
+        assert response.mimetype == 'multipart/mixed'
+        assert response.data.count(b'%PDF') == 2
+
+    @pytest.mark.parametrize('configs', [None, [], ['modern'], {'template': 'modern'}])
+    def test_invalid_configs_rejected(self, client, mock_parsed_data, configs):
+        """Test that configs must be a non-empty list of objects."""
+        response = client.post('/api/generate-variants', json=dict(mock_parsed_data, configs=configs))
+        assert response.status_code == 400
+
+    def test_too_many_variants_rejected(self, client, mock_parsed_data):
+        """Test that the number of variants per request is limited."""
+        configs = [{'template': 'modern'}] * (app_module.MAX_VARIANTS + 1)
+        with patch.object(app_module, 'render_variants', create=True) as render:
+            response = client.post('/api/generate-variants', json=dict(mock_parsed_data, configs=configs))
+
+        assert response.status_code == 413
+        render.assert_not_called()
+
+    def test_unknown_format_rejected(self, client, mock_parsed_data):
+        """Test that only zip and multipart formats are accepted."""
+        response = client.post('/api/generate-variants?format=tar', json=dict(mock_parsed_data, configs=CONFIGS))
+        assert response.status_code == 400